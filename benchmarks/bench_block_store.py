@@ -0,0 +1,76 @@
+"""Memory and query cost of the columnar BlockStore against the old list of (x, y, z, color) tuples.
+
+Run from the repository root: python -m benchmarks.bench_block_store [blocks]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from src.block_store import BlockStore
+
+COLORS = {
+    "minecraft:stone": (0.5, 0.5, 0.5, 1.0),
+    "minecraft:red_wool": (1.0, 0.0, 0.0, 1.0),
+    "minecraft:blue_ice": (0.0, 0.0, 1.0, 1.0),
+    "minecraft:green_concrete": (0.0, 1.0, 0.0, 1.0),
+}
+
+
+def make_parsed_blocks(count, seed=1234):
+    rng = random.Random(seed)
+    names = list(COLORS)
+    return [(rng.randint(-3000, 3000), rng.randint(-64, 320), rng.randint(-3000, 3000), rng.choice(names)) for _ in range(count)]
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 1000000
+    parsed = make_parsed_blocks(count)
+
+    # Old layout: the parser produced fresh int objects and shared color tuples
+    tuples, tuple_bytes, tuple_time = measure(lambda: [(int(str(x)), int(str(y)), int(str(z)), COLORS[name]) for x, y, z, name in parsed])
+    store, store_bytes, store_time = measure(lambda: _build_store(parsed))
+    print(f"{count:,} blocks")
+    print(f"  list of tuples: {tuple_bytes / 1e6:8.1f} MB ({tuple_bytes / count:6.1f} B/block), built in {tuple_time:.2f}s")
+    print(f"  BlockStore    : {store_bytes / 1e6:8.1f} MB ({store_bytes / count:6.1f} B/block incl. spare capacity, "
+          f"{store.nbytes / count:.0f} B/block live), built in {store_time:.2f}s")
+    print(f"  ratio         : {tuple_bytes / store_bytes:.1f}x smaller")
+
+    print("Queries (ms)            tuples   store")
+    rows = [
+        ("bounding box", lambda: (min(b[0] for b in tuples), max(b[0] for b in tuples), min(b[1] for b in tuples),
+                                  max(b[1] for b in tuples), min(b[2] for b in tuples), max(b[2] for b in tuples)),
+         lambda: store.bounds()),
+        ("filter by type", lambda: [i for i, b in enumerate(tuples) if b[3] == COLORS["minecraft:red_wool"]],
+         lambda: store.filter_by_type("minecraft:red_wool")),
+        ("translate all", lambda: [(x + 1, y, z - 1, c) for x, y, z, c in tuples],
+         lambda: store.translate(1, 0, -1)),
+    ]
+    for label, with_tuples, with_store in rows:
+        print(f"  {label:20s} {timed(with_tuples):8.1f} {timed(with_store):7.1f}")
+
+
+def _build_store(parsed):
+    store = BlockStore()
+    store.extend_blocks(parsed)
+    return store
+
+
+if __name__ == "__main__":
+    main()
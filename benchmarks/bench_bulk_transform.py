@@ -0,0 +1,63 @@
+"""Time the vectorized bulk transform on a large mixed batch of commands.
+
+Run from the repository root: python -m benchmarks.bench_bulk_transform [count]
+"""
+import random
+import sys
+import time
+from src.bulk_transform import Transform, transform_text
+
+
+def make_commands(count, seed=1234):
+    """setblock / block_display / end_crystal / kill / tp / volume kill / execute commands in equal shares, with scattered coordinates."""
+    rng = random.Random(seed)
+    commands = []
+    for i in range(count):
+        x, y, z = rng.randint(-3000, 3000), rng.randint(-64, 320), rng.randint(-3000, 3000)
+        kind = i % 7
+        if kind == 0:
+            commands.append(f'setblock {x} {y} {z} minecraft:stone_bricks')
+        elif kind == 1:
+            commands.append(f'summon minecraft:block_display {x + 0.5:.6f} {y:.6f} {z - 0.25:.6f} '
+                            f'{{block_state:{{Name:"minecraft:lime_concrete"}},Tags:["beam{i % 50}"]}}')
+        elif kind == 2:
+            commands.append(f'summon end_crystal {x} {y} {z} {{ShowBottom:0b,Invulnerable:1b,Tags:["laser"],'
+                            f'BeamTarget:{{X:{x + 5},Y:{y + 6},Z:{z - 5}}}}}')
+        elif kind == 3:
+            commands.append(f'kill @e[type=end_crystal,x={x},y={y},z={z},distance=..1]')
+        elif kind == 4:
+            commands.append(f'tp @a[tag=builder] {x} {y} {z}')
+        elif kind == 5:
+            commands.append(f'kill @e[type=item,x={x},y={y},z={z},dx=4,dy=2,dz=-3]')
+        else:
+            commands.append(f'execute as @e[x={x},y={y},z={z},distance=..2] run tp @s {x} {y} {z}')
+    return commands
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 1_000_000
+    text = "\n".join(make_commands(count))
+    transform = Transform(translation=(16, 0, -32), quarter_turns=1, mirror="x", pivot=(100, 64, 100))
+
+    start = time.perf_counter()
+    result, moved = transform_text(text, transform)
+    elapsed = time.perf_counter() - start
+    print(f"{count} commands ({len(text) / 1e6:.1f} MB), {moved} positions moved in {elapsed:.3f}s "
+          f"({count / elapsed:,.0f} commands/sec)")
+
+    # Four quarter turns about the same pivot bring every position back
+    turn = Transform(quarter_turns=1, pivot=transform.pivot)
+    check = "\n".join(make_commands(min(count, 10000)))
+    restored = check
+    for _ in range(4):
+        restored, _ = transform_text(restored, turn)
+    print("round trip:", "ok" if restored == check else "MISMATCH")
+    # execute lines are set aside whole, selectors included
+    untouched = all(line == original for line, original in zip(result.split("\n"), text.split("\n"))
+                    if original.startswith("execute"))
+    print("execute lines:", "unchanged" if untouched else "MODIFIED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare the single-pass block_display parser with the stacked regex rewrite chain.
+
+Run from the repository root: python -m benchmarks.bench_command_parser [count]
+
+"routed" is what the Modify Laser tab does: commands in the Generate
+button's own form go through the chain, everything else through the parser.
+"""
+import logging
+import random
+import sys
+import time
+from src import patterns
+from src.command_parser import parse_block_display
+from src.rewrite_engine import RewriteProfile, _edit_laser_display, _edit_laser_patterns
+
+
+def make_commands(count, seed=1234, custom_name_length=0):
+    """Laser summons as generated by the GUI, optionally carrying a long CustomName before the fields we edit."""
+    rng = random.Random(seed)
+    custom_name = f'CustomName:\'{{"text":"{"x" * custom_name_length}"}}\',' if custom_name_length else ''
+    commands = []
+    for i in range(count):
+        x, y, z = (rng.uniform(-3000, 3000) for _ in range(3))
+        commands.append(
+            f'/summon minecraft:block_display {x:.6f} {y:.6f} {z:.6f} '
+            f'{{{custom_name}block_state:{{Name:"minecraft:lime_concrete"}},'
+            f'transformation:{{translation:[0.5f,0.0f,0.0f],'
+            f'scale:[0.1f,0.1f,{rng.uniform(-200, -10):.6f}f],'
+            f'left_rotation:[0.0f,0.0f,0.0f,1.0f],'
+            f'right_rotation:[0.0f,0.0f,0.0f,1.0f]}},'
+            f'brightness:15728880,shadow:false,billboard:"fixed",Tags:["beam{i % 50}"]}}'
+        )
+    return commands
+
+
+def run_regex_chain(commands, values, center):
+    for command in commands:
+        _edit_laser_patterns(command, values, center, "renamed", [])
+
+
+def run_single_pass(commands, values, center):
+    for command in commands:
+        display = parse_block_display(command)
+        _edit_laser_display(display, values, center, "renamed", [])
+        display.serialize()
+
+
+def run_routed(commands, values, center):
+    for command in commands:
+        if patterns.GENERATED_LASER.fullmatch(command):
+            _edit_laser_patterns(command, values, center, "renamed", [])
+        else:
+            run_single_pass((command,), values, center)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 100000
+    logging.disable(logging.CRITICAL)
+    values = RewriteProfile(tag_text="renamed")
+    center = (0.0, 0.5, 0.999999)
+
+    for label, custom_name_length in (("compact", 0), ("2 KB CustomName", 2048)):
+        commands = make_commands(count, custom_name_length=custom_name_length)
+        print(f"{label} commands ({count}):")
+        timings = {}
+        for name, func in (("regex chain", run_regex_chain), ("single pass", run_single_pass), ("routed", run_routed)):
+            start = time.perf_counter()
+            func(commands, values, center)
+            timings[name] = time.perf_counter() - start
+            print(f"  {name:12s}: {timings[name]:.3f}s  ({count / timings[name]:,.0f} commands/sec)")
+        for name in ("single pass", "routed"):
+            print(f"  {name + ' vs chain':19s}: {timings['regex chain'] / timings[name]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
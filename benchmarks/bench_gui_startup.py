@@ -0,0 +1,65 @@
+"""Time building the main window and count its widgets, with lazy tabs and with every tab built.
+
+Run from the repository root (needs a display): python -m benchmarks.bench_gui_startup [--runs 5]
+
+"lazy" is what the app does at startup: only the selected tab is built.
+"eager" then builds the remaining tabs, which is what startup used to cost.
+"""
+import argparse
+import statistics
+import sys
+import time
+import tkinter as tk
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def measure():
+    """(lazy ms, lazy widgets, eager ms, eager widgets) for one fresh window."""
+    from src.gui_main import CommandModifierGUI
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        start = time.perf_counter()
+        gui = CommandModifierGUI(root)
+        root.update_idletasks()
+        lazy_ms = (time.perf_counter() - start) * 1000
+        lazy_widgets = count_widgets(root)
+
+        start = time.perf_counter()
+        gui.tabs.build_all()
+        root.update_idletasks()
+        eager_ms = lazy_ms + (time.perf_counter() - start) * 1000
+        eager_widgets = count_widgets(root)
+        gui.clipboard_watcher.stop()
+        gui.settings.close()
+    finally:
+        root.destroy()
+    return lazy_ms, lazy_widgets, eager_ms, eager_widgets
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure main window construction with lazy and eager tabs.")
+    parser.add_argument("--runs", type=int, default=5, help="windows to build")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        results = [measure() for _ in range(args.runs)]
+    except tk.TclError as e:
+        print(f"Cannot open a window: {e}")
+        return 1
+    lazy_ms, lazy_widgets, eager_ms, eager_widgets = (statistics.median(column) for column in zip(*results))
+    print(f"{'':8s} {'ms':>8s} {'widgets':>8s}")
+    print(f"{'lazy':8s} {lazy_ms:8.1f} {lazy_widgets:8.0f}")
+    print(f"{'eager':8s} {eager_ms:8.1f} {eager_widgets:8.0f}")
+    print(f"startup: {1 - lazy_ms / eager_ms:.0%} less time, {1 - lazy_widgets / eager_widgets:.0%} fewer widgets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""Triangle counts and meshing time for imported setblock structures.
+
+Run from the repository root: python -m benchmarks.bench_mesher [size]
+"""
+import random
+import sys
+import time
+from src.block_mesher import ChunkMesher, face_intensities
+
+GRAY = (0.5, 0.5, 0.5, 1.0)
+COLORS = [GRAY, (1.0, 0.0, 0.0, 1.0), (0.0, 0.0, 1.0, 1.0), (0.0, 1.0, 0.0, 1.0)]
+
+
+def make_structures(size, seed=1234):
+    rng = random.Random(seed)
+    cube = range(size)
+    return [
+        ("solid cube", [(x, y, z, GRAY) for x in cube for y in cube for z in cube]),
+        ("striped cube", [(x, y, z, COLORS[(x // 4 + y // 4) % 4]) for x in cube for y in cube for z in cube]),
+        ("random colors", [(x, y, z, rng.choice(COLORS)) for x in cube for y in cube for z in cube]),
+        ("hollow shell", [(x, y, z, GRAY) for x in cube for y in cube for z in cube
+                          if x in (0, size - 1) or y in (0, size - 1) or z in (0, size - 1)]),
+    ]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    size = int(argv[0]) if argv else 64
+    intensities = face_intensities([0.0, 0.0, -1.0], 0.3)
+    for label, blocks in make_structures(size):
+        mesher = ChunkMesher(intensities)
+        start = time.perf_counter()
+        mesher.set_blocks(blocks)
+        mesher.take_dirty_meshes()
+        elapsed = time.perf_counter() - start
+        naive, meshed = mesher.naive_triangle_count, mesher.triangle_count
+        print(f"{label:14s} ({size}^3, {len(blocks)} blocks): {naive:>9,} -> {meshed:>7,} triangles "
+              f"({naive / max(meshed, 1):,.0f}x fewer) meshed in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
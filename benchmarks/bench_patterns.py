@@ -0,0 +1,106 @@
+"""Per-pattern micro-benchmarks for the shared regex registry (src/patterns.py).
+
+Run from the repository root: python -m benchmarks.bench_patterns [--save FILE] [--compare FILE] [--tolerance 0.25]
+
+--save writes ns/op per pattern as JSON; --compare reads such a file and
+exits with status 1 when any pattern got slower than the tolerance allows.
+"""
+import argparse
+import json
+import sys
+import timeit
+from src.patterns import PATTERNS
+
+_DISPLAY = ('/summon minecraft:block_display 12.000000 64.500000 -7.999999 {block_state:{Name:"minecraft:lime_concrete"},'
+            'transformation:{translation:[0.5f,0.0f,0.0f],scale:[0.1f,0.1f,-150.000000f],left_rotation:[0.0f,0.0f,0.0f,1.0f],'
+            'right_rotation:[0.0f,0.0f,0.0f,1.0f]},brightness:15728880,shadow:false,billboard:"fixed",Tags:["beam1"]}')
+_CRYSTAL = 'summon end_crystal 10 64 -20 {ShowBottom:0b,Invulnerable:1b,Tags:["laser"],BeamTarget:{X:15,Y:70,Z:-25}}'
+_KILL = 'kill @e[type=end_crystal,x=10,y=64,z=-20,distance=..1]'
+_SETBLOCK = 'setblock 10 64 -20 minecraft:oak_stairs[facing=east]'
+_NOISE = 'https://example.com/some/page?query=value#fragment ' * 4
+
+# Pattern name -> (operation, inputs): one input that matches, one that does not
+SAMPLES = {
+    "BLOCK_DISPLAY_COORDS": ("match", [_DISPLAY, _NOISE]),
+    "TAGS_LIST": ("search", [_DISPLAY, _NOISE]),
+    "TAG_SELECTOR": ("search", ['execute as @e[tag=beam1] at @s run tp @s ~ ~ ~ ~1.0 ~0.0', _NOISE]),
+    "TRANSLATION": ("search", [_DISPLAY, _NOISE]),
+    "TRANSLATION_SLOT": ("search", [_DISPLAY, _NOISE]),
+    "SCALE": ("search", [_DISPLAY, _NOISE]),
+    "SCALE_SLOT": ("search", [_DISPLAY, _NOISE]),
+    "BLOCK_STATE_NAME": ("search", [_DISPLAY, _NOISE]),
+    "GENERATED_LASER": ("fullmatch", [_DISPLAY, _DISPLAY[:-1] + ',CustomName:"x"}']),
+    "INTEGER": ("findall", [_CRYSTAL, _NOISE]),
+    "SIGNED_DIGITS": ("findall", ['10 64 -20', _NOISE]),
+    "INTEGER_TRIPLE": ("search", [_CRYSTAL, _NOISE]),
+    "SETBLOCK_COMMAND": ("search", [_SETBLOCK, _DISPLAY]),
+    "TELEPORT_COMMAND": ("search", ['execute as @e[tag=beam1] at @s run tp @s ~ ~ ~ ~1.0 ~0.0', _NOISE]),
+    "KILL_SELECTOR": ("search", [_KILL, _DISPLAY]),
+    "SETBLOCK_POSITION": ("search", ['\n' + _SETBLOCK, _NOISE]),
+    "SUMMON_POSITION": ("search", ['\n' + _CRYSTAL, _NOISE]),
+    "TELEPORT_POSITION": ("search", ['\ntp @a[tag=builder] 100 64.5 -20 90 0', _NOISE]),
+    "BEAM_TARGET_POSITION": ("search", [_CRYSTAL, _NOISE]),
+    "SELECTOR_POSITION": ("search", [_KILL, _NOISE]),
+    "SELECTOR_VOLUME": ("search", ['kill @e[type=item,x=10,y=64,z=-20,dx=4,dy=2,dz=-3]', _KILL]),
+    "EXECUTE_LINE": ("search", ['\nexecute as @e[tag=beam1] at @s run tp @s ~ ~ ~ ~1.0 ~0.0', '\n' + _SETBLOCK]),
+    "RAW_COORDS": ("match", ['66 103 -92', _NOISE]),
+    "SETBLOCK_LINE": ("match", [_SETBLOCK, _NOISE]),
+    "WATCHABLE_COMMAND": ("match", [_DISPLAY, _NOISE]),
+}
+
+
+def time_pattern(name, number):
+    """Best-of-5 nanoseconds per call, summed over the pattern's sample inputs."""
+    operation, inputs = SAMPLES[name]
+    method = getattr(PATTERNS[name], operation)
+    total = 0.0
+    for text in inputs:
+        total += min(timeit.repeat(lambda: method(text), number=number, repeat=5)) / number * 1e9
+    return total
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time every pattern in src/patterns.py.")
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing run")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail if a pattern is slower than in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --compare (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    missing = sorted(set(PATTERNS) - set(SAMPLES))
+    if missing:
+        print(f"No benchmark samples for: {', '.join(missing)}")
+        return 1
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'pattern':22s} {'ns/op':>9s}" + (f" {'baseline':>9s} {'change':>8s}" if baseline else ""))
+    for name in sorted(SAMPLES):
+        results[name] = time_pattern(name, args.number)
+        line = f"{name:22s} {results[name]:9.0f}"
+        if name in baseline:
+            change = results[name] / baseline[name] - 1
+            line += f" {baseline[name]:9.0f} {change:+8.0%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+    if regressions:
+        print(f"{len(regressions)} pattern(s) slower than the baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Ray-picking latency: voxel grid DDA vs testing every block.
+
+Run from the repository root: python -m benchmarks.bench_picking [blocks] [rays]
+"""
+import math
+import random
+import statistics
+import sys
+import time
+from src.block_picker import BlockPicker, ray_box_distance, screen_ray
+
+
+def make_blocks(count, seed=1234):
+    """Dense-ish random structure roughly (count)^(1/3) blocks across."""
+    rng = random.Random(seed)
+    side = max(2, round(count ** (1 / 3) * 1.3))
+    cells = set()
+    while len(cells) < count:
+        cells.add((rng.randrange(side), rng.randrange(side), rng.randrange(side)))
+    return [(x, y, z, None) for x, y, z in cells], side
+
+
+def linear_pick(blocks, origin, direction):
+    length = math.sqrt(sum(d * d for d in direction))
+    inv_direction = [1.0 / (d / length) if d != 0 else math.inf for d in direction]
+    best, best_t = None, math.inf
+    for index, block in enumerate(blocks):
+        t = ray_box_distance(origin, inv_direction, block[:3])
+        if t is not None and t <= best_t:
+            best, best_t = index, t
+    return best
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 100000
+    rays = int(argv[1]) if len(argv) > 1 else 2000
+    rng = random.Random(99)
+    blocks, side = make_blocks(count)
+
+    start = time.perf_counter()
+    picker = BlockPicker(blocks)
+    print(f"{count} blocks, index built in {time.perf_counter() - start:.3f}s")
+
+    center = (side / 2, side / 2, side / 2)
+    camera = (center[0] + side * 1.2, center[1] + side * 0.6, center[2] - side * 1.4)
+    clicks = [screen_ray(rng.randrange(600), rng.randrange(400), 600, 400, camera, center, 60.0) for _ in range(rays)]
+
+    timings = []
+    hits = 0
+    for origin, direction in clicks:
+        start = time.perf_counter()
+        hit = picker.pick(origin, direction)
+        timings.append(time.perf_counter() - start)
+        hits += hit is not None
+    timings.sort()
+    print(f"grid DDA : median {statistics.median(timings) * 1e6:8.1f} us, p99 {timings[int(len(timings) * 0.99)] * 1e6:8.1f} us, "
+          f"max {timings[-1] * 1e6:8.1f} us ({hits}/{rays} rays hit)")
+
+    sample = clicks[:20]
+    start = time.perf_counter()
+    for origin, direction in sample:
+        linear_pick(blocks, origin, direction)
+    print(f"linear   : mean   {(time.perf_counter() - start) / len(sample) * 1e6:8.1f} us over {len(sample)} rays")
+
+
+if __name__ == "__main__":
+    main()
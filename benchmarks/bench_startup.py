@@ -0,0 +1,105 @@
+"""Cold-start import cost of the app, from `python -X importtime` in fresh interpreters.
+
+Run from the repository root: python -m benchmarks.bench_startup [--runs 5] [--cold] [--save FILE] [--compare FILE]
+
+Startup is staged: main.py arms the hotkey, then imports the GUI. Each run
+imports the stage modules in that order, and prints the median import time
+per stage and the modules that cost the most. --cold gives every run an
+empty bytecode cache, as on the first launch after an install. Exits with
+status 1 when a module that should load on first use (the viewer stack, the
+pixel drawer, the batch engines, pyperclip) is imported at startup, or when
+--compare finds the total slower than the tolerance allows.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (stage, module imported for it), in startup order
+STAGES = (("hotkey armed", "src.main"), ("window built", "src.gui_main"))
+
+# Imported only when the feature that needs them is first used
+DEFERRED_MODULES = ("numpy", "pygame", "OpenGL", "pyperclip", "src.viewer3d", "src.pixel_drawer",
+                    "src.batch_rewrite", "src.parallel_rewriter", "src.bulk_transform")
+
+
+def import_times(modules, cold=False):
+    """Module name -> (self µs, cumulative µs) for one fresh interpreter importing `modules` in order."""
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if cold:
+            env["PYTHONPYCACHEPREFIX"] = cache_dir
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "; ".join(f"import {module}" for module in modules)],
+                                cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {', '.join(modules)} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the app's startup import time.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--cold", action="store_true", help="start every run with an empty bytecode cache")
+    parser.add_argument("--top", type=int, default=15, help="modules to list by self time")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail if the total is slower than in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --compare (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    runs = [import_times([module for _, module in STAGES], args.cold) for _ in range(args.runs)]
+    # A stage's cumulative time only covers modules the stages before it had not imported yet
+    stage_ms = {stage: statistics.median(run[module][1] for run in runs) / 1000 for stage, module in STAGES}
+    total_ms = sum(stage_ms.values())
+    names = set().union(*runs)
+    self_ms = {name: statistics.median(run.get(name, (0, 0))[0] for run in runs) / 1000 for name in names}
+    src_ms = {name: statistics.median(run.get(name, (0, 0))[1] for run in runs) / 1000
+              for name in names if name.startswith("src.")}
+
+    print(f"startup imports: {total_ms:.1f} ms median over {args.runs} {'cold' if args.cold else 'warm-cache'} run(s), "
+          f"{len(names)} modules")
+    for stage, module in STAGES:
+        print(f"  {stage:14s} {module:16s} {stage_ms[stage]:8.1f} ms")
+    print(f"\n{'slowest modules (self)':40s} {'ms':>8s}")
+    for name in sorted(self_ms, key=self_ms.get, reverse=True)[:args.top]:
+        print(f"{name:40s} {self_ms[name]:8.1f}")
+    print(f"\n{'src modules (cumulative)':40s} {'ms':>8s}")
+    for name in sorted(src_ms, key=src_ms.get, reverse=True):
+        print(f"{name:40s} {src_ms[name]:8.1f}")
+
+    failed = False
+    eager = sorted(name for name in DEFERRED_MODULES if name in names)
+    if eager:
+        print(f"\nImported at startup but should load on first use: {', '.join(eager)}")
+        failed = True
+
+    results = {"cold": args.cold, "total_ms": total_ms, "stages": stage_ms, "modules": src_ms}
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        change = total_ms / baseline["total_ms"] - 1
+        print(f"\nbaseline {baseline['total_ms']:.1f} ms, change {change:+.0%}")
+        if change > args.tolerance:
+            print(f"Startup is slower than the baseline by more than {args.tolerance:.0%}")
+            failed = True
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+"""Benchmark suite: parsing, rewriting, generation and rendering on seeded synthetic command dumps.
+
+Run from the repository root: python -m benchmarks.bench_suite [--sizes 1000,100000,1000000] [--only NAME ...]
+                              [--repeat 3] [--frames 60] [--save FILE] [--compare FILE] [--tolerance 0.25]
+
+Every size gets its own dataset of block_display summons, end_crystal
+summons with a BeamTarget, setblocks and `kill @e[x=..]` commands in equal
+shares, generated from --seed, so two runs with the same arguments time
+the same text (its SHA-256 is in the results). The benchmarks:
+
+  parse_coordinates   ClipboardCoordinateParser.parse_coordinates, per command
+  modify_coordinates  CommandProcessor.modify_coordinates (offsets), per command
+  process_command     command_modifier.process_command on the "Modify Laser" tab, per command
+  viewer_parse        Block3DViewer.parse_commands on the whole dump, per command
+  frame               one 3D frame of the dump's setblocks in an offscreen window, p50 of --frames
+
+The GUI-facing ones run headlessly: the Tk variables, notebook and textbox
+are replaced by plain objects and the clipboard write is skipped (the app
+times that itself, see the Diagnostics panel). Rewrites run without the
+rewrite cache, so every command is computed. The viewer benchmarks are
+skipped when pygame/PyOpenGL or an OpenGL context are not available.
+
+--save writes the results and the run's setup as JSON; --compare reads
+such a file and exits with status 1 when a benchmark got slower than the
+tolerance allows.
+"""
+import argparse
+import contextlib
+import gc
+import hashlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+BENCHMARKS = ("parse_coordinates", "modify_coordinates", "process_command", "viewer_parse", "frame")
+
+# Setblocks fill a build-sized volume so the viewer meshes chunks rather than one block per chunk
+BUILD_SPAN = 128
+SETBLOCK_BLOCKS = ("minecraft:stone_bricks", "minecraft:oak_planks", "minecraft:glass",
+                   "minecraft:oak_stairs[facing=east]", "minecraft:lime_concrete")
+
+
+def make_commands(count, seed=1234):
+    """block_display / end_crystal / setblock / kill commands in equal shares, same list for the same seed."""
+    rng = random.Random(seed)
+    commands = []
+    for i in range(count):
+        x, y, z = rng.randint(-3000, 3000), rng.randint(-64, 320), rng.randint(-3000, 3000)
+        kind = i % 4
+        if kind == 0:
+            commands.append(f'summon minecraft:block_display {x + 0.5:.6f} {y:.6f} {z - 0.25:.6f} '
+                            f'{{block_state:{{Name:"minecraft:lime_concrete"}},'
+                            f'transformation:{{translation:[0.5f,0.0f,0.0f],scale:[0.1f,0.1f,-150.000000f],'
+                            f'left_rotation:[0.0f,0.0f,0.0f,1.0f],right_rotation:[0.0f,0.0f,0.0f,1.0f]}},'
+                            f'brightness:15728880,shadow:false,billboard:"fixed",Tags:["beam{i % 50}"]}}')
+        elif kind == 1:
+            commands.append(f'summon end_crystal {x} {y} {z} {{ShowBottom:0b,Invulnerable:1b,Tags:["laser"],'
+                            f'BeamTarget:{{X:{x + 5},Y:{y + 6},Z:{z - 5}}}}}')
+        elif kind == 2:
+            bx, by, bz = (rng.randrange(-BUILD_SPAN // 2, BUILD_SPAN // 2), rng.randrange(0, BUILD_SPAN // 2),
+                          rng.randrange(-BUILD_SPAN // 2, BUILD_SPAN // 2))
+            commands.append(f'setblock {bx} {by} {bz} {SETBLOCK_BLOCKS[i % len(SETBLOCK_BLOCKS)]}')
+        else:
+            commands.append(f'kill @e[type=end_crystal,x={x},y={y},z={z},distance=..1]')
+    return commands
+
+
+class Value:
+    """Stands in for a Tk variable: get() returns what it was built with."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class Notebook:
+    """Stands in for the ttk.Notebook with one tab selected."""
+
+    def __init__(self, tab_text):
+        self.tab_text = tab_text
+
+    def select(self):
+        return "tab"
+
+    def tab(self, tab_id, option):
+        return self.tab_text
+
+
+class Textbox:
+    """Stands in for a result textbox; keeps the last text inserted."""
+
+    def __init__(self):
+        self.text = ""
+
+    def winfo_exists(self):
+        return True
+
+    def delete(self, start, end):
+        self.text = ""
+
+    def insert(self, index, text):
+        self.text = text
+
+
+def headless_gui(tab_text):
+    """Just enough of CommandModifierGUI for the rewrite path, with the default rewrite profile already traced."""
+    from src.command_modifier import _RESULT_TEXTBOXES
+    from src.rewrite_engine import RewriteProfile
+    gui = SimpleNamespace(notebook=Notebook(tab_text), rewrite_profile=SimpleNamespace(profile=RewriteProfile()),
+                          print_to_text=lambda message, tags="normal": None)
+    for textbox_name in set(_RESULT_TEXTBOXES.values()):
+        setattr(gui, textbox_name, Textbox())
+    return gui
+
+
+@contextlib.contextmanager
+def no_clipboard():
+    """Skip pyperclip.copy, which needs a desktop session and would dominate the timing."""
+    import pyperclip
+    copy = pyperclip.copy
+    pyperclip.copy = lambda text: None
+    try:
+        yield
+    finally:
+        pyperclip.copy = copy
+
+
+def best_of(repeat, run):
+    """Fastest of `repeat` calls to run(), in seconds, with garbage collection off as in timeit."""
+    times = []
+    for _ in range(repeat):
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return min(times)
+
+
+def per_command(seconds, count):
+    return {"value": seconds / count * 1e6, "unit": "us/command", "seconds": seconds, "commands_per_sec": count / seconds}
+
+
+def bench_parse_coordinates(commands, text, args):
+    from src.clipboard_parser import ClipboardCoordinateParser
+    parse = ClipboardCoordinateParser(None).parse_coordinates
+
+    def run():
+        for command in commands:
+            parse(command)
+    return per_command(best_of(args.repeat, run), len(commands))
+
+
+def bench_modify_coordinates(commands, text, args):
+    from src.command_processor import CommandProcessor
+    # Skips __init__, which arms the global F12 hook
+    processor = CommandProcessor.__new__(CommandProcessor)
+    processor.gui = SimpleNamespace(notebook=Notebook("Set Coordinates"))
+    offsets = [Value(v) for v in ("16", "0", "-32", "16", "0", "-32")]
+    block_text = Value("")
+    modify = processor.modify_coordinates
+
+    def run():
+        for command in commands:
+            modify(command, False, *offsets, block_text)
+    return per_command(best_of(args.repeat, run), len(commands))
+
+
+def bench_process_command(commands, text, args):
+    from src.command_modifier import process_command
+    gui = headless_gui("Modify Laser")
+
+    def run():
+        for command in commands:
+            process_command(gui, command)
+    with no_clipboard():
+        return per_command(best_of(args.repeat, run), len(commands))
+
+
+def bench_viewer_parse(commands, text, args):
+    from src.viewer3d import Block3DViewer
+    # parse_commands needs no window
+    viewer = Block3DViewer.__new__(Block3DViewer)
+    return per_command(best_of(args.repeat, lambda: viewer.parse_commands(text)), len(commands))
+
+
+def bench_frame(commands, text, args):
+    """Build the scene from the dump's setblocks, upload every chunk, then time --frames frames."""
+    from OpenGL.GL import glClear, glFinish, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT
+    from src.stage_timings import percentile
+    from src.viewer3d import Block3DViewer
+    try:
+        viewer = Block3DViewer()
+    except SystemExit:
+        # init_opengl exits when there is no OpenGL context
+        raise RuntimeError("no OpenGL context")
+    blocks = viewer.parse_commands(text)
+    viewer.add_blocks(blocks)
+    renderer = viewer.renderer
+    if renderer is not None:
+        while renderer.mesher.dirty:
+            renderer.upload()
+
+    def frame():
+        # The 3D part of Block3DViewer.update_loop, which its frame counter also covers
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        viewer.update_camera()
+        viewer.draw_ground()
+        if renderer:
+            renderer.draw(None, viewer.ORANGE)
+        else:
+            for x, y, z, color in viewer.blocks:
+                viewer.draw_block(x, y, z, color)
+        glFinish()
+
+    frame()
+    times = []
+    for i in range(args.frames):
+        # Orbit so every frame sees the build from a different side
+        viewer.camera_yaw = 45.0 + i * 360.0 / args.frames
+        start = time.perf_counter()
+        frame()
+        times.append(time.perf_counter() - start)
+    ordered = sorted(times)
+    return {"value": percentile(ordered, 50) * 1000, "unit": "ms/frame", "p95_ms": percentile(ordered, 95) * 1000,
+            "max_ms": ordered[-1] * 1000, "frames": args.frames, "blocks": len(blocks),
+            "triangles": renderer.triangle_count if renderer else len(blocks) * 12,
+            "renderer": "vbo" if renderer else "immediate"}
+
+
+BENCHMARK_FUNCTIONS = {
+    "parse_coordinates": bench_parse_coordinates,
+    "modify_coordinates": bench_modify_coordinates,
+    "process_command": bench_process_command,
+    "viewer_parse": bench_viewer_parse,
+    "frame": bench_frame,
+}
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def parse_sizes(value):
+    return [int(size.replace("_", "")) for size in value.split(",") if size]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time parsing, rewriting and rendering on synthetic command dumps.")
+    parser.add_argument("--sizes", type=parse_sizes, default=list(DEFAULT_SIZES),
+                        help="comma-separated dataset sizes in commands (default 1000,100000,1000000)")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--seed", type=int, default=1234, help="dataset seed")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per benchmark; the fastest counts")
+    parser.add_argument("--frames", type=int, default=60, help="frames to time per dataset")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail if a benchmark is slower than in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown for --compare (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if "frame" in args.only:
+        # Render without a visible window; must be set before pygame starts its video system
+        if "SDL_VIDEODRIVER" not in os.environ:
+            os.environ["SDL_VIDEODRIVER"] = "offscreen"
+            # The offscreen driver makes its GL context through EGL, where PyOpenGL has to look for it
+            os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    datasets = {}
+    regressions = []
+    skipped = {}
+    print(f"{'benchmark':28s} {'time':>12s} {'unit':10s}" + (f" {'baseline':>10s} {'change':>8s}" if baseline else ""))
+    for size in args.sizes:
+        commands = make_commands(size, args.seed)
+        text = "\n".join(commands)
+        datasets[str(size)] = {"commands": size, "bytes": len(text), "sha256": hashlib.sha256(text.encode()).hexdigest()}
+        for name in args.only:
+            if name in skipped:
+                continue
+            key = f"{name}/{size}"
+            try:
+                result = BENCHMARK_FUNCTIONS[name](commands, text, args)
+            except (ImportError, RuntimeError) as e:
+                # pygame.error is a RuntimeError
+                skipped[name] = str(e)
+                print(f"{name:28s} skipped: {e}")
+                continue
+            results[key] = result
+            line = f"{key:28s} {result['value']:12.3f} {result['unit']:10s}"
+            if key in baseline:
+                change = result["value"] / baseline[key]["value"] - 1
+                line += f" {baseline[key]['value']:10.3f} {change:+8.0%}"
+                if change > args.tolerance:
+                    regressions.append(key)
+                    line += "  REGRESSION"
+            print(line)
+        del commands, text
+
+    if args.save:
+        run = {"seed": args.seed, "repeat": args.repeat, "frames": args.frames, "commit": git_commit(),
+               "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+               "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        with open(args.save, "w") as f:
+            json.dump({"run": run, "datasets": datasets, "skipped": skipped, "results": results}, f, indent=4)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Fuzz and latency checks for the linear-time end_crystal summon parser.
+
+Run from the repository root: python -m benchmarks.fuzz_end_crystal [--cases 5000] [--ceiling-ms 50]
+
+Random short commands must give the same result as the regex the parser
+replaced (kept below as the reference), and pathological inputs of growing
+size must finish under the latency ceiling with roughly linear growth.
+Exits with status 1 on any mismatch or slow case.
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from src.command_parser import find_beam_target, find_end_crystal_summon
+
+# The patterns modify_coordinates used before; fine on short input, exponential-ish on long malformed input
+REFERENCE_SUMMON = re.compile(r'(summon end_crystal\s+)(-?\d+)(\s+)(-?\d+)(\s+)(-?\d+)(.*?(?:BeamTarget:\{|\],\{).*?X:)(-?\d+)(.*?Y:)(-?\d+)(.*?Z:)(-?\d+)(.*?\}\})')
+REFERENCE_BEAM_TARGET = re.compile(r'BeamTarget:\{.*?X:(-?\d+).*?Y:(-?\d+).*?Z:(-?\d+).*?\}')
+
+_FRAGMENTS = ["summon end_crystal ", "summon end_crystal", "BeamTarget:{", "],{", "X:", "Y:", "Z:", "}}", "}", "{",
+              "1", "-2", "34", "-", " ", "  ", "\n", ",", "Tags:[\"laser\"]", "a"]
+
+
+def random_command(rng):
+    return ''.join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 24)))
+
+
+def reference_summon(command):
+    match = REFERENCE_SUMMON.search(command)
+    if not match:
+        return None
+    return match.start(), match.end(), [match.span(group) for group in (2, 4, 6, 8, 10, 12)]
+
+
+def reference_beam_target(command):
+    match = REFERENCE_BEAM_TARGET.search(command)
+    return [match.span(group) for group in (1, 2, 3)] if match else None
+
+
+def pathological_inputs(size):
+    """Malformed summons that made the reference regex backtrack; each is about `size` characters."""
+    repeat = max(1, size // 16)
+    return {
+        "unclosed target": "summon end_crystal 1 2 3 " + "],{X:1 Y:2 Z:3 " * repeat,
+        "keys without numbers": "summon end_crystal 1 2 3 BeamTarget:{" + "X:Y:Z:" * (size // 6),
+        "repeated summons": "summon end_crystal 1 2 3 ],{" * (size // 28),
+        "long NBT, no target": "summon end_crystal 1 2 3 {" + "Tags:[\"a\"]," * (size // 11),
+        "beam target only": "BeamTarget:{X:1,Y:2," * (size // 20),
+    }
+
+
+def best_time(function, text, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_equivalence(cases, seed):
+    rng = random.Random(seed)
+    failures = 0
+    for _ in range(cases):
+        command = random_command(rng)
+        for name, parsed, expected in (("summon", find_end_crystal_summon(command), reference_summon(command)),
+                                       ("beam target", find_beam_target(command), reference_beam_target(command))):
+            if parsed != expected:
+                failures += 1
+                if failures <= 5:
+                    print(f"{name} mismatch for {command!r}: {parsed} != {expected}")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz the end_crystal summon parser and check its latency.")
+    parser.add_argument("--cases", type=int, default=5000, help="random commands compared with the reference regex")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="pathological input sizes")
+    parser.add_argument("--ceiling-ms", type=float, default=50.0, help="latency ceiling for the largest input")
+    parser.add_argument("--max-growth", type=float, default=4.0,
+                        help="allowed time ratio over the size ratio between consecutive sizes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    failed = False
+
+    mismatches = check_equivalence(args.cases, args.seed)
+    print(f"equivalence: {args.cases} random commands, {mismatches} mismatch(es)")
+    failed |= mismatches > 0
+
+    sizes = sorted(args.sizes)
+    print(f"{'input':22s}" + ''.join(f" {size:>10d}" for size in sizes) + "  (ms)")
+    for name in pathological_inputs(sizes[0]):
+        timings = []
+        for size in sizes:
+            text = pathological_inputs(size)[name]
+            parse = find_beam_target if name == "beam target only" else find_end_crystal_summon
+            timings.append(best_time(parse, text))
+        line = f"{name:22s}" + ''.join(f" {t * 1000:10.3f}" for t in timings)
+        if timings[-1] * 1000 > args.ceiling_ms:
+            line += "  OVER CEILING"
+            failed = True
+        for (small, t_small), (large, t_large) in zip(zip(sizes, timings), zip(sizes[1:], timings[1:])):
+            # Ignore sub-millisecond noise; beyond that, time should scale with size
+            if t_large > 1e-3 and t_large / max(t_small, 1e-6) > args.max_growth * large / small:
+                line += f"  SUPERLINEAR ({small}->{large})"
+                failed = True
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Fuzz the block_display parser and the rewrite rules with truncated and mixed-notation commands.
+
+Run from the repository root: python -m benchmarks.fuzz_rewrite [--cases 2000] [--timeout 2] [--ceiling-ms 50]
+
+Every case goes through parse_block_display (reading each payload field),
+rewrite_command on every rewrite tab and modify_coordinates with offsets
+and with set values; mixed cases also go through the batch rewriter's
+--offset path, as a line of a datapack. The cases are:
+
+  truncated   valid commands cut at random points, some followed by junk
+              tokens, as when a clipboard copy is cut short
+  unclosed    [ and { values that never close, a few thousand characters long
+  mixed       setblock, tp and end_crystal positions mixing ^, ~ and
+              absolute axes; offsets must leave a position that mixes ^
+              with other notations unchanged and never touch a ~ or ^ axis
+
+Parsing may reject a command with ValueError; any other exception, a
+rewrite that raises at all, a case slower than --ceiling-ms or one that
+does not finish within --timeout seconds (the sign of a backtracking
+regex) makes the script exit with status 1. Cases run in a worker
+process so a hung one can be stopped.
+"""
+import argparse
+import logging
+import multiprocessing
+import random
+import sys
+import time
+
+# Complete commands the truncated cases are cut from
+SAMPLES = [
+    '/summon minecraft:block_display 12.000000 64.500000 -7.999999 {block_state:{Name:"minecraft:oak_stairs",'
+    'Properties:{facing:"east",half:"top"}},transformation:{translation:[0.5f,0.0f,0.0f],scale:[0.1f,0.1f,-150.000000f],'
+    'left_rotation:[0.0f,0.0f,0.0f,1.0f],right_rotation:[0.0f,0.0f,0.0f,1.0f]},brightness:{sky:15,block:15},'
+    'shadow:false,billboard:"fixed",Tags:["beam1","laser"]}',
+    '/summon minecraft:block_display 1 2 3 {Passengers:[{id:"minecraft:block_display",Tags:["p"],'
+    'transformation:{translation:[0f,0f,0f],scale:[1f,1f,1f]}}],Tags:["old"],'
+    'transformation:{translation:[0.5f,0.0f,0.0f],scale:[0.1f,0.1f,-150f]}}',
+    'summon end_crystal 10 64 -20 {ShowBottom:0b,Invulnerable:1b,Tags:["laser"],BeamTarget:{X:15,Y:70,Z:-25}}',
+    'setblock 10 64 -20 minecraft:oak_stairs[facing=east]',
+    'kill @e[type=end_crystal,x=10,y=64,z=-20,distance=..1]',
+    'execute as @e[tag=beam1] at @s run tp @s ~ ~ ~ ~1.0 ~0.0',
+    'tp @a[tag=builder] 100 64.5 -20 90 0',
+]
+
+_JUNK = [" a", " 1", ",", "f", "\"", "'", "[", "{", ":", " ~", " ^"]
+_AXES = ["1", "-2", "0", "~", "~3", "~-1.5", "^", "^2", "^-0.5"]
+_PATHOLOGICAL_SIZE = 4000
+
+
+def truncated_case(rng):
+    text = rng.choice(SAMPLES)
+    text = text[:rng.randint(1, len(text) - 1)]
+    if rng.random() < 0.5:
+        text += ''.join(rng.choice(_JUNK) for _ in range(rng.randint(1, 30)))
+    return text
+
+
+def unclosed_cases():
+    """The shapes that made the block_display field pattern backtrack, at a size where that would hang."""
+    head = '/summon minecraft:block_display 1 2 3 {'
+    repeat = _PATHOLOGICAL_SIZE // 4
+    return [
+        head + 'transformation:{translation:[0.5f,0.0f,0.0f],scale:[0.1f, 0.1f, ' + '1' * _PATHOLOGICAL_SIZE,
+        head + 'block_state:{Name:"x"' + ' a' * repeat,
+        head + 'block_state:{Name:"x",Properties:{facing:"east"' + ' a' * repeat,
+        head + 'Tags:[' + '"a",' * repeat,
+        head + 'Tags:["a' + 'b' * _PATHOLOGICAL_SIZE,
+        head + 'brightness:{sky:15' + ',block:15' * (repeat // 2),
+        head + 'transformation:{scale:[' + '0.1f,' * repeat + '}',
+    ]
+
+
+# Templates for the mixed cases, with the index of the first position token
+_MIXED_TEMPLATES = [
+    ('setblock {} {} {} minecraft:stone', 1),
+    ('/setblock {} {} {} minecraft:stone', 1),
+    ('tp @s {} {} {}', 2),
+    ('execute as @e[tag=beam1] at @s run tp @s {} {} {} ~1.0 ~0.0', 8),
+    ('summon end_crystal {} {} {} {{ShowBottom:0b,Tags:["laser"],BeamTarget:{{X:1,Y:2,Z:3}}}}', 2),
+]
+
+
+def mixed_case(rng, axes=None, template=None):
+    """(command, position token index, True when its position is one the game rejects)."""
+    axes = axes or [rng.choice(_AXES) for _ in range(3)]
+    template, index = template or rng.choice(_MIXED_TEMPLATES)
+    local = [axis.startswith('^') for axis in axes]
+    return template.format(*axes), index, any(local) and not all(local)
+
+
+def mixed_cases(count, rng):
+    """Random mixed cases after the relative positions a translated build used to drag along."""
+    cases = [mixed_case(rng, ["~", "~", "~"], _MIXED_TEMPLATES[3]),
+             mixed_case(rng, ["~", "~1", "~"], _MIXED_TEMPLATES[0]),
+             mixed_case(rng, ["^", "^", "^2"], _MIXED_TEMPLATES[2])]
+    return cases + [mixed_case(rng) for _ in range(count)]
+
+
+def _moved_symbolic_axis(text, result, position_index):
+    before = text.lstrip('/').split()[position_index:position_index + 3]
+    after = result.lstrip('/').split()[position_index:position_index + 3]
+    return any(old[0] in '~^' and old != new for old, new in zip(before, after))
+
+
+def check_case(text, position_index=None, mixed_invalid=False):
+    """Run one case; returns (error or None, seconds).
+
+    For mixed cases position_index is where the position starts in the
+    command's tokens, so the ~ and ^ axes can be checked after offsets.
+    """
+    from src.command_parser import parse_block_display
+    from src.batch_rewrite import BatchRewriter
+    from src.rewrite_engine import DEFAULT_REWRITE_VALUES, REWRITE_TABS, RewriteProfile, modify_coordinates, rewrite_command
+    start = time.perf_counter()
+    try:
+        try:
+            command = parse_block_display(text)
+        except ValueError:
+            command = None
+        if command is not None:
+            for read in (lambda: command.block_state, lambda: command.block_name, lambda: command.tags,
+                         lambda: command.brightness, lambda: command.billboard,
+                         lambda: [command.get_vector(key) for key in ("translation", "scale", "left_rotation", "right_rotation")],
+                         lambda: command.vector_values("scale")):
+                try:
+                    read()
+                except ValueError:
+                    pass
+        profile = RewriteProfile()
+        for tab in REWRITE_TABS:
+            rewrite_command(text, tab, profile)
+        # Offsets must leave an invalid position alone and move only absolute axes;
+        # set values replace the position without reading it
+        result, _, _ = modify_coordinates(text, False, (1, 2, 3), (1, 1, 1))
+        if mixed_invalid and result != text:
+            return f"invalid mixed position was moved to {result!r}", time.perf_counter() - start
+        if position_index is not None:
+            batch_result = BatchRewriter("modify laser", DEFAULT_REWRITE_VALUES, ((1, 2, 3), (1, 1, 1))).rewrite_line(text)
+            for moved in (result, batch_result):
+                if _moved_symbolic_axis(text, moved, position_index):
+                    return f"offsets moved a ~ or ^ axis: {moved!r}", time.perf_counter() - start
+        modify_coordinates(text, True, (1, 2, 3), (1, 1, 1))
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return None, time.perf_counter() - start
+
+
+def _init_worker():
+    # The rules log a warning for every invalid value; the fuzz only cares about exceptions and time
+    logging.disable(logging.CRITICAL)
+
+
+def generate_cases(count, seed):
+    """(group, text, position_index, mixed_invalid) tuples; the same list for the same seed."""
+    rng = random.Random(seed)
+    cases = [("truncated", truncated_case(rng), None, False) for _ in range(count)]
+    cases += [("unclosed", text, None, False) for text in unclosed_cases()]
+    cases += [("mixed", *case) for case in mixed_cases(count, rng)]
+    return cases
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz the block_display parser and rewrite rules with malformed commands.")
+    parser.add_argument("--cases", type=int, default=2000, help="truncated and mixed-notation cases each")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--timeout", type=float, default=2.0, help="seconds before a case counts as hung")
+    parser.add_argument("--ceiling-ms", type=float, default=50.0, help="latency ceiling per case")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    failures = {}
+    slowest = {}
+    pool = multiprocessing.Pool(1, initializer=_init_worker)
+    try:
+        for group, text, position_index, mixed_invalid in generate_cases(args.cases, args.seed):
+            try:
+                error, seconds = pool.apply_async(check_case, (text, position_index, mixed_invalid)).get(args.timeout)
+            except multiprocessing.TimeoutError:
+                error, seconds = f"no result within {args.timeout:g}s", args.timeout
+                # The worker is stuck in the case; start a fresh one for the rest
+                pool.terminate()
+                pool = multiprocessing.Pool(1, initializer=_init_worker)
+            if error is None and seconds * 1000 > args.ceiling_ms:
+                error = f"took {seconds * 1000:.1f} ms"
+            slowest[group] = max(slowest.get(group, 0.0), seconds)
+            if error is not None:
+                failures.setdefault(group, []).append((text, error))
+    finally:
+        pool.terminate()
+
+    print(f"{'cases':10s} {'slowest ms':>10s} {'failures':>9s}")
+    for group in ("truncated", "unclosed", "mixed"):
+        print(f"{group:10s} {slowest.get(group, 0.0) * 1000:10.3f} {len(failures.get(group, [])):9d}")
+    for group, group_failures in failures.items():
+        for text, error in group_failures[:5]:
+            shown = text if len(text) <= 120 else text[:117] + "..."
+            print(f"{group}: {error}: {shown!r}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
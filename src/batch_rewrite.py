@@ -0,0 +1,220 @@
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src import patterns
+from src.rewrite_engine import DEFAULT_REWRITE_VALUES, RewriteProfile, modify_coordinates, rewrite_command
+
+logger = logging.getLogger(__name__)
+
+# CLI mode -> notebook tab whose rewrite rules are applied to block_display summons
+MODES = {
+    "modify-laser": "modify laser",
+    "change-block": "change block",
+    "set-coordinates": "set coordinates",
+}
+
+# Lines per work unit when rewriting on a process pool
+DEFAULT_CHUNK_SIZE = 5000
+
+# Tabs whose rules rename tag= selectors in execute/tp commands
+_SELECTOR_TABS = ("modify laser", "rename tag/group")
+
+
+class BatchRewriter:
+    """Applies the GUI rewrite rules to command lines without a Tk root, clipboard or keyboard hook."""
+
+    def __init__(self, active_tab: str, values: Dict, offsets: Optional[Tuple[Tuple[int, int, int], Tuple[int, int, int]]] = None,
+                 setblock_block: Optional[str] = None):
+        self.active_tab = active_tab
+        # Converted once, not per line
+        self.values = values if isinstance(values, RewriteProfile) else RewriteProfile.from_values(values)
+        self.offsets = offsets
+        self.setblock_block = setblock_block
+        self.lines = 0
+        self.changed = 0
+        self.errors = 0
+
+    def rewrite_line(self, line: str, path: str = "<input>", number: Optional[int] = None) -> str:
+        """Rewrite one .mcfunction line; comments, blank lines and unknown commands pass through.
+
+        A line whose rewrite raises is logged with its path and line number and
+        written out unchanged, so one bad line does not abort the whole file.
+        """
+        self.lines += 1
+        try:
+            return self._rewrite_line(line)
+        except Exception as e:
+            self.errors += 1
+            logger.error("%s:%s: left unchanged, could not rewrite it: %s", path, number if number is not None else self.lines, e)
+            return line
+
+    def _rewrite_line(self, line: str) -> str:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            return line
+        # .mcfunction lines carry no leading slash; the rewrite rules expect one
+        had_slash = stripped.startswith('/')
+        command = stripped if had_slash else '/' + stripped
+
+        if command.startswith('/summon minecraft:block_display'):
+            result, _ = rewrite_command(command, self.active_tab, self.values)
+        elif command.startswith(("/setblock", "/kill", "/summon end_crystal")) and (self.offsets is not None or self.setblock_block is not None):
+            pos_offsets, target_offsets = self.offsets or ((0, 0, 0), (0, 0, 0))
+            result, _, _ = modify_coordinates(command, False, pos_offsets, target_offsets, self.setblock_block)
+            if not result.startswith('/'):
+                result = '/' + result
+        elif command.startswith(("/tp ", "/teleport ", "/execute ")):
+            # As in the GUI: tag= selectors are renamed and absolute tp axes move with the offsets;
+            # ~ and ^ axes follow the executing entity and stay as written
+            result = command
+            if self.active_tab in _SELECTOR_TABS:
+                result, _ = rewrite_command(command, self.active_tab, self.values)
+            if result is not None and self.offsets is not None and patterns.TELEPORT_COMMAND.search(result):
+                result, _, _ = modify_coordinates(result, False, *self.offsets)
+        else:
+            result = command
+
+        if result is None:
+            return line
+        if not had_slash:
+            result = result[1:]
+        if result == stripped:
+            return line
+        self.changed += 1
+        return result + "\n" if line.endswith("\n") else result
+
+    def rewrite_lines(self, lines: Iterable[str], path: str = "<input>", first_number: int = 1) -> Iterator[str]:
+        for number, line in enumerate(lines, first_number):
+            yield self.rewrite_line(line, path, number)
+
+
+def collect_mcfunction_files(paths: List[str]) -> List[Tuple[str, str]]:
+    """Expand files and datapack directories into (path, path relative to its input root) pairs."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if filename.endswith(".mcfunction"):
+                        full_path = os.path.join(dirpath, filename)
+                        files.append((full_path, os.path.relpath(full_path, path)))
+        else:
+            files.append((path, os.path.basename(path)))
+    return files
+
+
+@contextlib.contextmanager
+def open_output(output_path: Optional[str]):
+    """Writable text stream for output_path: stdout when None, otherwise a temp file moved into place on success."""
+    if output_path is None:
+        yield sys.stdout
+        return
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as dst:
+            yield dst
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    os.replace(temp_path, output_path)
+
+
+def rewrite_file(rewriter: BatchRewriter, path: str, output_path: Optional[str]):
+    """Stream a file through the rewriter into output_path (stdout when None, in place when equal to path)."""
+    with open(path, "r", encoding="utf-8") as src, open_output(output_path) as dst:
+        dst.writelines(rewriter.rewrite_lines(src, path))
+
+
+def output_path_for(args, path: str, relative_path: str) -> Optional[str]:
+    if args.in_place:
+        return path
+    if args.output_dir:
+        return os.path.join(args.output_dir, relative_path)
+    return None
+
+
+def build_values(args) -> Dict:
+    """Translate CLI flags into rewrite values; rules whose flags are absent leave commands untouched."""
+    values = dict(DEFAULT_REWRITE_VALUES)
+    values["modify_coords"] = args.pos is not None or args.centering is not None
+    values["pos_x_set"], values["pos_y_set"], values["pos_z_set"] = args.pos or ("", "", "")
+    values["modify_centering"] = args.centering is not None
+    values["centering_x"], values["centering_y"], values["centering_z"] = args.centering or ("", "", "")
+    values["modify_translation"] = args.translation is not None
+    values["trans_x"], values["trans_y"], values["trans_z"] = args.translation or ("", "", "")
+    values["modify_scale"] = args.scale is not None
+    values["beam_scale"] = args.scale or ""
+    values["tag_text"] = args.tag
+    values["block_text"] = args.block or ""
+    return values
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rewrite .mcfunction files or whole datapacks with the command modifier rules.")
+    parser.add_argument("paths", nargs="+", help=".mcfunction files or datapack directories")
+    parser.add_argument("--mode", choices=sorted(MODES), default="modify-laser", help="rules applied to block_display summons")
+    parser.add_argument("--pos", nargs=3, metavar=("X", "Y", "Z"), help="set block_display coordinates (empty string keeps an axis)")
+    parser.add_argument("--centering", nargs=3, metavar=("X", "Y", "Z"), help="centering offsets added to block_display coordinates")
+    parser.add_argument("--translation", nargs=3, metavar=("X", "Y", "Z"), help="set the block_display translation")
+    parser.add_argument("--scale", help="set the beam length (z scale) of block_display summons")
+    parser.add_argument("--tag", help="rename Tags/tag= selectors")
+    parser.add_argument("--block", help="new block for block_display (change-block mode) and setblock commands")
+    parser.add_argument("--offset", nargs=3, type=int, metavar=("DX", "DY", "DZ"), help="offset absolute setblock, end_crystal, kill and tp coordinates (~ and ^ axes are kept)")
+    parser.add_argument("--target-offset", nargs=3, type=int, metavar=("DX", "DY", "DZ"), help="offset end_crystal BeamTarget coordinates")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("-o", "--output-dir", help="write rewritten files here, mirroring the input layout")
+    output.add_argument("--in-place", action="store_true", help="rewrite the input files in place")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes (0 = one per CPU core, 1 = no process pool)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="lines per work unit handed to a worker process")
+    parser.add_argument("--compare", action="store_true", help="report single-core vs multi-core throughput without writing output")
+    parser.add_argument("-v", "--verbose", action="store_true", help="enable debug logging")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    offsets = None
+    if args.offset or args.target_offset:
+        offsets = (tuple(args.offset or (0, 0, 0)), tuple(args.target_offset or (0, 0, 0)))
+    active_tab, values = MODES[args.mode], build_values(args)
+    setblock_block = args.block if args.block else None
+    files = [(path, output_path_for(args, path, relative_path)) for path, relative_path in collect_mcfunction_files(args.paths)]
+
+    if args.workers != 1 or args.compare:
+        from src.parallel_rewriter import ParallelRewriter, compare_throughput
+        try:
+            if args.compare:
+                single, multi = compare_throughput(files, active_tab, values, offsets, setblock_block, args.workers or None, args.chunk_size)
+                print(single, file=sys.stderr)
+                print(multi, file=sys.stderr)
+                print(f"Speedup: {single.elapsed / multi.elapsed:.2f}x on {multi.workers} workers", file=sys.stderr)
+                return
+            stats = ParallelRewriter(active_tab, values, offsets, setblock_block, args.workers or None, args.chunk_size).rewrite_files(files)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        print(f"Rewrote {stats}", file=sys.stderr)
+        return
+
+    rewriter = BatchRewriter(active_tab, values, offsets, setblock_block)
+    start = time.perf_counter()
+    for path, output_path in files:
+        rewrite_file(rewriter, path, output_path)
+    elapsed = time.perf_counter() - start
+
+    rate = rewriter.lines / elapsed if elapsed > 0 else float("inf")
+    print(f"Rewrote {len(files)} file(s): {rewriter.lines} lines, {rewriter.changed} changed in {elapsed:.3f}s ({rate:,.0f} lines/sec)", file=sys.stderr)
+    if rewriter.errors:
+        print(f"{rewriter.errors} line(s) could not be rewritten and were left unchanged; see the errors above", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 2000
+# Parsed batches waiting for the render loop; with the batch size this bounds the loader's memory
+DEFAULT_MAX_PENDING_BATCHES = 8
+
+
+def iter_text_lines(text: str) -> Iterator[Tuple[str, int]]:
+    """Yield (line, characters consumed) from text without building a list of all lines."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start)
+        if end == -1:
+            end = length - 1
+        yield text[start:end + 1], end + 1 - start
+        start = end + 1
+
+
+def iter_file_lines(path: str) -> Iterator[Tuple[str, int]]:
+    """Yield (line, bytes consumed) from a file, reading it incrementally."""
+    with open(path, "rb") as f:
+        for raw in f:
+            yield raw.decode("utf-8", errors="replace"), len(raw)
+
+
+class StreamingBlockLoader:
+    """Parses setblock commands on a background thread and hands them over in batches.
+
+    The worker blocks once max_pending batches are waiting, so a huge dump never
+    sits fully parsed in memory ahead of the scene. The render loop calls
+    take_batch() each frame, within its time budget, and feeds the blocks into the scene.
+    """
+
+    def __init__(self, parse_line: Callable[[str], Optional[tuple]], text: Optional[str] = None, path: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_pending: int = DEFAULT_MAX_PENDING_BATCHES):
+        if (text is None) == (path is None):
+            raise ValueError("Pass either text or path")
+        self.parse_line = parse_line
+        self.text = text
+        self.path = path
+        self.batch_size = batch_size
+        self.total = len(text) if text is not None else os.path.getsize(path)
+        self.consumed = 0
+        self.lines = 0
+        self.blocks_loaded = 0
+        self.done = False
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="block-loader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def progress(self) -> float:
+        if self.finished or not self.total:
+            return 1.0
+        return self.consumed / self.total
+
+    @property
+    def finished(self) -> bool:
+        """True once the whole source was parsed and every batch was taken."""
+        return self.done and self._queue.empty()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        start = time.perf_counter()
+        lines = iter_text_lines(self.text) if self.text is not None else iter_file_lines(self.path)
+        parse_line = self.parse_line
+        batch = []
+        consumed = 0
+        try:
+            for line, size in lines:
+                consumed += size
+                self.lines += 1
+                block = parse_line(line)
+                if block is not None:
+                    batch.append(block)
+                    if len(batch) >= self.batch_size:
+                        if not self._put((batch, consumed)):
+                            return
+                        batch = []
+            if batch and not self._put((batch, consumed)):
+                return
+            logger.debug("Streamed %s lines in %.2fs", self.lines, time.perf_counter() - start)
+        except Exception as e:
+            self.error = str(e)
+            logger.error("Error streaming block commands: %s", e)
+        finally:
+            self.text = None
+            self.done = True
+
+    def take_batch(self) -> Optional[list]:
+        """Next parsed batch of blocks, or None when none is ready."""
+        try:
+            batch, consumed = self._queue.get_nowait()
+        except queue.Empty:
+            return None
+        self.consumed = consumed
+        self.blocks_loaded += len(batch)
+        return batch
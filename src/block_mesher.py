@@ -0,0 +1,315 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Cube corners relative to the block center, indexed like Block3DViewer.draw_block
+CUBE_CORNERS = np.array([
+    [-0.5, -0.5, -0.5], [0.5, -0.5, -0.5],
+    [0.5, 0.5, -0.5], [-0.5, 0.5, -0.5],
+    [-0.5, -0.5, 0.5], [0.5, -0.5, 0.5],
+    [0.5, 0.5, 0.5], [-0.5, 0.5, 0.5]
+], dtype=np.float32)
+CUBE_FACES = np.array([
+    (0, 1, 2, 3),  # Front
+    (5, 4, 7, 6),  # Back
+    (1, 5, 6, 2),  # Right
+    (4, 0, 3, 7),  # Left
+    (3, 2, 6, 7),  # Top
+    (4, 5, 1, 0)   # Bottom
+])
+FACE_NORMALS = np.array([
+    [0, 0, -1], [0, 0, 1], [1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0]
+], dtype=np.float32)
+VERTICES_PER_BLOCK = len(CUBE_FACES) * 4
+# Interleaved vertex layout: position (3), normal (3), RGBA color (4)
+FLOATS_PER_VERTEX = 10
+VERTEX_STRIDE = FLOATS_PER_VERTEX * 4
+
+_FACE_VERTEX_OFFSETS = CUBE_CORNERS[CUBE_FACES.reshape(-1)]
+_FACE_VERTEX_NORMALS = np.repeat(FACE_NORMALS, 4, axis=0)
+
+
+def face_intensities(light_dir, ambient: float) -> np.ndarray:
+    """Lambert intensity of each cube face for a fixed directional light."""
+    dots = np.maximum(0.0, -(FACE_NORMALS @ np.asarray(light_dir, dtype=np.float32)))
+    return (ambient + (1 - ambient) * dots).astype(np.float32)
+
+
+def build_block_vertices(positions: np.ndarray, colors: np.ndarray, intensities: np.ndarray) -> np.ndarray:
+    """Interleaved face vertices for blocks: positions (n, 3) and colors (n, 4) -> (n * 24, 10) float32."""
+    count = len(positions)
+    vertices = np.empty((count, VERTICES_PER_BLOCK, FLOATS_PER_VERTEX), dtype=np.float32)
+    vertices[:, :, 0:3] = positions[:, None, :] + _FACE_VERTEX_OFFSETS[None, :, :]
+    vertices[:, :, 3:6] = _FACE_VERTEX_NORMALS[None, :, :]
+    vertex_intensity = np.repeat(intensities, 4)
+    vertices[:, :, 6:9] = np.minimum(1.0, colors[:, None, 0:3] * vertex_intensity[None, :, None])
+    vertices[:, :, 9] = colors[:, None, 3]
+    return vertices.reshape(-1, FLOATS_PER_VERTEX)
+
+
+CHUNK_SIZE = 16
+_CHUNK_SHIFT = 4
+_CHUNK_MASK = CHUNK_SIZE - 1
+
+# (axis, direction, index into FACE_NORMALS)
+_DIRECTIONS = [
+    (2, -1, 0),  # Front
+    (2, 1, 1),   # Back
+    (0, 1, 2),   # Right
+    (0, -1, 3),  # Left
+    (1, 1, 4),   # Top
+    (1, -1, 5),  # Bottom
+]
+# Key for blocks that are not on the integer grid; they are drawn as plain cubes
+LOOSE_CHUNK = None
+
+
+def greedy_quads(mask: List[List[int]]) -> List[Tuple[int, int, int, int, int]]:
+    """Merge equal non-zero cells of a 2D mask into rectangles (row, col, height, width, value).
+
+    The mask is consumed (cleared) while merging.
+    """
+    quads = []
+    rows = len(mask)
+    cols = len(mask[0]) if rows else 0
+    for a in range(rows):
+        row = mask[a]
+        b = 0
+        while b < cols:
+            value = row[b]
+            if not value:
+                b += 1
+                continue
+            width = 1
+            while b + width < cols and row[b + width] == value:
+                width += 1
+            run = [value] * width
+            height = 1
+            while a + height < rows and mask[a + height][b:b + width] == run:
+                height += 1
+            cleared = [0] * width
+            for k in range(a, a + height):
+                mask[k][b:b + width] = cleared
+            quads.append((a, b, height, width, value))
+            b += width
+    return quads
+
+
+class ChunkMesher:
+    """Occupancy grid of blocks split into 16x16x16 chunks, meshed with hidden-face culling and greedy merging.
+
+    Each chunk stores palette indices (0 = air). Faces touching an opaque
+    neighbour are dropped and the remaining coplanar faces of the same color
+    are merged into larger quads. Changing a block only re-meshes its chunk
+    and the neighbouring chunks it borders.
+    """
+
+    def __init__(self, intensities: np.ndarray):
+        self.intensities = intensities
+        self.palette = [(0.0, 0.0, 0.0, 0.0)]
+        self._palette_index = {}
+        self._opaque = np.zeros(1, dtype=bool)
+        self.chunks: Dict[Tuple[int, int, int], np.ndarray] = {}
+        self.loose_blocks = []
+        self.dirty = set()
+        self.block_count = 0
+        self.quad_counts: Dict[Optional[Tuple[int, int, int]], int] = {}
+
+    def _color_index(self, color) -> int:
+        index = self._palette_index.get(color)
+        if index is None:
+            index = self._palette_index[color] = len(self.palette)
+            self.palette.append(tuple(float(c) for c in color))
+            # Translucent blocks never hide their neighbours' faces
+            self._opaque = np.append(self._opaque, color[3] >= 1.0)
+        return index
+
+    def _mark_dirty(self, key, local):
+        self.dirty.add(key)
+        for axis in range(3):
+            if local[axis] in (0, _CHUNK_MASK):
+                neighbour = list(key)
+                neighbour[axis] += 1 if local[axis] == _CHUNK_MASK else -1
+                if tuple(neighbour) in self.chunks:
+                    self.dirty.add(tuple(neighbour))
+
+    def clear(self):
+        self.dirty.update(self.chunks)
+        if self.loose_blocks:
+            self.dirty.add(LOOSE_CHUNK)
+        self.chunks = {}
+        self.loose_blocks = []
+        self.block_count = 0
+
+    def set_blocks(self, blocks):
+        """Replace the scene with (x, y, z, color) tuples."""
+        self.clear()
+        self.add_blocks(blocks)
+
+    def add_blocks(self, blocks):
+        """Add (x, y, z, color) tuples in bulk; later blocks at the same position win."""
+        if not blocks:
+            return
+        color_index = self._color_index
+        indices = np.array([color_index(block[3]) for block in blocks], dtype=np.uint16)
+        self._add_indexed(np.array([block[:3] for block in blocks], dtype=np.float64), indices)
+
+    def add_block_arrays(self, positions: np.ndarray, types: np.ndarray, palette_colors: Sequence):
+        """Add blocks from (n, 3) positions and indices into palette_colors (RGBA tuples)."""
+        if not len(positions):
+            return
+        lookup = np.array([self._color_index(tuple(color)) for color in palette_colors], dtype=np.uint16)
+        self._add_indexed(positions, lookup[types])
+
+    def _add_indexed(self, positions: np.ndarray, indices: np.ndarray):
+        self.block_count += len(positions)
+        if positions.dtype.kind == 'f':
+            on_grid = (positions == np.floor(positions)).all(axis=1)
+            if not on_grid.all():
+                loose = ~on_grid
+                self.loose_blocks.extend((x, y, z, self.palette[index]) for (x, y, z), index
+                                         in zip(positions[loose].tolist(), indices[loose].tolist()))
+                self.dirty.add(LOOSE_CHUNK)
+                positions, indices = positions[on_grid], indices[on_grid]
+        positions = positions.astype(np.int64)
+        if not len(positions):
+            return
+
+        # Group blocks by chunk through a single packed integer key per chunk
+        chunk_keys = positions >> _CHUNK_SHIFT
+        low = chunk_keys.min(axis=0)
+        span = chunk_keys.max(axis=0) - low + 1
+        packed = ((chunk_keys[:, 0] - low[0]) * span[1] + (chunk_keys[:, 1] - low[1])) * span[2] + (chunk_keys[:, 2] - low[2])
+        unique_packed, inverse = np.unique(packed, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique_packed) + 1))
+        local = positions & _CHUNK_MASK
+        for i, packed_key in enumerate(unique_packed.tolist()):
+            rest, kz = divmod(packed_key, int(span[2]))
+            kx, ky = divmod(rest, int(span[1]))
+            key = (kx + int(low[0]), ky + int(low[1]), kz + int(low[2]))
+            members = order[bounds[i]:bounds[i + 1]]
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.chunks[key] = np.zeros((CHUNK_SIZE,) * 3, dtype=np.uint16)
+            chunk[local[members, 0], local[members, 1], local[members, 2]] = indices[members]
+            self.dirty.add(key)
+            # Faces of existing neighbours may now be hidden
+            for axis in range(3):
+                for step in (-1, 1):
+                    neighbour = list(key)
+                    neighbour[axis] += step
+                    if tuple(neighbour) in self.chunks:
+                        self.dirty.add(tuple(neighbour))
+
+    def set_block(self, block):
+        """Add or recolor a single block."""
+        self.block_count += 1
+        if not all(float(v).is_integer() for v in block[:3]):
+            self.loose_blocks.append(block)
+            self.dirty.add(LOOSE_CHUNK)
+            return
+        x, y, z = (int(v) for v in block[:3])
+        key = (x >> _CHUNK_SHIFT, y >> _CHUNK_SHIFT, z >> _CHUNK_SHIFT)
+        local = (x & _CHUNK_MASK, y & _CHUNK_MASK, z & _CHUNK_MASK)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = np.zeros((CHUNK_SIZE,) * 3, dtype=np.uint16)
+        chunk[local] = self._color_index(block[3])
+        self._mark_dirty(key, local)
+
+    def _padded(self, key) -> np.ndarray:
+        """Chunk with a one-block border copied from the six face neighbours."""
+        padded = np.zeros((CHUNK_SIZE + 2,) * 3, dtype=np.uint16)
+        inner = slice(1, CHUNK_SIZE + 1)
+        padded[inner, inner, inner] = self.chunks[key]
+        for axis in range(3):
+            for step, border, source in ((1, CHUNK_SIZE + 1, 0), (-1, 0, _CHUNK_MASK)):
+                neighbour_key = list(key)
+                neighbour_key[axis] += step
+                neighbour = self.chunks.get(tuple(neighbour_key))
+                if neighbour is None:
+                    continue
+                target = [inner, inner, inner]
+                target[axis] = border
+                padded[tuple(target)] = np.take(neighbour, source, axis=axis)
+        return padded
+
+    def mesh_chunk(self, key) -> np.ndarray:
+        """Interleaved quad vertices (same layout as build_block_vertices) for one chunk."""
+        if key is LOOSE_CHUNK:
+            if not self.loose_blocks:
+                self.quad_counts.pop(key, None)
+                return np.empty((0, FLOATS_PER_VERTEX), dtype=np.float32)
+            positions = np.array([block[:3] for block in self.loose_blocks], dtype=np.float32)
+            colors = np.array([block[3] for block in self.loose_blocks], dtype=np.float32)
+            self.quad_counts[key] = len(self.loose_blocks) * 6
+            return build_block_vertices(positions, colors, self.intensities)
+
+        padded = self._padded(key)
+        core = padded[1:-1, 1:-1, 1:-1]
+        origin = [k * CHUNK_SIZE for k in key]
+        inner = slice(1, CHUNK_SIZE + 1)
+        corners, face_indices, color_indices = [], [], []
+        for axis, direction, face_index in _DIRECTIONS:
+            neighbour_slices = [inner, inner, inner]
+            neighbour_slices[axis] = slice(2, CHUNK_SIZE + 2) if direction > 0 else slice(0, CHUNK_SIZE)
+            visible = (core != 0) & ~self._opaque[padded[tuple(neighbour_slices)]]
+            if not visible.any():
+                continue
+            faces = np.moveaxis(np.where(visible, core, 0), axis, 0)
+            u_axis, v_axis = [a for a in range(3) if a != axis]
+            for layer in np.flatnonzero(faces.any(axis=(1, 2))):
+                plane = origin[axis] + layer + 0.5 * direction
+                for a, b, height, width, value in greedy_quads(faces[layer].tolist()):
+                    u0 = origin[u_axis] + a - 0.5
+                    v0 = origin[v_axis] + b - 0.5
+                    u1, v1 = u0 + height, v0 + width
+                    for u, v in ((u0, v0), (u1, v0), (u1, v1), (u0, v1)):
+                        corner = [0.0, 0.0, 0.0]
+                        corner[axis], corner[u_axis], corner[v_axis] = plane, u, v
+                        corners.append(corner)
+                    face_indices.append(face_index)
+                    color_indices.append(value)
+
+        self.quad_counts[key] = len(face_indices)
+        if not face_indices:
+            return np.empty((0, FLOATS_PER_VERTEX), dtype=np.float32)
+        face_indices = np.repeat(np.array(face_indices), 4)
+        colors = np.array(self.palette, dtype=np.float32)[np.repeat(np.array(color_indices), 4)]
+        vertices = np.empty((len(face_indices), FLOATS_PER_VERTEX), dtype=np.float32)
+        vertices[:, 0:3] = corners
+        vertices[:, 3:6] = FACE_NORMALS[face_indices]
+        vertices[:, 6:9] = np.minimum(1.0, colors[:, 0:3] * self.intensities[face_indices][:, None])
+        vertices[:, 9] = colors[:, 3]
+        return vertices
+
+    def take_dirty_meshes(self, limit: Optional[int] = None) -> Dict[Optional[Tuple[int, int, int]], np.ndarray]:
+        """Re-mesh chunks changed since the last call (at most limit of them); removed chunks map to an empty mesh."""
+        meshes = {}
+        if limit is None or limit >= len(self.dirty):
+            keys, self.dirty = self.dirty, set()
+        else:
+            keys = [self.dirty.pop() for _ in range(limit)]
+        for key in keys:
+            if key is LOOSE_CHUNK or key in self.chunks:
+                meshes[key] = self.mesh_chunk(key)
+            else:
+                self.quad_counts.pop(key, None)
+                meshes[key] = np.empty((0, FLOATS_PER_VERTEX), dtype=np.float32)
+        # triangle_count sums every chunk, so only when the line is actually logged
+        if meshes and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Meshed %s chunk(s): %s triangles unmeshed, %s after culling and merging",
+                         len(meshes), self.block_count * 12, self.triangle_count)
+        return meshes
+
+    @property
+    def triangle_count(self) -> int:
+        return sum(self.quad_counts.values()) * 2
+
+    @property
+    def naive_triangle_count(self) -> int:
+        """Triangles if every face of every block were drawn."""
+        return self.block_count * 12
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COLOR_TABLE_FILE = os.path.join(os.path.dirname(__file__), "block_colors.json")
+DEFAULT_NAMESPACE = "minecraft:"
+FALLBACK_COLOR = (0.6, 0.6, 0.6, 1.0)
+
+# Shapes drawn with the color of the block they are cut from: oak_stairs -> oak(_planks), stone_brick_wall -> stone_bricks
+SHAPE_SUFFIXES = ("_stairs", "_slab", "_wall", "_fence_gate", "_fence", "_pressure_plate", "_button", "_door",
+                  "_trapdoor", "_hanging_sign", "_wall_sign", "_sign", "_wood", "_hyphae")
+MATERIAL_SUFFIXES = ("", "s", "_planks", "_block", "_log", "_stem")
+
+_color_table = None
+
+
+def hex_to_rgba(value: str) -> Tuple[float, float, float, float]:
+    """'#rrggbb' or '#rrggbbaa' -> RGBA floats in 0..1."""
+    value = value.lstrip("#")
+    alpha = int(value[6:8], 16) / 255 if len(value) == 8 else 1.0
+    return int(value[0:2], 16) / 255, int(value[2:4], 16) / 255, int(value[4:6], 16) / 255, alpha
+
+
+def load_color_table(path: Optional[str] = None) -> dict:
+    """The bundled block color table, parsed once per process (path is only read for a non-default table)."""
+    global _color_table
+    if path is None and _color_table is not None:
+        return _color_table
+    try:
+        with open(path or COLOR_TABLE_FILE, "r") as f:
+            data = json.load(f)
+        table = {
+            "default": hex_to_rgba(data.get("default", "#999999")),
+            "dye_colors": {name: hex_to_rgba(value) for name, value in data.get("dye_colors", {}).items()},
+            "colors": {block: hex_to_rgba(value) for block, value in data["colors"].items()},
+        }
+    except (OSError, ValueError, KeyError) as e:
+        logger.error("Error loading block color table: %s", e)
+        table = {"default": FALLBACK_COLOR, "dye_colors": {}, "colors": {}}
+    if path is None:
+        _color_table = table
+    return table
+
+
+def base_block_id(block: str) -> str:
+    """Namespaced block ID without block states, NBT or a trailing setblock mode.
+
+    'oak_stairs[facing=east]' -> 'minecraft:oak_stairs', 'minecraft:chest{Items:[]} replace' -> 'minecraft:chest'.
+    """
+    end = len(block)
+    for stop in ("[", "{", " "):
+        position = block.find(stop)
+        if position != -1 and position < end:
+            end = position
+    block_id = block[:end].lower()
+    if ":" not in block_id:
+        block_id = DEFAULT_NAMESPACE + block_id
+    return block_id
+
+
+def resolve_color(block_id: str, table: dict) -> Tuple[float, float, float, float]:
+    """Representative color of a base block ID: exact match, then the material a shape is cut from, then a dye color in the name."""
+    colors = table["colors"]
+    color = colors.get(block_id)
+    if color is not None:
+        return color
+    namespace, _, name = block_id.rpartition(":")
+    for suffix in SHAPE_SUFFIXES:
+        if name.endswith(suffix):
+            material = name[:-len(suffix)]
+            for material_suffix in MATERIAL_SUFFIXES:
+                color = colors.get(f"{namespace}:{material}{material_suffix}")
+                if color is not None:
+                    return color
+            break
+    # Longest dye name first so "light_blue_..." is not taken for "blue"
+    for dye in sorted(table["dye_colors"], key=len, reverse=True):
+        if dye in name:
+            return table["dye_colors"][dye]
+    return table["default"]
+
+
+class BlockPalette:
+    """Interned block strings (including block states), each with its representative color.
+
+    A block is stored as its small integer index; intern() and color() are
+    dict and list lookups, and colors resolved for a base block ID are shared
+    by every state of that block.
+    """
+
+    def __init__(self, table: Optional[dict] = None):
+        self.table = table if table is not None else load_color_table()
+        self.blocks: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._base_colors: Dict[str, tuple] = {}
+        self._colors: List[tuple] = []
+        self._color_array = np.zeros((0, 4), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __contains__(self, block: str) -> bool:
+        return block in self._index
+
+    def intern(self, block: str) -> int:
+        """Index of a block string, adding it on first sight."""
+        index = self._index.get(block)
+        if index is None:
+            index = len(self.blocks)
+            self._index[block] = index
+            self.blocks.append(block)
+            self._colors.append(self.color_for(block))
+        return index
+
+    def index(self, block: str) -> Optional[int]:
+        return self._index.get(block)
+
+    def color_for(self, block: str) -> tuple:
+        """Color of any block string, whether or not it is interned."""
+        block_id = base_block_id(block)
+        color = self._base_colors.get(block_id)
+        if color is None:
+            color = self._base_colors[block_id] = resolve_color(block_id, self.table)
+        return color
+
+    def block(self, index: int) -> str:
+        return self.blocks[index]
+
+    def color(self, index: int) -> tuple:
+        return self._colors[index]
+
+    @property
+    def colors(self) -> List[tuple]:
+        """Color of every interned block, by index."""
+        return self._colors
+
+    @property
+    def color_array(self) -> np.ndarray:
+        """(n, 4) float32 colors by index, rebuilt only after new blocks were interned."""
+        if len(self._color_array) != len(self._colors):
+            self._color_array = np.array(self._colors, dtype=np.float32).reshape(-1, 4)
+        return self._color_array
+
+    def indices_matching(self, block_id: str) -> List[int]:
+        """Indices of every interned block string with this base block ID, whatever its states."""
+        block_id = base_block_id(block_id)
+        return [i for i, block in enumerate(self.blocks) if base_block_id(block) == block_id]
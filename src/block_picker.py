@@ -0,0 +1,176 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def ray_box_interval(origin: Sequence[float], inv_direction: Sequence[float], low: Sequence[float],
+                     high: Sequence[float]) -> Optional[Tuple[float, float]]:
+    """Entry and exit distances of the ray through an axis-aligned box (slab test), or None when it misses."""
+    t_near, t_far = -math.inf, math.inf
+    for axis in range(3):
+        inv = inv_direction[axis]
+        low_offset = low[axis] - origin[axis]
+        high_offset = high[axis] - origin[axis]
+        if inv == math.inf:
+            # Ray parallel to this slab: it either runs inside it or misses
+            if low_offset > 0 or high_offset < 0:
+                return None
+            continue
+        t1, t2 = low_offset * inv, high_offset * inv
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_near, t_far = max(t_near, t1), min(t_far, t2)
+        if t_near > t_far:
+            return None
+    if t_far < 0:
+        return None
+    return max(t_near, 0.0), t_far
+
+
+def ray_box_distance(origin: Sequence[float], inv_direction: Sequence[float], center: Sequence[float], half: float = 0.5) -> Optional[float]:
+    """Distance along the ray to a cube's surface, or None when it misses."""
+    interval = ray_box_interval(origin, inv_direction, [c - half for c in center], [c + half for c in center])
+    return interval[0] if interval else None
+
+
+class BlockPicker:
+    """Voxel hash grid over the viewer's blocks for ray picking.
+
+    Cell (i, j, k) covers [i - 0.5, i + 0.5) on each axis, so a block on
+    integer coordinates fills exactly one cell; off-grid blocks are registered
+    in every cell they overlap. pick() walks the cells along the ray with a
+    3D DDA and only tests the blocks registered in the cells it visits.
+    """
+
+    def __init__(self, blocks=()):
+        self.cells: Dict[Tuple[int, int, int], List[int]] = {}
+        self.centers: List[Tuple[float, float, float]] = []
+        # Cell range holding any block; rays are clipped to it before traversal
+        self.low_cell = None
+        self.high_cell = None
+        for block in blocks:
+            self.add(block)
+
+    def add(self, block) -> int:
+        index = len(self.centers)
+        x, y, z = float(block[0]), float(block[1]), float(block[2])
+        self.centers.append((x, y, z))
+        if x.is_integer() and y.is_integer() and z.is_integer():
+            # On the grid: exactly one cell
+            low = high = (int(x), int(y), int(z))
+            cell = self.cells.get(low)
+            if cell is None:
+                self.cells[low] = [index]
+            else:
+                cell.append(index)
+        else:
+            # A block centered at c spans [c - 0.5, c + 0.5], i.e. cells floor(c) through ceil(c)
+            low = (math.floor(x), math.floor(y), math.floor(z))
+            high = (math.ceil(x), math.ceil(y), math.ceil(z))
+            for i in range(low[0], high[0] + 1):
+                for j in range(low[1], high[1] + 1):
+                    for k in range(low[2], high[2] + 1):
+                        self.cells.setdefault((i, j, k), []).append(index)
+        if self.low_cell is None:
+            self.low_cell, self.high_cell = list(low), list(high)
+        else:
+            for axis in range(3):
+                if low[axis] < self.low_cell[axis]:
+                    self.low_cell[axis] = low[axis]
+                if high[axis] > self.high_cell[axis]:
+                    self.high_cell[axis] = high[axis]
+        return index
+
+    def add_grid_positions(self, coords) -> None:
+        """Add blocks on integer coordinates in bulk from an (n, 3) integer array."""
+        if not len(coords):
+            return
+        cells = self.cells
+        index = len(self.centers)
+        for cell in map(tuple, coords.tolist()):
+            self.centers.append(cell)
+            indices = cells.get(cell)
+            if indices is None:
+                cells[cell] = [index]
+            else:
+                indices.append(index)
+            index += 1
+        low, high = coords.min(axis=0).tolist(), coords.max(axis=0).tolist()
+        if self.low_cell is None:
+            self.low_cell, self.high_cell = low, high
+        else:
+            self.low_cell = [min(a, b) for a, b in zip(self.low_cell, low)]
+            self.high_cell = [max(a, b) for a, b in zip(self.high_cell, high)]
+
+    def pick(self, origin: Sequence[float], direction: Sequence[float], max_distance: float = 1000.0) -> Optional[int]:
+        """Index of the first block hit by the ray, or None. Later blocks win ties, matching the renderer."""
+        length = math.sqrt(sum(d * d for d in direction))
+        if length == 0 or not self.centers:
+            return None
+        direction = [d / length for d in direction]
+        inv_direction = [1.0 / d if d != 0 else math.inf for d in direction]
+        bounds = ray_box_interval(origin, inv_direction, [c - 0.5 for c in self.low_cell], [c + 0.5 for c in self.high_cell])
+        if bounds is None or bounds[0] > max_distance:
+            return None
+        t_enter, t_exit = bounds
+        max_distance = min(max_distance, t_exit)
+
+        # Start in the cell where the ray enters the occupied region
+        cell = [min(max(math.floor(o + t_enter * d + 0.5), low), high)
+                for o, d, low, high in zip(origin, direction, self.low_cell, self.high_cell)]
+        step, t_max, t_delta = [], [], []
+        for axis in range(3):
+            d = direction[axis]
+            if d > 0:
+                step.append(1)
+                t_max.append((cell[axis] + 0.5 - origin[axis]) / d)
+                t_delta.append(1.0 / d)
+            elif d < 0:
+                step.append(-1)
+                t_max.append((cell[axis] - 0.5 - origin[axis]) / d)
+                t_delta.append(-1.0 / d)
+            else:
+                step.append(0)
+                t_max.append(math.inf)
+                t_delta.append(math.inf)
+
+        cells = self.cells
+        centers = self.centers
+        best, best_t = None, math.inf
+        t_cell = t_enter
+        while t_cell <= max_distance and t_cell <= best_t:
+            candidates = cells.get((cell[0], cell[1], cell[2]))
+            if candidates:
+                for index in candidates:
+                    t = ray_box_distance(origin, inv_direction, centers[index])
+                    if t is not None and t <= max_distance and (t < best_t or (t == best_t and index > best)):
+                        best, best_t = index, t
+            # Advance to the neighbouring cell whose boundary the ray crosses first
+            axis = 0 if t_max[0] <= t_max[1] and t_max[0] <= t_max[2] else (1 if t_max[1] <= t_max[2] else 2)
+            t_cell = t_max[axis]
+            if t_cell == math.inf:
+                break
+            cell[axis] += step[axis]
+            t_max[axis] += t_delta[axis]
+        return best
+
+
+def screen_ray(mx: float, my: float, width: int, height: int, camera_pos: Sequence[float], target: Sequence[float],
+               fov: float, up: Sequence[float] = (0.0, 1.0, 0.0)) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+    """World-space ray through a viewport pixel for a gluPerspective/gluLookAt camera.
+
+    mx and my are relative to the viewport's bottom-left corner, as in OpenGL window coordinates.
+    """
+    forward = [t - c for t, c in zip(target, camera_pos)]
+    norm = math.sqrt(sum(f * f for f in forward))
+    forward = [f / norm for f in forward]
+    right = [forward[1] * up[2] - forward[2] * up[1], forward[2] * up[0] - forward[0] * up[2], forward[0] * up[1] - forward[1] * up[0]]
+    norm = math.sqrt(sum(r * r for r in right))
+    right = [r / norm for r in right]
+    true_up = [right[1] * forward[2] - right[2] * forward[1], right[2] * forward[0] - right[0] * forward[2], right[0] * forward[1] - right[1] * forward[0]]
+
+    half_height = math.tan(math.radians(fov) / 2)
+    half_width = half_height * width / height
+    ndc_x = (2.0 * (mx + 0.5) / width) - 1.0
+    ndc_y = (2.0 * (my + 0.5) / height) - 1.0
+    direction = tuple(f + ndc_x * half_width * r + ndc_y * half_height * u for f, r, u in zip(forward, right, true_up))
+    return (float(camera_pos[0]), float(camera_pos[1]), float(camera_pos[2])), direction
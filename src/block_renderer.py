@@ -0,0 +1,240 @@
+import ctypes
+import logging
+from typing import Optional
+import numpy as np
+from OpenGL.GL import *
+from src.block_mesher import CUBE_CORNERS, VERTEX_STRIDE, ChunkMesher, face_intensities
+
+logger = logging.getLogger(__name__)
+
+# Outline drawn around each block: the bottom face loop, as GL_LINES pairs
+OUTLINE_EDGES = np.array([4, 5, 5, 1, 1, 0, 0, 4])
+LINE_VERTICES_PER_BLOCK = len(OUTLINE_EDGES)
+
+_OUTLINE_OFFSETS = CUBE_CORNERS[OUTLINE_EDGES]
+
+
+def build_outline_vertices(positions: np.ndarray) -> np.ndarray:
+    """Outline line vertices for blocks: positions (n, 3) -> (n * 8, 3) float32."""
+    return (positions[:, None, :] + _OUTLINE_OFFSETS[None, :, :]).reshape(-1, 3).astype(np.float32)
+
+
+# Static geometry layout: position (3), RGBA color (4)
+STATIC_STRIDE = 7 * 4
+
+
+def build_ground_vertices(grid_size: int, tile_size: float, light_color, dark_color, y: float = -0.5) -> np.ndarray:
+    """Checkerboard quads covering tiles -grid_size..grid_size on x and z -> (tiles * 4, 7) float32."""
+    indices = np.arange(-grid_size, grid_size + 1)
+    i, j = np.meshgrid(indices, indices, indexing="ij")
+    i, j = i.reshape(-1), j.reshape(-1)
+    x, z = i * tile_size, j * tile_size
+    vertices = np.empty((len(i), 4, 7), dtype=np.float32)
+    vertices[:, :, 1] = y
+    vertices[:, 0, 0], vertices[:, 0, 2] = x, z
+    vertices[:, 1, 0], vertices[:, 1, 2] = x + tile_size, z
+    vertices[:, 2, 0], vertices[:, 2, 2] = x + tile_size, z + tile_size
+    vertices[:, 3, 0], vertices[:, 3, 2] = x, z + tile_size
+    colors = np.where(((i + j) % 2 == 0)[:, None], np.array(light_color, dtype=np.float32), np.array(dark_color, dtype=np.float32))
+    vertices[:, :, 3:7] = colors[:, None, :]
+    return vertices.reshape(-1, 7)
+
+
+def vbo_supported() -> bool:
+    return bool(glGenBuffers) and bool(glBufferSubData)
+
+
+class BlockBatchRenderer:
+    """Draws every block from vertex buffers: one per meshed chunk for faces, one for outlines.
+
+    Faces come from a ChunkMesher, so hidden faces are culled and coplanar faces
+    merged; only chunks touched since the last frame are re-meshed and
+    re-uploaded. Outlines live in a NumPy array mirrored into a single VBO;
+    appended blocks are uploaded as a dirty range with glBufferSubData, and the
+    buffer is re-created only when its capacity has to grow.
+    """
+
+    def __init__(self, light_dir, ambient: float, initial_capacity: int = 256, chunks_per_frame: Optional[int] = None):
+        self.mesher = ChunkMesher(face_intensities(light_dir, ambient))
+        # Upper bound on chunks re-meshed per upload, so streaming a large build never stalls a frame
+        self.chunks_per_frame = chunks_per_frame
+        self.chunk_buffers = {}
+        self.count = 0
+        self.capacity = 0
+        self.line_data = np.empty((0, 3), dtype=np.float32)
+        self.line_vbo = glGenBuffers(1)
+        self._dirty = None
+        self._reallocate = True
+        self._grow(initial_capacity)
+
+    def _grow(self, needed: int):
+        capacity = max(self.capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        line_data = np.zeros((capacity * LINE_VERTICES_PER_BLOCK, 3), dtype=np.float32)
+        line_data[:len(self.line_data)] = self.line_data
+        self.line_data = line_data
+        self.capacity = capacity
+        self._reallocate = True
+        logger.debug("Block outline VBO capacity grown to %s blocks", capacity)
+
+    def _mark_dirty(self, start: int, end: int):
+        if self._dirty is None:
+            self._dirty = (start, end)
+        else:
+            self._dirty = (min(self._dirty[0], start), max(self._dirty[1], end))
+
+    def set_blocks(self, blocks):
+        """Replace all blocks with (x, y, z, color) tuples."""
+        self._reset()
+        self.append_blocks(blocks)
+
+    def set_block_arrays(self, positions: np.ndarray, types: np.ndarray, palette_colors):
+        """Replace all blocks with (n, 3) positions and indices into palette_colors."""
+        self._reset()
+        self.append_block_arrays(positions, types, palette_colors)
+
+    def _reset(self):
+        self.mesher.clear()
+        self.count = 0
+        self._dirty = None
+
+    def append_block(self, block):
+        self.mesher.set_block(block)
+        self._write_outlines(self.count, np.array([block[:3]], dtype=np.float32))
+
+    def append_blocks(self, blocks):
+        if blocks:
+            self.mesher.add_blocks(blocks)
+            self._write_outlines(self.count, np.array([block[:3] for block in blocks], dtype=np.float32))
+
+    def append_block_arrays(self, positions: np.ndarray, types: np.ndarray, palette_colors):
+        self.mesher.add_block_arrays(positions, types, palette_colors)
+        self._write_outlines(self.count, positions)
+
+    def _write_outlines(self, start: int, positions: np.ndarray):
+        if not len(positions):
+            return
+        end = start + len(positions)
+        self._grow(end)
+        self.line_data[start * LINE_VERTICES_PER_BLOCK:end * LINE_VERTICES_PER_BLOCK] = build_outline_vertices(positions.astype(np.float32))
+        self.count = max(self.count, end)
+        self._mark_dirty(start, end)
+
+    @property
+    def triangle_count(self) -> int:
+        return self.mesher.triangle_count
+
+    @property
+    def naive_triangle_count(self) -> int:
+        return self.mesher.naive_triangle_count
+
+    def upload(self):
+        """Push pending changes to the GPU: re-meshed chunks and the dirty outline range."""
+        for key, vertices in self.mesher.take_dirty_meshes(self.chunks_per_frame).items():
+            vbo, _ = self.chunk_buffers.get(key, (None, 0))
+            if not len(vertices):
+                if vbo is not None:
+                    glDeleteBuffers(1, [vbo])
+                    del self.chunk_buffers[key]
+                continue
+            if vbo is None:
+                vbo = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+            self.chunk_buffers[key] = (vbo, len(vertices))
+
+        if self._reallocate:
+            glBindBuffer(GL_ARRAY_BUFFER, self.line_vbo)
+            glBufferData(GL_ARRAY_BUFFER, self.line_data.nbytes, self.line_data, GL_DYNAMIC_DRAW)
+            self._reallocate = False
+        elif self._dirty is not None:
+            start, end = self._dirty
+            lines = self.line_data[start * LINE_VERTICES_PER_BLOCK:end * LINE_VERTICES_PER_BLOCK]
+            glBindBuffer(GL_ARRAY_BUFFER, self.line_vbo)
+            glBufferSubData(GL_ARRAY_BUFFER, start * LINE_VERTICES_PER_BLOCK * 12, lines.nbytes, lines)
+        self._dirty = None
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, selected=None, selected_color=(1.0, 0.65, 0.0, 1.0)):
+        """Draw faces with one call per chunk, then outlines in up to three (the selected one in selected_color)."""
+        self.upload()
+        if not self.count:
+            return
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        for vbo, vertex_count in self.chunk_buffers.values():
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glVertexPointer(3, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(0))
+            glNormalPointer(GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(12))
+            glColorPointer(4, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(24))
+            glDrawArrays(GL_QUADS, 0, vertex_count)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.line_vbo)
+        glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+        glColor4f(0.0, 0.0, 0.0, 1.0)
+        if selected is None or not 0 <= selected < self.count:
+            glDrawArrays(GL_LINES, 0, self.count * LINE_VERTICES_PER_BLOCK)
+        else:
+            # Skip the selected outline so the orange one is not hidden by an equal-depth black one
+            glDrawArrays(GL_LINES, 0, selected * LINE_VERTICES_PER_BLOCK)
+            after = selected + 1
+            if after < self.count:
+                glDrawArrays(GL_LINES, after * LINE_VERTICES_PER_BLOCK, (self.count - after) * LINE_VERTICES_PER_BLOCK)
+            glColor4f(*selected_color)
+            glDrawArrays(GL_LINES, selected * LINE_VERTICES_PER_BLOCK, LINE_VERTICES_PER_BLOCK)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        glDeleteBuffers(len(self.chunk_buffers) + 1, [vbo for vbo, _ in self.chunk_buffers.values()] + [self.line_vbo])
+        self.chunk_buffers = {}
+
+
+class StaticGeometry:
+    """Scene elements that rarely change (ground grid, later axes and bounding boxes), each kept in its own VBO.
+
+    update() rebuilds an element only when its key (the settings it was built
+    from) differs from the one it was last built with.
+    """
+
+    def __init__(self):
+        self.elements = {}
+
+    def update(self, name: str, key, build, mode=GL_QUADS):
+        """Make sure element `name` matches `key`; `build` returns its (n, 7) position/color vertices."""
+        element = self.elements.get(name)
+        if element is not None and element[0] == key:
+            return
+        vertices = build()
+        vbo = element[1] if element is not None else glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.elements[name] = (key, vbo, len(vertices), mode)
+        logger.debug("Rebuilt static geometry '%s' (%s vertices) for %s", name, len(vertices), key)
+
+    def draw(self, name: str):
+        element = self.elements.get(name)
+        if element is None:
+            return
+        _, vbo, vertex_count, mode = element
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glVertexPointer(3, GL_FLOAT, STATIC_STRIDE, ctypes.c_void_p(0))
+        glColorPointer(4, GL_FLOAT, STATIC_STRIDE, ctypes.c_void_p(12))
+        glDrawArrays(mode, 0, vertex_count)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        if self.elements:
+            glDeleteBuffers(len(self.elements), [element[1] for element in self.elements.values()])
+        self.elements = {}
@@ -0,0 +1,151 @@
+from typing import Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from src.block_palette import BlockPalette
+
+
+class BlockStore:
+    """Columnar block storage: int32 coordinates plus a uint16 index into a BlockPalette.
+
+    Storage grows by doubling, so appends are amortized O(1). A block costs
+    14 bytes of array storage, against well over 100 bytes for an
+    (x, y, z, color) tuple in a list. Indexing and iteration still yield
+    (x, y, z, color) tuples for code that wants single blocks.
+    """
+
+    def __init__(self, capacity: int = 1024, palette: Optional[BlockPalette] = None):
+        self._coords = np.zeros((max(capacity, 1), 3), dtype=np.int32)
+        self._types = np.zeros(max(capacity, 1), dtype=np.uint16)
+        self._count = 0
+        self.palette = palette if palette is not None else BlockPalette()
+
+    def palette_index(self, block_type: str) -> int:
+        index = self.palette.index(block_type)
+        if index is None:
+            if len(self.palette) > np.iinfo(np.uint16).max:
+                raise ValueError("Too many distinct block types")
+            index = self.palette.intern(block_type)
+        return index
+
+    @property
+    def palette_colors(self) -> List[tuple]:
+        return self.palette.colors
+
+    def _reserve(self, needed: int):
+        capacity = len(self._types)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        coords = np.zeros((capacity, 3), dtype=np.int32)
+        types = np.zeros(capacity, dtype=np.uint16)
+        coords[:self._count] = self._coords[:self._count]
+        types[:self._count] = self._types[:self._count]
+        self._coords, self._types = coords, types
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def coords(self) -> np.ndarray:
+        """(n, 3) int32 view of the block coordinates."""
+        return self._coords[:self._count]
+
+    @property
+    def types(self) -> np.ndarray:
+        """(n,) uint16 view of the palette indices."""
+        return self._types[:self._count]
+
+    def colors(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """(n, 4) float32 RGBA colors of blocks start..end."""
+        return self.palette.color_array[self._types[start:self._count if end is None else end]]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the live part of the arrays."""
+        return self.coords.nbytes + self.types.nbytes
+
+    def append(self, x: int, y: int, z: int, block_type: str) -> int:
+        index = self._count
+        self._reserve(index + 1)
+        self._coords[index] = (x, y, z)
+        self._types[index] = self.palette_index(block_type)
+        self._count += 1
+        return index
+
+    def extend(self, coords: np.ndarray, types: np.ndarray):
+        """Append blocks from a (n, 3) coordinate array and matching palette indices."""
+        start = self._count
+        end = start + len(coords)
+        self._reserve(end)
+        self._coords[start:end] = coords
+        self._types[start:end] = types
+        self._count = end
+
+    def extend_blocks(self, blocks: Sequence[tuple]):
+        """Append (x, y, z, block_type) tuples."""
+        if not blocks:
+            return
+        index_for = {}
+        types = np.empty(len(blocks), dtype=np.uint16)
+        for i, block in enumerate(blocks):
+            block_type = block[3]
+            index = index_for.get(block_type)
+            if index is None:
+                index = index_for[block_type] = self.palette_index(block_type)
+            types[i] = index
+        self.extend(np.array([block[:3] for block in blocks], dtype=np.int32), types)
+
+    def pop(self) -> tuple:
+        block = self[self._count - 1]
+        self._count -= 1
+        return block
+
+    def remove(self, index: int):
+        """Remove one block, keeping the order of the others (a single memmove)."""
+        if not 0 <= index < self._count:
+            raise IndexError("block index out of range")
+        self._coords[index:self._count - 1] = self._coords[index + 1:self._count]
+        self._types[index:self._count - 1] = self._types[index + 1:self._count]
+        self._count -= 1
+
+    def remove_where(self, mask: np.ndarray):
+        """Remove every block where mask is True, keeping the order of the others."""
+        keep = ~mask
+        kept = int(keep.sum())
+        self._coords[:kept] = self.coords[keep]
+        self._types[:kept] = self.types[keep]
+        self._count = kept
+
+    def __getitem__(self, index: int) -> tuple:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("block index out of range")
+        x, y, z = self._coords[index].tolist()
+        return x, y, z, self.palette.color(self._types[index])
+
+    def __iter__(self) -> Iterator[tuple]:
+        colors = self.palette.colors
+        for (x, y, z), index in zip(self.coords.tolist(), self.types.tolist()):
+            yield x, y, z, colors[index]
+
+    def block_type(self, index: int) -> str:
+        return self.palette.block(self._types[index])
+
+    def block_types(self) -> List[str]:
+        names = self.palette.blocks
+        return [names[index] for index in self.types.tolist()]
+
+    def bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Minimum and maximum coordinates, or None when empty."""
+        if not self._count:
+            return None
+        return self.coords.min(axis=0), self.coords.max(axis=0)
+
+    def filter_by_type(self, block_type: str) -> np.ndarray:
+        """Indices of the blocks of a block type, whatever their block states."""
+        matches = self.palette.indices_matching(block_type)
+        return np.flatnonzero(np.isin(self.types, matches))
+
+    def translate(self, dx: int, dy: int, dz: int):
+        self.coords[:] += np.array([dx, dy, dz], dtype=np.int32)
@@ -0,0 +1,189 @@
+import argparse
+import itertools
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from src import patterns
+
+# Mirror axis -> the coordinate it negates
+MIRROR_AXES = {"x": 0, "z": 2}
+
+
+@dataclass(frozen=True)
+class Transform:
+    """Mirror, then rotate about the pivot's vertical axis, then translate.
+
+    quarter_turns counts 90° clockwise turns seen from above (north -> east).
+    Mirroring "x" flips east/west across the pivot, "z" flips north/south.
+    """
+    translation: Tuple[float, float, float] = (0, 0, 0)
+    quarter_turns: int = 0
+    mirror: Optional[str] = None
+    pivot: Tuple[float, float, float] = (0, 0, 0)
+
+    def matrix(self) -> np.ndarray:
+        """3x3 integer matrix applied to positions relative to the pivot."""
+        matrix = np.eye(3, dtype=np.int64)
+        if self.mirror is not None:
+            matrix[MIRROR_AXES[self.mirror], MIRROR_AXES[self.mirror]] = -1
+        # One clockwise turn: (dx, dz) -> (-dz, dx)
+        turn = np.array([[0, 0, -1], [0, 1, 0], [1, 0, 0]], dtype=np.int64)
+        return np.linalg.matrix_power(turn, self.quarter_turns % 4) @ matrix
+
+    def apply(self, points: np.ndarray) -> np.ndarray:
+        """Transform an (n, 3) array of points in one vectorized step."""
+        pivot = np.asarray(self.pivot, dtype=np.float64)
+        return (points - pivot) @ self.matrix().T + pivot + np.asarray(self.translation, dtype=np.float64)
+
+    @property
+    def is_identity(self) -> bool:
+        return self.mirror is None and self.quarter_turns % 4 == 0 and not any(self.translation)
+
+
+# (pattern, positions are block cells) in the order they are applied. Block positions are transformed
+# by their cell centre so rotated and mirrored builds land on whole blocks; entity positions are points.
+POSITION_SYNTAXES = (
+    (patterns.SETBLOCK_POSITION, True),
+    (patterns.SUMMON_POSITION, False),
+    (patterns.TELEPORT_POSITION, False),
+    (patterns.BEAM_TARGET_POSITION, True),
+    (patterns.SELECTOR_POSITION, False),
+)
+# dx=, dy=, dz= give a selector volume's size: it turns and flips with the build but is not moved
+VOLUME_SYNTAX = patterns.SELECTOR_VOLUME
+# re.split gives the text before the first match, then per match: head, x, separator, y, separator, z
+# and the text up to the next match
+_STRIDE = 7
+_AXIS_OFFSETS = (2, 4, 6)
+
+
+def format_coordinates(values: np.ndarray, tokens: List[str]) -> List[str]:
+    """Text for transformed values, keeping the decimal places of the tokens they replace."""
+    rounded = np.round(values)
+    if '.' not in ''.join(tokens) and np.array_equal(values, rounded):
+        return list(map(str, rounded.astype(np.int64).tolist()))
+    dots = np.fromiter(map(str.find, tokens, itertools.repeat('.')), dtype=np.int64, count=len(tokens))
+    lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    decimals = np.where(dots < 0, 0, lengths - dots - 1)
+
+    texts = np.empty(len(values), dtype=object)
+    whole = (decimals == 0) & (values == rounded)
+    texts[whole] = list(map(str, rounded[whole].astype(np.int64).tolist()))
+    for places in np.unique(decimals[~whole]).tolist():
+        selected = ~whole & (decimals == places)
+        if places:
+            texts[selected] = list(map(f"{{:.{places}f}}".format, values[selected].tolist()))
+        else:
+            # Integers moved off the grid (e.g. a half-block translation) get the digits they need
+            texts[selected] = [f"{value:.6f}".rstrip('0').rstrip('.') for value in values[selected].tolist()]
+    return texts.tolist()
+
+
+def _transform_syntax(text: str, pattern, cells: bool, transform: Transform) -> Tuple[str, int]:
+    parts = pattern.split(text)
+    count = (len(parts) - 1) // _STRIDE
+    if not count:
+        return text, 0
+    tokens = [parts[offset::_STRIDE] for offset in _AXIS_OFFSETS]
+    points = np.fromiter(map(float, itertools.chain.from_iterable(tokens)), dtype=np.float64, count=3 * count)
+    points = points.reshape(3, count).T
+    if cells:
+        moved = np.floor(transform.apply(points + 0.5)).astype(np.int64)
+        for axis, offset in enumerate(_AXIS_OFFSETS):
+            parts[offset::_STRIDE] = list(map(str, moved[:, axis].tolist()))
+    else:
+        moved = transform.apply(points)
+        for axis, offset in enumerate(_AXIS_OFFSETS):
+            parts[offset::_STRIDE] = format_coordinates(moved[:, axis], tokens[axis])
+    return ''.join(parts), count
+
+
+def transform_text(text: str, transform: Transform) -> Tuple[str, int]:
+    """Transform every absolute position in a block of command lines, e.g. a whole .mcfunction file.
+
+    Handles setblock, summon and tp/teleport positions, end_crystal
+    BeamTargets and x=, y=, z= in selectors; dx=, dy=, dz= volumes are
+    rotated and mirrored with them. Positions with a relative (~) or local
+    (^) axis are left as they are, and so are execute lines as a whole,
+    selectors included, so a line is never half transformed. Only positions
+    change: tp and summon yaw, Rotation and block states such as facing=
+    keep their direction. Each syntax is one re.split over the whole text,
+    so there is no per-line Python work; all of its positions go through
+    the transform as one (n, 3) array. Returns the new text and the number
+    of positions moved.
+    """
+    if transform.is_identity:
+        return text, 0
+    # Lets the command patterns anchor on a newline for the first line too
+    pieces = patterns.EXECUTE_LINE.split('\n' + text)
+    # The lines between execute lines, joined by a character no pattern matches across
+    separator = '\0' if '\0' not in text else None
+    segments = [separator.join(pieces[::2])] if separator else pieces[::2]
+    moved = 0
+    turn = Transform(quarter_turns=transform.quarter_turns, mirror=transform.mirror)
+    for index, segment in enumerate(segments):
+        for pattern, cells in POSITION_SYNTAXES:
+            segment, count = _transform_syntax(segment, pattern, cells, transform)
+            moved += count
+        if not turn.is_identity:
+            segment, _ = _transform_syntax(segment, VOLUME_SYNTAX, False, turn)
+        segments[index] = segment
+    pieces[::2] = segments[0].split(separator) if separator else segments
+    return ''.join(pieces)[1:], moved
+
+
+def transform_commands(commands: Sequence[str], transform: Transform) -> List[str]:
+    """Transform a list of single-line commands as one batch."""
+    if any('\n' in command for command in commands):
+        raise ValueError("Commands must be single lines")
+    if not commands:
+        return []
+    return transform_text('\n'.join(commands), transform)[0].split('\n')
+
+
+def transform_file(path: str, output_path: Optional[str], transform: Transform) -> int:
+    """Transform a .mcfunction file into output_path (stdout when None); returns the number of positions moved."""
+    from src.batch_rewrite import open_output
+    with open(path, "r", encoding="utf-8") as f:
+        text, moved = transform_text(f.read(), transform)
+    with open_output(output_path) as dst:
+        dst.write(text)
+    return moved
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Translate, rotate or mirror every position in .mcfunction files or datapacks.",
+                                     epilog="execute lines and ~ or ^ positions are left unchanged. Only positions move: "
+                                            "tp/summon yaw, Rotation and block states such as facing= are not rotated or mirrored.")
+    parser.add_argument("paths", nargs="+", help=".mcfunction files or datapack directories")
+    parser.add_argument("--translate", nargs=3, type=float, default=(0, 0, 0), metavar=("DX", "DY", "DZ"))
+    parser.add_argument("--rotate", type=int, default=0, metavar="TURNS", help="90° clockwise turns seen from above (negative = counter-clockwise)")
+    parser.add_argument("--mirror", choices=sorted(MIRROR_AXES), help="flip across the pivot along this axis")
+    parser.add_argument("--pivot", nargs=3, type=float, default=(0, 0, 0), metavar=("X", "Y", "Z"), help="point rotated and mirrored about")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("-o", "--output-dir", help="write transformed files here, mirroring the input layout")
+    output.add_argument("--in-place", action="store_true", help="transform the input files in place")
+    parser.add_argument("-v", "--verbose", action="store_true", help="enable debug logging")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from src.batch_rewrite import collect_mcfunction_files, output_path_for
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    transform = Transform(tuple(args.translate), args.rotate, args.mirror, tuple(args.pivot))
+
+    files = collect_mcfunction_files(args.paths)
+    start = time.perf_counter()
+    positions = 0
+    for path, relative_path in files:
+        positions += transform_file(path, output_path_for(args, path, relative_path), transform)
+    elapsed = time.perf_counter() - start
+    print(f"Transformed {positions} position(s) in {len(files)} file(s) in {elapsed:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
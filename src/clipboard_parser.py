@@ -1,7 +1,13 @@
 # Updated on 08:40 PM CDT, Monday, July 07, 2025
-import re
 import logging
-import pyperclip
+from src import patterns
+
+logger = logging.getLogger(__name__)
+
+def read_clipboard():
+    """Clipboard text. pyperclip is imported on first use, which keeps it off the startup path."""
+    import pyperclip
+    return pyperclip.paste()
 
 class ClipboardCoordinateParser:
     def __init__(self, gui):
@@ -9,72 +15,66 @@ class ClipboardCoordinateParser:
 
     def parse_coordinates(self, content):
         # Try to match /summon minecraft:block_display command
-        summon_match = re.match(
-            r'/summon minecraft:block_display\s+(-?\d+\.?\d*)\s+(-?\d+\.?\d*)\s+(-?\d+\.?\d*)',
-            content,
-            flags=re.DOTALL
-        )
+        summon_match = patterns.BLOCK_DISPLAY_COORDS.match(content)
         if summon_match:
             return [summon_match.group(1), summon_match.group(2), summon_match.group(3)]
 
         # Try to match raw coordinates (e.g., "66 103 -92")
-        raw_match = re.match(
-            r'(-?\d+)\s+(-?\d+)\s+(-?\d+)',
-            content,
-            flags=re.DOTALL
-        )
+        raw_match = patterns.RAW_COORDS.match(content)
         if raw_match:
             return [raw_match.group(1), raw_match.group(2), raw_match.group(3)]
 
-        logging.debug(f"Failed to parse coordinates from content: {content}")
+        logger.debug("Failed to parse coordinates from content: %s", content)
         return None
 
     def autofill_coordinates(self, vars_list):
         try:
-            content = pyperclip.paste().strip()
+            content = read_clipboard().strip()
             coords = self.parse_coordinates(content)
             if coords:
                 for var, coord in zip(vars_list, coords):
                     var.set(coord)
-                logging.debug(f"Autofilled coordinates: {coords}")
+                logger.debug("Autofilled coordinates: %s", coords)
                 self.gui.print_to_text(f"Autofilled coordinates from clipboard: {coords}", "coord")
             else:
-                logging.warning("No valid coordinates found in clipboard")
+                logger.warning("No valid coordinates found in clipboard")
                 self.gui.print_to_text("Error: No valid coordinates found in clipboard.", "normal")
         except Exception as e:
-            logging.error(f"Error autofilling coordinates: {e}")
+            logger.error("Error autofilling coordinates: %s", e)
             self.gui.print_to_text(f"Error: Invalid clipboard format. Use '/summon minecraft:block_display 0.0 0.0 0.0' or 'X Y Z' format.", "normal")
 
     def autofill_integer_coordinates(self, vars_list):
         try:
-            content = pyperclip.paste().strip()
+            content = read_clipboard().strip()
             coords = self.parse_coordinates(content)
             if coords:
-                for var, coord in zip(vars_list, coords):
-                    var.set(str(int(float(coord))))
-                logging.debug(f"Autofilled integer coordinates: {[str(int(float(coord))) for coord in coords]}")
-                self.gui.print_to_text(f"Autofilled integer coordinates from clipboard: {[str(int(float(coord))) for coord in coords]}", "coord")
+                integers = [str(int(float(coord))) for coord in coords]
+                for var, value in zip(vars_list, integers):
+                    var.set(value)
+                logger.debug("Autofilled integer coordinates: %s", integers)
+                self.gui.print_to_text(f"Autofilled integer coordinates from clipboard: {integers}", "coord")
             else:
-                logging.warning("No valid coordinates found in clipboard")
+                logger.warning("No valid coordinates found in clipboard")
                 self.gui.print_to_text("Error: No valid coordinates found in clipboard.", "normal")
         except Exception as e:
-            logging.error(f"Error autofilling integer coordinates: {e}")
+            logger.error("Error autofilling integer coordinates: %s", e)
             self.gui.print_to_text(f"Error: Invalid clipboard format. Use '/summon minecraft:block_display 0.0 0.0 0.0' or 'X Y Z' format.", "normal")
 
     def autofill_fractional_coordinates(self, vars_list):
         try:
-            content = pyperclip.paste().strip()
+            content = read_clipboard().strip()
             coords = self.parse_coordinates(content)
             if coords:
                 for var, coord in zip(vars_list, coords):
                     value = float(coord)
                     fractional = value - int(value)
                     var.set(str(fractional) if fractional != 0 else "0")
-                logging.debug(f"Autofilled fractional coordinates: {[str(float(coord) - int(float(coord))) for coord in coords]}")
-                self.gui.print_to_text(f"Autofilled fractional coordinates from clipboard: {[str(float(coord) - int(float(coord))) for coord in coords]}", "coord")
+                fractions = [str(float(coord) - int(float(coord))) for coord in coords]
+                logger.debug("Autofilled fractional coordinates: %s", fractions)
+                self.gui.print_to_text(f"Autofilled fractional coordinates from clipboard: {fractions}", "coord")
             else:
-                logging.warning("No valid coordinates found in clipboard")
+                logger.warning("No valid coordinates found in clipboard")
                 self.gui.print_to_text("Error: No valid coordinates found in clipboard.", "normal")
         except Exception as e:
-            logging.error(f"Error autofilling fractional coordinates: {e}")
+            logger.error("Error autofilling fractional coordinates: %s", e)
             self.gui.print_to_text(f"Error: Invalid clipboard format. Use '/summon minecraft:block_display 0.0 0.0 0.0' or 'X Y Z' format.", "normal")
\ No newline at end of file
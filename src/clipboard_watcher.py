@@ -0,0 +1,138 @@
+import ctypes
+import hashlib
+import logging
+import platform
+from collections import OrderedDict
+from typing import Callable, Optional
+from src import patterns
+from src.clipboard_parser import read_clipboard
+
+logger = logging.getLogger(__name__)
+
+# Poll interval while the clipboard keeps changing, and the ceiling it backs off to when idle
+MIN_INTERVAL_MS = 150
+MAX_INTERVAL_MS = 2000
+BACKOFF = 1.5
+
+# Only clipboard text that looks like a command is rewritten; anything else the user copies is left alone
+COMMAND_PATTERN = patterns.WATCHABLE_COMMAND
+
+# How many of our own clipboard writes are remembered; the oldest is forgotten first
+WRITTEN_LIMIT = 16
+
+
+def _clipboard_sequence_reader() -> Optional[Callable[[], int]]:
+    """Windows' clipboard change counter, which is far cheaper to poll than the clipboard text itself."""
+    if platform.system() != "Windows":
+        return None
+    try:
+        return ctypes.windll.user32.GetClipboardSequenceNumber
+    except AttributeError:
+        return None
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", errors="replace"), digest_size=16).digest()
+
+
+class ClipboardWatcher:
+    """Opt-in watch mode: rewrites commands with the active tab as soon as they are copied.
+
+    Polls from the Tk main loop with root.after, so processing stays on the
+    Tk thread. Each poll first checks the Windows clipboard sequence number
+    (where available) and only reads the text when it moved; the text is then
+    hashed to skip unchanged values and the results this watcher wrote itself.
+    The interval starts at MIN_INTERVAL_MS after a change and backs off to
+    MAX_INTERVAL_MS while nothing happens.
+    """
+
+    def __init__(self, gui, paste: Callable[[], str] = read_clipboard):
+        self.gui = gui
+        self.paste = paste
+        self.interval_ms = MIN_INTERVAL_MS
+        self.running = False
+        self.processed = 0
+        self._sequence = _clipboard_sequence_reader()
+        self._last_sequence = None
+        self._last_hash = None
+        # Hashes of the values we wrote, oldest first
+        self._written = OrderedDict()
+        self._after_id = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        # Whatever is on the clipboard when watching starts was copied before; only react to new copies
+        self._last_sequence = self._sequence() if self._sequence else None
+        self._last_hash = self._read_hash()
+        self.interval_ms = MIN_INTERVAL_MS
+        self._schedule()
+        logger.info("Clipboard watch mode started")
+
+    def stop(self):
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.gui.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        logger.info("Clipboard watch mode stopped")
+
+    def _schedule(self):
+        self._after_id = self.gui.root.after(int(self.interval_ms), self.poll)
+
+    def _read_hash(self) -> Optional[bytes]:
+        import pyperclip
+        try:
+            return content_hash(self.paste())
+        except pyperclip.PyperclipException as e:
+            logger.debug("Clipboard not readable: %s", e)
+            return None
+
+    def poll(self):
+        self._after_id = None
+        if not self.running or getattr(self.gui, "is_destroyed", False):
+            return
+        changed = False
+        try:
+            changed = self.check()
+        except Exception as e:
+            logger.error("Error in clipboard watch mode: %s", e)
+        if changed:
+            self.interval_ms = MIN_INTERVAL_MS
+        else:
+            self.interval_ms = min(MAX_INTERVAL_MS, self.interval_ms * BACKOFF)
+        self._schedule()
+
+    def check(self) -> bool:
+        """Process the clipboard if it holds a new command; True if it changed at all."""
+        if self._sequence is not None:
+            sequence = self._sequence()
+            if sequence == self._last_sequence:
+                return False
+            self._last_sequence = sequence
+        text = self.paste()
+        digest = content_hash(text)
+        if digest == self._last_hash:
+            return False
+        self._last_hash = digest
+        if digest in self._written:
+            # Our own result landing on the clipboard
+            del self._written[digest]
+            return True
+        if not COMMAND_PATTERN.match(text):
+            return True
+        # process_command copies its result through copy_result, which marks it as written by us
+        self.gui.process_command(text.strip())
+        self.processed += 1
+        return True
+
+    def mark_written(self, text: str):
+        """Record a value this app put on the clipboard so the watcher skips it."""
+        digest = content_hash(text)
+        self._written[digest] = None
+        self._written.move_to_end(digest)
+        if len(self._written) > WRITTEN_LIMIT:
+            self._written.popitem(last=False)
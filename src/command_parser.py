@@ -0,0 +1,442 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# "/summon minecraft:block_display X Y Z" followed by an optional SNBT payload
+_HEADER_PATTERN = re.compile(r'(/?summon\s+minecraft:block_display)\s+(([^\s{]+)\s+([^\s{]+)\s+([^\s{]+))\s*')
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\''
+
+# One entry of a compound: its key, its value and the `,` or `}` after it. The value is a
+# quoted string, a list, a compound nested at most one level deep (block_state Properties,
+# brightness) or a bare scalar. The bracket bodies are unrolled as plain* (special plain*)*,
+# where a special part (a string or a nested compound) starts with a character plain text
+# cannot hold: a body splits exactly one way, so an unclosed [ or { fails in linear time
+# instead of being split in exponentially many ways before the match gives up.
+_COMPOUND_BODY = rf'''[^{{}}"']*(?:{_STRING}[^{{}}"']*)*'''
+_ENTRY_PATTERN = re.compile(rf'''
+    \s*(\w+|{_STRING})\s*:\s*
+    (
+        {_STRING}
+      | \[[^\[\]"']*(?:{_STRING}[^\[\]"']*)*\]
+      | \{{[^{{}}"']*(?:(?:{_STRING}|\{{{_COMPOUND_BODY}\}})[^{{}}"']*)*\}}
+      | [^,{{}}\[\]\s]+
+    )
+    \s*([,}}])?''', re.VERBOSE)
+# An entry whose list or compound value nests deeper than that, such as Passengers
+_NESTED_ENTRY_PATTERN = re.compile(rf'\s*(\w+|{_STRING})\s*:\s*(?=[\[{{])')
+_ENTRY_END_PATTERN = re.compile(r'\s*([,}])')
+_NESTING_PATTERN = re.compile(rf'{_STRING}|[\[\]{{}}]')
+
+_LIST_ITEM_PATTERN = re.compile(rf'{_STRING}|[^,\s\[\];]+(?!\s*;)')
+_NAME_PATTERN = re.compile(rf'[{{,]\s*Name\s*:\s*({_STRING}|[^,}}\s]+)')
+_COMPOUND_ENTRY_PATTERN = re.compile(r'(\w+)\s*:\s*([^,}\s]+)')
+
+# transformation components are entries of the transformation compound, not of the root
+_TRANSFORMATION_KEYS = frozenset(("translation", "scale", "left_rotation", "right_rotation"))
+
+
+def _nested_value_end(command: str, start: int) -> Optional[int]:
+    """End of the list or compound opening at start, however deeply it nests; None if it never closes."""
+    depth = 0
+    for match in _NESTING_PATTERN.finditer(command, start):
+        char = match.group()[0]
+        if char in '[{':
+            depth += 1
+        elif char in ']}':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return None
+
+
+def _compound_fields(command: str, start: int) -> Dict[str, Tuple[int, int]]:
+    """Value spans of the entries of the compound opening at start, keyed by entry name.
+
+    The scan steps from entry to entry, skipping each value whole, so keys
+    inside nested values (a passenger's Tags, a CustomName's JSON) are never
+    mistaken for the compound's own. It stops at the closing brace or at the
+    first entry it cannot read.
+    """
+    fields = {}
+    index = start + 1
+    while True:
+        entry = _ENTRY_PATTERN.match(command, index)
+        if entry:
+            key, span, separator, index = entry.group(1), entry.span(2), entry.group(3), entry.end()
+        else:
+            entry = _NESTED_ENTRY_PATTERN.match(command, index)
+            end = _nested_value_end(command, entry.end()) if entry else None
+            if end is None:
+                break
+            key, span = entry.group(1), (entry.end(), end)
+            entry_end = _ENTRY_END_PATTERN.match(command, end)
+            separator, index = (entry_end.group(1), entry_end.end()) if entry_end else (None, end)
+        fields.setdefault(unquote(key), span)
+        if separator != ',':
+            break
+    return fields
+
+
+def unquote(raw: str) -> str:
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in '"\'':
+        return raw[1:-1]
+    return raw
+
+
+def _float_value(raw: str) -> float:
+    """Numeric value of an SNBT number such as 0.5f, 3d or -2."""
+    if raw[-1:] in ('f', 'F', 'd', 'D', 'b', 'B', 's', 'S', 'l', 'L'):
+        raw = raw[:-1]
+    return float(raw)
+
+
+# Coordinate notations: absolute, relative to the executing position (~) and local to the
+# executing rotation (^ left, ^ up, ^ forwards)
+ABSOLUTE, RELATIVE, LOCAL = "", "~", "^"
+
+
+@dataclass(frozen=True)
+class Coordinate:
+    """One axis of a position (or rotation) as written in a command: 12.5, ~, ~-3 or ^2."""
+    notation: str
+    value: float
+
+    @property
+    def is_absolute(self) -> bool:
+        return self.notation == ABSOLUTE
+
+    def shifted(self, offset: float) -> "Coordinate":
+        """Moved along its axis; a relative coordinate stays relative."""
+        if self.notation == LOCAL and offset:
+            raise ValueError("Local (^) coordinates do not follow world axes")
+        return Coordinate(self.notation, self.value + offset)
+
+    def format(self, precision: Optional[int] = None) -> str:
+        """Command text; without a precision whole values print as integers."""
+        if self.notation and self.value == 0:
+            return self.notation
+        if precision is not None:
+            return f"{self.notation}{self.value:.{precision}f}"
+        return self.notation + (str(int(self.value)) if self.value == int(self.value) else repr(float(self.value)))
+
+
+@dataclass(frozen=True)
+class Anchor:
+    """Executing position and rotation (yaw, pitch in degrees) that ~ and ^ coordinates resolve against."""
+    position: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    rotation: Tuple[float, float] = (0.0, 0.0)
+
+
+def parse_coordinate(token: str) -> Coordinate:
+    """Parse 12.5, ~, ~-3 or ^2; raises ValueError for anything else."""
+    notation = token[:1] if token[:1] in (RELATIVE, LOCAL) else ABSOLUTE
+    number = token[len(notation):]
+    if notation and not number:
+        return Coordinate(notation, 0.0)
+    if not _is_decimal(number):
+        raise ValueError(f"Invalid coordinate: {token}")
+    return Coordinate(notation, float(number))
+
+
+def _is_decimal(number: str) -> bool:
+    # Plain decimals only: float() would also take "nan", "1e5" or "1_0"
+    return number.replace('.', '', 1).lstrip('-').isdigit()
+
+
+def check_position(coordinates: Sequence[Coordinate]) -> List[Coordinate]:
+    """Raise ValueError unless this is a valid position: three axes, local (^) on all or none of them."""
+    coordinates = list(coordinates)
+    if len(coordinates) != 3:
+        raise ValueError("A position has three coordinates")
+    local = [coordinate.notation == LOCAL for coordinate in coordinates]
+    if any(local) and not all(local):
+        raise ValueError("Local (^) coordinates cannot be mixed with ~ or absolute ones")
+    return coordinates
+
+
+def parse_position(tokens: Sequence[str]) -> List[Coordinate]:
+    return check_position(parse_coordinate(token) for token in tokens)
+
+
+def resolve_position(coordinates: Sequence[Coordinate], anchor: Anchor) -> Tuple[float, float, float]:
+    """World position of a parsed position, as the game resolves it from the anchor."""
+    if coordinates[0].notation != LOCAL:
+        return tuple(coordinate.value + (base if coordinate.notation == RELATIVE else 0.0)
+                     for coordinate, base in zip(coordinates, anchor.position))
+    left, up, forwards = (coordinate.value for coordinate in coordinates)
+    yaw, pitch = (math.radians(angle) for angle in anchor.rotation)
+    # The game's local axes: forwards along the view, up perpendicular to it, left = up x forwards
+    forward_axis = (-math.sin(yaw) * math.cos(pitch), -math.sin(pitch), math.cos(yaw) * math.cos(pitch))
+    up_axis = (-math.sin(yaw) * math.sin(pitch), math.cos(pitch), math.cos(yaw) * math.sin(pitch))
+    left_axis = (up_axis[1] * forward_axis[2] - up_axis[2] * forward_axis[1],
+                 up_axis[2] * forward_axis[0] - up_axis[0] * forward_axis[2],
+                 up_axis[0] * forward_axis[1] - up_axis[1] * forward_axis[0])
+    # Rounded so quarter-turn rotations give clean values instead of sin/cos noise such as 6.1e-17
+    return tuple(round(base + forward_axis[i] * forwards + up_axis[i] * up + left_axis[i] * left, 9)
+                 for i, base in enumerate(anchor.position))
+
+
+def resolve_rotation(coordinates: Sequence[Coordinate], anchor: Anchor) -> Tuple[float, float]:
+    """Yaw and pitch of a parsed rotation; ~ angles add to the anchor's rotation."""
+    return tuple(coordinate.value + (base if coordinate.notation == RELATIVE else 0.0)
+                 for coordinate, base in zip(coordinates, anchor.rotation))
+
+
+class BlockDisplayCommand:
+    """Structured /summon minecraft:block_display command.
+
+    Payload fields (block_state, transformation vectors, Tags, brightness, billboard)
+    are located on first access and kept as spans into the source text. Edits are
+    recorded against those spans and applied in one pass by serialize(), so
+    everything that was not edited keeps its exact formatting.
+    """
+
+    def __init__(self, source: str, head: str, position: List[str], position_span: Tuple[int, int], payload_start: int):
+        self.source = source
+        self.head = head
+        self.position = position
+        self._position_span = position_span
+        self._payload_start = payload_start
+        # Entry spans of the root payload and of transformation, by the compound's start
+        self._compounds = {}
+        self._edits = {}
+
+    @property
+    def modified(self) -> bool:
+        return bool(self._edits)
+
+    def _span(self, key: str) -> Optional[Tuple[int, int]]:
+        if key in _TRANSFORMATION_KEYS:
+            parent = self._span("transformation")
+            if not parent or self.source[parent[0]] != '{':
+                return None
+            start = parent[0]
+        else:
+            start = self._payload_start
+        fields = self._compounds.get(start)
+        if fields is None:
+            fields = self._compounds[start] = _compound_fields(self.source, start)
+        return fields.get(key)
+
+    def raw(self, key: str) -> Optional[str]:
+        """Source text of a payload field, or None when the command does not have it."""
+        span = self._span(key)
+        return self.source[span[0]:span[1]] if span else None
+
+    def _replace(self, span: Tuple[int, int], text: str):
+        self._edits[span] = text
+
+    # Position
+    @property
+    def position_coordinates(self) -> List[Coordinate]:
+        return parse_position(self.position)
+
+    @property
+    def is_absolute(self) -> bool:
+        return not any(value[:1] in (RELATIVE, LOCAL) for value in self.position)
+
+    def coordinates(self, anchor: Optional[Anchor] = None) -> List[float]:
+        """World position; ~ and ^ axes are resolved against anchor (ValueError without one)."""
+        if self.is_absolute:
+            return [float(value) for value in self.position]
+        if anchor is None:
+            raise ValueError("Position is relative to the executing entity; an anchor is needed to resolve it")
+        return list(resolve_position(self.position_coordinates, anchor))
+
+    def set_coordinates(self, x: float, y: float, z: float):
+        self.position = [f"{x:.6f}", f"{y:.6f}", f"{z:.6f}"]
+        self._replace(self._position_span, ' '.join(self.position))
+
+    def set_position(self, coordinates: Sequence[Coordinate]):
+        """Replace the position, keeping ~ and ^ axes symbolic; absolute axes get six decimals."""
+        self.position = [coordinate.format(6 if coordinate.is_absolute else None) for coordinate in check_position(coordinates)]
+        self._replace(self._position_span, ' '.join(self.position))
+
+    # block_state
+    @property
+    def block_state(self) -> Optional[str]:
+        return self.raw("block_state")
+
+    def _block_name_span(self) -> Optional[Tuple[int, int]]:
+        span = self._span("block_state")
+        if not span:
+            return None
+        match = _NAME_PATTERN.search(self.source, span[0], span[1])
+        return match.span(1) if match else None
+
+    @property
+    def block_name(self) -> Optional[str]:
+        span = self._block_name_span()
+        return unquote(self.source[span[0]:span[1]]) if span else None
+
+    def set_block_name(self, name: str):
+        span = self._block_name_span()
+        if span is None:
+            raise ValueError("Command has no block_state Name")
+        self._replace(span, f'"{name}"')
+
+    # transformation
+    def get_vector(self, key: str) -> Optional[List[str]]:
+        """Raw components of a transformation vector (translation, scale, left_rotation, right_rotation)."""
+        raw = self.raw(key)
+        if raw is None or not raw.startswith('['):
+            return None
+        # Vectors only hold numbers, so a plain split is enough
+        return [component.strip() for component in raw[1:-1].split(',')]
+
+    def vector_values(self, key: str) -> Optional[List[float]]:
+        vector = self.get_vector(key)
+        return [_float_value(value) for value in vector] if vector is not None else None
+
+    def set_vector(self, key: str, components: List[str]):
+        """Replace an existing transformation vector with raw SNBT components such as "0.5f"."""
+        span = self._span(key)
+        if span is None:
+            raise ValueError(f"Command has no {key} vector")
+        self._replace(span, '[' + ','.join(components) + ']')
+
+    # Tags
+    @property
+    def tags(self) -> List[str]:
+        raw = self.raw("Tags")
+        if raw is None or not raw.startswith('['):
+            return []
+        if ',' not in raw:
+            tag = raw[1:-1].strip()
+            return [unquote(tag)] if tag else []
+        return [unquote(tag) for tag in _LIST_ITEM_PATTERN.findall(raw)]
+
+    def set_tags(self, tags: List[str]):
+        span = self._span("Tags")
+        if span is None:
+            raise ValueError("Command has no Tags list")
+        self._replace(span, '[' + ','.join(f'"{tag}"' for tag in tags) + ']')
+
+    # Rendering properties
+    @property
+    def brightness(self):
+        raw = self.raw("brightness")
+        if raw is None:
+            return None
+        if raw.startswith('{'):
+            return {key: int(value) for key, value in _COMPOUND_ENTRY_PATTERN.findall(raw)}
+        return int(raw)
+
+    @property
+    def billboard(self) -> Optional[str]:
+        raw = self.raw("billboard")
+        return unquote(raw) if raw is not None else None
+
+    def serialize(self) -> str:
+        if not self._edits:
+            return self.source
+        parts = []
+        last = 0
+        for (start, end), text in sorted(self._edits.items()):
+            parts.append(self.source[last:start])
+            parts.append(text)
+            last = end
+        parts.append(self.source[last:])
+        return ''.join(parts)
+
+
+def parse_block_display(command: str) -> BlockDisplayCommand:
+    """Parse a block_display summon; raises ValueError for anything else."""
+    header = _HEADER_PATTERN.match(command)
+    if not header:
+        raise ValueError("Not a /summon minecraft:block_display command")
+    position = [header.group(3), header.group(4), header.group(5)]
+    if any(token[:1] in (RELATIVE, LOCAL) for token in position):
+        parse_position(position)
+    else:
+        # The common all-absolute position only needs its numbers checked, not Coordinate objects
+        for token in position:
+            if not _is_decimal(token):
+                raise ValueError(f"Invalid coordinate: {token}")
+    payload_start = header.end()
+    if payload_start < len(command) and command[payload_start] != '{':
+        raise ValueError("block_display payload is not a compound")
+    return BlockDisplayCommand(command, header.group(1), position, header.span(2), payload_start)
+
+
+# "summon end_crystal X Y Z"; the whitespace may span lines, everything after Z may not
+_CRYSTAL_HEAD = "summon end_crystal"
+# Absolute axes are whole blocks; ~ and ^ axes may carry a fraction
+_CRYSTAL_COORDINATE = r'([~^](?:-?(?:\d+(?:\.\d*)?|\.\d+))?|-?\d+)'
+_CRYSTAL_POSITION_PATTERN = re.compile(rf'summon end_crystal\s+{_CRYSTAL_COORDINATE}\s+{_CRYSTAL_COORDINATE}\s+{_CRYSTAL_COORDINATE}')
+_INTEGER_PATTERN = re.compile(r'-?\d+')
+
+Span = Tuple[int, int]
+
+
+def _line_end(text: str, start: int) -> int:
+    end = text.find('\n', start)
+    return len(text) if end == -1 else end
+
+
+def _scan_keyed_integers(text: str, keys: Tuple[str, ...], start: int, end: int) -> Optional[List[Span]]:
+    """Spans of the integers after the first `X:`, then `Y:`, then `Z:` (or other keys) that carry one.
+
+    Each search resumes where the previous one stopped, so the scan reads
+    text[start:end] once however many keys lack a number.
+    """
+    spans = []
+    position = start
+    for key in keys:
+        index = text.find(key, position, end)
+        while index != -1:
+            number = _INTEGER_PATTERN.match(text, index + len(key), end)
+            if number:
+                break
+            index = text.find(key, index + 1, end)
+        if index == -1:
+            return None
+        spans.append(number.span())
+        position = number.end()
+    return spans
+
+
+def find_end_crystal_summon(command: str) -> Optional[Tuple[int, int, List[Span]]]:
+    """Locate `summon end_crystal X Y Z ... BeamTarget:{X:.. Y:.. Z:..}}` in linear time.
+
+    Returns (start, end, spans): command[start:end] runs from "summon" to the
+    first "}}" after the target's Z, and spans are the six coordinates (position
+    x, y, z, which may be ~ or ^, then the target's integer X, Y, Z). The target starts after the first
+    "BeamTarget:{" or "],{" following the position, all on the line where the
+    position ends. Every scan moves forward only, so long NBT payloads or
+    malformed input cost O(n) instead of a backtracking regex's blow-up.
+    """
+    start = command.find(_CRYSTAL_HEAD)
+    while start != -1:
+        position = _CRYSTAL_POSITION_PATTERN.match(command, start)
+        if not position:
+            start = command.find(_CRYSTAL_HEAD, start + 1)
+            continue
+        line_end = _line_end(command, position.end())
+        anchors = [index for index in (command.find("BeamTarget:{", position.end(), line_end),
+                                       command.find("],{", position.end(), line_end)) if index != -1]
+        if anchors:
+            anchor = min(anchors)
+            anchor_end = anchor + (len("BeamTarget:{") if command.startswith("BeamTarget:{", anchor) else len("],{"))
+            target = _scan_keyed_integers(command, ("X:", "Y:", "Z:"), anchor_end, line_end)
+            if target:
+                close = command.find("}}", target[-1][1], line_end)
+                if close != -1:
+                    return start, close + 2, [position.span(1), position.span(2), position.span(3)] + target
+        # A later summon on this line would scan a suffix of what just failed; only later lines can match
+        start = command.find(_CRYSTAL_HEAD, line_end)
+    return None
+
+
+def find_beam_target(command: str) -> Optional[List[Span]]:
+    """Spans of X, Y and Z in the first complete `BeamTarget:{X:.. Y:.. Z:.. }` (on one line), in linear time."""
+    start = command.find("BeamTarget:{")
+    while start != -1:
+        line_end = _line_end(command, start)
+        target = _scan_keyed_integers(command, ("X:", "Y:", "Z:"), start + len("BeamTarget:{"), line_end)
+        if target and command.find("}", target[-1][1], line_end) != -1:
+            return target
+        start = command.find("BeamTarget:{", line_end)
+    return None
@@ -1,36 +1,143 @@
 # Updated on 01:50 AM CDT, Friday, June 13, 2025
 import logging
-import re
-import pyperclip
+import queue
+import threading
+import time
 import keyboard
 import tkinter as tk
 from typing import Tuple, List, Optional
+from src.stage_timings import timed
+
+logger = logging.getLogger(__name__)
+
+# Presses closer together than this are treated as one (key repeat, double taps)
+DEBOUNCE_SECONDS = 0.15
+# How often the Tk main loop picks up finished F12 jobs
+RESULT_POLL_MS = 30
 
 class CommandProcessor:
+    """Handles the F12 hotkey without touching Tk from the keyboard hook thread.
+
+    The hook only debounces the press and enqueues a job; a queue of one
+    coalesces presses made while a job is still waiting. A worker thread reads
+    the clipboard and rewrites the command with the GUI's RewriteProfile (kept
+    current by variable traces on the Tk thread), and the Tk main loop picks
+    up the results with root.after.
+
+    The hook is armed before the GUI exists; presses made meanwhile wait in
+    the queue until set_gui starts the worker. The clipboard and rewrite
+    modules are imported on first use so arming the hook stays cheap.
+    """
+
     def __init__(self):
+        self._jobs = queue.Queue(maxsize=1)
+        self._results = queue.Queue()
+        self._last_press = 0.0
+        self._state_lock = threading.Lock()
+        self._active_tab = ""
+        self._worker = None
         self.setup_keyboard_hook()
 
     def setup_keyboard_hook(self):
         keyboard.add_hotkey('F12', self.on_f12_press)
-        logging.info("F12 keyboard hook initialized")
+        logger.info("F12 keyboard hook initialized")
 
     def on_f12_press(self):
-        logging.info("F12 pressed - capturing clipboard command")
-        command = pyperclip.paste()
-        if command.strip():
-            if hasattr(self, 'gui'):
-                self.gui.process_command(command)
-            else:
-                logging.error("GUI not set for command processing")
-        else:
-            if hasattr(self, 'gui'):
-                self.gui.print_to_text("", "normal")
-                self.gui.print_to_text("Input Command:", "normal")
-                self.gui.print_to_text("Clipboard is empty or invalid. Copy a command before pressing F12.", "normal")
-                self.gui.print_to_text("", "normal")
+        """Runs on the keyboard hook thread: debounce and enqueue, nothing else."""
+        now = time.monotonic()
+        if now - self._last_press < DEBOUNCE_SECONDS:
+            return
+        self._last_press = now
+        try:
+            self._jobs.put_nowait(now)
+            logger.info("F12 pressed - queued clipboard command")
+        except queue.Full:
+            logger.debug("F12 pressed while a job is still waiting; coalesced")
 
     def set_gui(self, gui):
+        """Attach the GUI (on the Tk thread), start tracking its state and start the worker."""
         self.gui = gui
+        self._active_tab = self._read_active_tab()
+        gui.notebook.bind("<<NotebookTabChanged>>", lambda e: self._on_tab_changed(), add="+")
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name="f12-worker", daemon=True)
+            self._worker.start()
+        gui.root.after(RESULT_POLL_MS, self._deliver_results)
+
+    def _read_active_tab(self) -> str:
+        return self.gui.notebook.tab(self.gui.notebook.select(), "text").lower()
+
+    def _on_tab_changed(self):
+        active_tab = self._read_active_tab()
+        with self._state_lock:
+            self._active_tab = active_tab
+
+    def _snapshot(self):
+        from src.command_modifier import current_profile
+        with self._state_lock:
+            return self._active_tab, current_profile(self.gui)
+
+    def _timed(self, stage):
+        return timed(getattr(self.gui, "stage_timings", None), stage)
+
+    def _work(self):
+        while True:
+            pressed = self._jobs.get()
+            try:
+                with self._timed("f12 job"):
+                    kind, payload = self.run_job()
+            except Exception as e:
+                logger.error("Error processing F12 command: %s", e, exc_info=True)
+                kind, payload = "error", str(e)
+            self._results.put((kind, payload, pressed))
+
+    def run_job(self) -> Tuple[str, object]:
+        """Worker side of a press: read the clipboard and, on rewrite tabs, rewrite it. No Tk calls."""
+        from src.clipboard_parser import read_clipboard
+        from src.rewrite_cache import cached_rewrite
+        from src.rewrite_engine import REWRITE_TABS
+        with self._timed("clipboard read"):
+            command = read_clipboard()
+        if not command.strip():
+            return "empty", None
+        with self._timed("profile read"):
+            active_tab, profile = self._snapshot()
+        if active_tab in REWRITE_TABS:
+            with self._timed("rewrite"):
+                modified_command, messages = cached_rewrite(getattr(self.gui, 'rewrite_cache', None), command, active_tab, profile)
+            return "rewrite", (active_tab, modified_command, messages)
+        # Other tabs read their inputs straight from the widgets, so they run on the Tk thread
+        return "gui", command
+
+    def _deliver_results(self):
+        """Tk thread: show every finished job, then poll again."""
+        if getattr(self.gui, "is_destroyed", False):
+            return
+        while True:
+            try:
+                kind, payload, pressed = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.show_result(kind, payload)
+            timings = getattr(self.gui, "stage_timings", None)
+            if timings is not None:
+                # From the key press to the result being on screen, including queueing and the poll delay
+                timings.record("f12 to result", time.monotonic() - pressed)
+        self.gui.root.after(RESULT_POLL_MS, self._deliver_results)
+
+    def show_result(self, kind, payload):
+        if kind == "rewrite":
+            from src.command_modifier import show_rewrite_result
+            show_rewrite_result(self.gui, *payload)
+        elif kind == "gui":
+            self.gui.process_command(payload)
+        elif kind == "empty":
+            self.gui.print_to_text("", "normal")
+            self.gui.print_to_text("Input Command:", "normal")
+            self.gui.print_to_text("Clipboard is empty or invalid. Copy a command before pressing F12.", "normal")
+            self.gui.print_to_text("", "normal")
+        else:
+            self.gui.print_to_text(f"Error processing clipboard: {payload}", "normal")
 
     def get_offsets(self, pos_x_offset: tk.StringVar, pos_y_offset: tk.StringVar, pos_z_offset: tk.StringVar,
                     target_x_offset: tk.StringVar, target_y_offset: tk.StringVar, target_z_offset: tk.StringVar) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
@@ -47,7 +154,7 @@ class CommandProcessor:
             )
             return pos_offsets, target_offsets
         except ValueError:
-            logging.warning("Invalid offset values entered, using 0")
+            logger.warning("Invalid offset values entered, using 0")
             return (0, 0, 0), (0, 0, 0)
 
     def get_set_values(self, pos_x_set: tk.StringVar, pos_y_set: tk.StringVar, pos_z_set: tk.StringVar,
@@ -65,81 +172,17 @@ class CommandProcessor:
             )
             return pos_set, target_set
         except ValueError:
-            logging.warning("Invalid set values entered, using 0")
+            logger.warning("Invalid set values entered, using 0")
             return (0, 0, 0), (0, 0, 0)
 
 
     def modify_coordinates(self, command: str, use_set: bool, pos_x_var: tk.StringVar, pos_y_var: tk.StringVar, pos_z_var: tk.StringVar,
                            target_x_var: tk.StringVar, target_y_var: tk.StringVar, target_z_var: tk.StringVar,
                            block_text: tk.StringVar) -> Tuple[str, List[int], Optional[str]]:
-        logging.debug(f"Modifying coordinates for command: {command}")
         if use_set:
             pos_values, target_values = self.get_set_values(pos_x_var, pos_y_var, pos_z_var, target_x_var, target_y_var, target_z_var)
         else:
-            pos_offsets, target_offsets = self.get_offsets(pos_x_var, pos_y_var, pos_z_var, target_x_var, target_y_var, target_z_var)
-
-        original_coords = [int(x) for x in re.findall(r'-?\d+\b', command) if x.lstrip('-').isdigit()]
-        original_block = None
-        block_match = re.search(r'(?:setblock\s+-?\d+\s+-?\d+\s+-?\d+\s+)(minecraft:\w+|\w+)', command)
-        if block_match:
-            original_block = block_match.group(1)
-
-        summon_pattern = re.compile(r'(summon end_crystal\s+)(-?\d+)(\s+)(-?\d+)(\s+)(-?\d+)(.*?(?:BeamTarget:\{|\],\{).*?X:)(-?\d+)(.*?Y:)(-?\d+)(.*?Z:)(-?\d+)(.*?\}\})')
-        summon_match = summon_pattern.search(command)
-        if summon_match:
-            logging.debug(f"Summon match groups: {summon_match.groups()}")
-            x1 = pos_values[0] if use_set else int(summon_match.group(2)) + pos_offsets[0]
-            y1 = pos_values[1] if use_set else int(summon_match.group(4)) + pos_offsets[1]
-            z1 = pos_values[2] if use_set else int(summon_match.group(6)) + pos_offsets[2]
-            x2 = target_values[0] if use_set else int(summon_match.group(8)) + target_offsets[0]
-            y2 = target_values[1] if use_set else int(summon_match.group(10)) + target_offsets[1]
-            z2 = target_values[2] if use_set else int(summon_match.group(12)) + target_offsets[2]
-            result = f"{summon_match.group(1)}{x1}{summon_match.group(3)}{y1}{summon_match.group(5)}{z1}{summon_match.group(7)}{x2}{summon_match.group(9)}{y2}{summon_match.group(11)}{z2}{summon_match.group(13)}"
-            logging.debug(f"Summon command modified: {result}")
-            return result, original_coords, None
-
-        coords_pattern = r'-?\d+(?:\s*-?\d+){2}'
-        coords_match = re.search(coords_pattern, command)
-        if coords_match and "summon" in command and not summon_match:
-            logging.debug(f"Malformed summon input detected, extracting coordinates: {coords_match.group()}")
-            coords = re.findall(r'-?\d+', coords_match.group())
-            if len(coords) >= 3:
-                x1, y1, z1 = map(int, coords[:3])
-                x2, y2, z2 = target_values if use_set else (x1 + target_offsets[0], y1 + target_offsets[1], z1 + target_offsets[2])
-                beam_target_match = re.search(r'BeamTarget:\{.*?X:(-?\d+).*?Y:(-?\d+).*?Z:(-?\d+).*?\}', command)
-                if beam_target_match:
-                    x2 = target_values[0] if use_set else int(beam_target_match.group(1)) + target_offsets[0]
-                    y2 = target_values[1] if use_set else int(beam_target_match.group(2)) + target_offsets[1]
-                    z2 = target_values[2] if use_set else int(beam_target_match.group(3)) + target_offsets[2]
-                result = f"summon end_crystal {x1} {y1} {z1} {{ShowBottom:0b,Invulnerable:1b,Tags:[\"laser\"],BeamTarget:{{X:{x2},Y:{y2},Z:{z2}}}}}"
-                original_coords = [x1, y1, z1] + ([int(beam_target_match.group(1)), int(beam_target_match.group(2)), int(beam_target_match.group(3))] if beam_target_match else [])
-                logging.debug(f"Reconstructed summon command: {result}")
-                return result, original_coords, None
-
-        setblock_pattern = re.compile(r'(setblock\s+)(-?\d+)(\s+)(-?\d+)(\s+)(-?\d+)(\s+(minecraft:\w+|\w+))')
-        setblock_match = setblock_pattern.search(command)
-        if setblock_match:
-            logging.debug(f"Setblock match groups: {setblock_match.groups()}")
-            x = pos_values[0] if use_set else int(setblock_match.group(2)) + pos_offsets[0]
-            y = pos_values[1] if use_set else int(setblock_match.group(4)) + pos_offsets[1]
-            z = pos_values[2] if use_set else int(setblock_match.group(6)) + pos_offsets[2]
-            original_block_text = setblock_match.group(8).strip()  # Extract block, remove extra spaces
-            new_block_text = block_text.get().strip() if self.gui.notebook.tab(self.gui.notebook.select(), "text") == "Change Block" else original_block_text
-            # Reconstruct with single space after coordinates
-            result = f"/setblock {x} {y} {z} {new_block_text}"
-            logging.debug(f"Setblock command modified: {result}")
-            return result, original_coords, original_block_text
-
-        kill_pattern = re.compile(r'(kill @e\[[^]]*x=)(-?\d+)([^,]*,\s*y=)(-?\d+)([^,]*,\s*z=)(-?\d+)([^]]*\])')
-        kill_match = kill_pattern.search(command)
-        if kill_match:
-            logging.debug(f"Kill match groups: {kill_match.groups()}")
-            x = pos_values[0] if use_set else int(kill_match.group(2)) + pos_offsets[0]
-            y = pos_values[1] if use_set else int(kill_match.group(4)) + pos_offsets[1]
-            z = pos_values[2] if use_set else int(kill_match.group(6)) + pos_offsets[2]
-            result = f"{kill_match.group(1)}{x}{kill_match.group(3)}{y}{kill_match.group(5)}{z}{kill_match.group(7)}"
-            logging.debug(f"Kill command modified: {result}")
-            return result, original_coords, None
-
-        logging.debug("No modification applied")
-        return command, original_coords, None
\ No newline at end of file
+            pos_values, target_values = self.get_offsets(pos_x_var, pos_y_var, pos_z_var, target_x_var, target_y_var, target_z_var)
+        from src.rewrite_cache import cached_modify_coordinates
+        new_block = block_text.get().strip() if self.gui.notebook.tab(self.gui.notebook.select(), "text") == "Change Block" else None
+        return cached_modify_coordinates(getattr(self.gui, 'rewrite_cache', None), command, use_set, pos_values, target_values, new_block)
@@ -2,11 +2,14 @@
 import tkinter as tk
 from tkinter import ttk
 import logging
-from src.gui_tabs import create_modifier_gui, create_change_block_gui, create_generate_laser_gui, create_generate_end_beam_gui, create_settings_gui, create_terminal_gui, create_rename_tag_gui
-from src.gui_utils import adjust_offset, toggle_always_on_top, start_record_keybind, record_keybind, process_clipboard, toggle_terminal, print_to_text, on_closing, show_window, show_settings, copy_to_clipboard
+from src.gui_tabs import LazyTabs, create_modifier_gui, create_change_block_gui, create_generate_laser_gui, create_generate_end_beam_gui, create_settings_gui, create_terminal_gui, create_rename_tag_gui
+from src.gui_utils import adjust_offset, toggle_always_on_top, toggle_clipboard_watch, toggle_unload_hidden_tabs, apply_cache_size, clear_rewrite_cache, reset_stage_timings, export_stage_timings, refresh_cache_stats, start_record_keybind, record_keybind, process_clipboard, toggle_terminal, print_to_text, on_closing, restore_tab_values, track_tab_values, show_window, show_settings, copy_to_clipboard
 from src.clipboard_parser import ClipboardCoordinateParser
-from src.command_modifier import process_command, set_laser_preset, set_lightbeam_preset
-from src.settings import load_settings, save_settings
+from src.clipboard_watcher import ClipboardWatcher
+from src.rewrite_cache import DEFAULT_CACHE_SIZE, RewriteCache
+from src.stage_timings import StageTimings
+from src.command_modifier import RewriteProfileTracker, process_command, set_laser_preset, set_lightbeam_preset
+from src.settings import SettingsStore
 
 class CommandModifierGUI:
     def __init__(self, root):
@@ -16,7 +19,7 @@ class CommandModifierGUI:
         self.is_destroyed = False
         self.is_recording_key = False
         self.terminal_visible = False
-        self.settings = load_settings()
+        self.settings = SettingsStore()
 
         # Initialize variables
         self.pos_vars = [tk.StringVar(value="0") for _ in range(3)]
@@ -37,6 +40,14 @@ class CommandModifierGUI:
         self.target_z = tk.StringVar(value="0")
         self.always_on_top = tk.BooleanVar(value=self.settings.get("always_on_top", False))
         self.key_bind = tk.StringVar(value=self.settings.get("key_bind", ""))
+        self.watch_clipboard = tk.BooleanVar(value=self.settings.get("watch_clipboard", False))
+        self.unload_hidden_tabs = tk.BooleanVar(value=self.settings.get("unload_hidden_tabs", False))
+        self.rewrite_cache = RewriteCache(self.settings.get("rewrite_cache_size", DEFAULT_CACHE_SIZE))
+        self.cache_size = tk.StringVar(value=str(self.rewrite_cache.maxsize))
+        self.cache_stats = tk.StringVar(value=self.rewrite_cache.stats())
+        # Per-stage latencies of the rewrite pipeline, shown in the Settings tab's diagnostics panel
+        self.stage_timings = StageTimings()
+        self.timing_stats = tk.StringVar(value=self.stage_timings.report())
         self.block_text = tk.StringVar(value="minecraft:lime_concrete")
         self.modify_coords = tk.BooleanVar(value=True)
         self.modify_translation = tk.BooleanVar(value=True)
@@ -51,8 +62,8 @@ class CommandModifierGUI:
         self.trans_z = tk.StringVar(value="0.0")
         self.beam_scale = tk.StringVar(value="-150.0")
         self.centering_x = tk.StringVar(value="0.0")
-        self.centering_y = tk.StringVar(value="0.0")
-        self.centering_z = tk.StringVar(value="0.0")
+        self.centering_y = tk.StringVar(value="0.5")
+        self.centering_z = tk.StringVar(value="0.999999")
         self.tag_text = tk.StringVar(value="beam1")
 
         # Create notebook
@@ -69,25 +80,24 @@ class CommandModifierGUI:
         self.settings_frame = ttk.Frame(self.notebook)
         self.terminal_frame = ttk.Frame(self.root)
 
-        # Add tabs
-        self.notebook.add(self.command_frame, text="Modify Laser")
-        self.notebook.add(self.set_frame, text="Set Coordinates")
-        self.notebook.add(self.change_block_frame, text="Change Block")
-        self.notebook.add(self.generate_laser_frame, text="Generate Laser")
-        self.notebook.add(self.generate_end_beam_frame, text="Generate End Beam")
-        self.notebook.add(self.rename_tag_frame, text="Rename Tag/Group")
-        self.notebook.add(self.settings_frame, text="Settings")
-
-        # Create GUIs
-        create_modifier_gui(self.command_frame, self.pos_vars, self.target_vars, "Command", self)
-        create_modifier_gui(self.set_frame, self.pos_vars, self.target_vars, "Set", self)
-        create_change_block_gui(self.change_block_frame, self)
-        create_generate_laser_gui(self.generate_laser_frame, self)
-        create_generate_end_beam_gui(self.generate_end_beam_frame, self)
-        create_rename_tag_gui(self.rename_tag_frame, self)
-        create_settings_gui(self.settings_frame, self)
+        # Add tabs; each is built the first time it is selected (widgets named in provides= are created by its build)
+        self.tabs = LazyTabs(self.notebook, unload_hidden=self.unload_hidden_tabs.get())
+        self.tabs.add(self.command_frame, "Modify Laser", lambda frame: create_modifier_gui(frame, self.pos_vars, self.target_vars, "Command", self), provides=("cmd_text_cmd",))
+        self.tabs.add(self.set_frame, "Set Coordinates", lambda frame: create_modifier_gui(frame, self.pos_vars, self.target_vars, "Set", self), provides=("cmd_text_set",))
+        self.tabs.add(self.change_block_frame, "Change Block", lambda frame: create_change_block_gui(frame, self), provides=("change_block_cmd_text",))
+        self.tabs.add(self.generate_laser_frame, "Generate Laser", lambda frame: create_generate_laser_gui(frame, self), provides=("laser_cmd_text", "laser_rot_cmd_text"))
+        self.tabs.add(self.generate_end_beam_frame, "Generate End Beam", lambda frame: create_generate_end_beam_gui(frame, self), provides=("spawn_text", "despawn_text"))
+        self.tabs.add(self.rename_tag_frame, "Rename Tag/Group", lambda frame: create_rename_tag_gui(frame, self), provides=("rename_tag_cmd_text",))
+        self.tabs.add(self.settings_frame, "Settings", lambda frame: create_settings_gui(frame, self))
         create_terminal_gui(self.terminal_frame, self)
 
+        # Last session's field values, then keep them saved as they change
+        restore_tab_values(self)
+        track_tab_values(self)
+
+        # Snapshot of the rewrite settings, kept current by variable traces
+        self.rewrite_profile = RewriteProfileTracker(self)
+
         # Initialize clipboard parser after GUI setup
         self.clipboard_parser = ClipboardCoordinateParser(self)
 
@@ -101,12 +111,40 @@ class CommandModifierGUI:
         if self.key_bind.get():
             self.root.bind(self.key_bind.get(), lambda e: process_clipboard(self))
 
+        # Optional watch mode: rewrite commands as soon as they are copied
+        self.clipboard_watcher = ClipboardWatcher(self)
+        if self.watch_clipboard.get():
+            self.clipboard_watcher.start()
+
+        refresh_cache_stats(self)
+
+        # Only the tab on screen is built now
+        self.tabs.show(self.notebook.select())
+
     def adjust_offset(self, offset_var, change):
         adjust_offset(offset_var, change)
 
     def toggle_always_on_top(self):
         toggle_always_on_top(self)
 
+    def toggle_clipboard_watch(self):
+        toggle_clipboard_watch(self)
+
+    def toggle_unload_hidden_tabs(self):
+        toggle_unload_hidden_tabs(self)
+
+    def apply_cache_size(self):
+        apply_cache_size(self)
+
+    def clear_rewrite_cache(self):
+        clear_rewrite_cache(self)
+
+    def reset_stage_timings(self):
+        reset_stage_timings(self)
+
+    def export_stage_timings(self):
+        export_stage_timings(self)
+
     def start_record_keybind(self):
         start_record_keybind(self)
 
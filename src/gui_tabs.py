@@ -1,10 +1,16 @@
 # Updated on 09:40 PM CDT, Monday, July 07, 2025
+import logging
+import time
 import tkinter as tk
 from tkinter import ttk
 from src.command_modifier import set_laser_preset, set_lightbeam_preset
 from src.clipboard_parser import ClipboardCoordinateParser
+from src.terminal_buffer import TerminalBuffer, DEFAULT_MAX_LINES
 
-def create_modifier_gui(frame, pos_vars, target_vars, title_prefix, gui):
+logger = logging.getLogger(__name__)
+
+def create_scrollable_frame(frame):
+    """Fill a tab with a canvas + scrollbar and return the frame inside it that the tab's widgets go in."""
     canvas = tk.Canvas(frame)
     scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
     scrollable_frame = ttk.Frame(canvas)
@@ -16,13 +22,94 @@ def create_modifier_gui(frame, pos_vars, target_vars, title_prefix, gui):
     canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
     canvas.configure(yscrollcommand=scrollbar.set)
 
-    canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
+    # The wheel binding is global, so it is taken over by whichever tab the pointer is in
+    def on_wheel(e):
+        if canvas.winfo_exists():
+            canvas.yview_scroll(int(-1*(e.delta/120)), "units")
+    canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", on_wheel))
 
     canvas.grid(row=0, column=0, sticky="nsew")
     scrollbar.grid(row=0, column=1, sticky="ns")
 
     frame.columnconfigure(0, weight=1)
     frame.rowconfigure(0, weight=1)
+    return scrollable_frame
+
+class LazyTabs:
+    """Builds each notebook tab the first time it is selected.
+
+    Tabs are registered with the function that fills their frame; at startup
+    only the selected one is built, the rest on <<NotebookTabChanged>>. Code
+    that needs a widget from a tab that may not exist yet goes through
+    widget(), which builds the owning tab first. With unload_hidden, a tab's
+    widgets are destroyed again once another tab is selected. The Tk
+    variables they show live on the GUI, so only widget state such as a
+    result textbox is lost.
+    """
+
+    def __init__(self, notebook, unload_hidden=False):
+        self.notebook = notebook
+        self.unload_hidden = unload_hidden
+        self._tabs = {}       # frame path -> (frame, build)
+        self._providers = {}  # GUI attribute -> path of the frame whose build creates it
+        self._built = set()
+        notebook.bind("<<NotebookTabChanged>>", lambda e: self.show(self.notebook.select()), add="+")
+
+    def add(self, frame, text, build, provides=()):
+        self.notebook.add(frame, text=text)
+        self._tabs[str(frame)] = (frame, build)
+        for name in provides:
+            self._providers[name] = str(frame)
+
+    def is_built(self, frame) -> bool:
+        return str(frame) in self._built
+
+    def ensure(self, frame):
+        key = str(frame)
+        if key in self._built or key not in self._tabs:
+            return
+        tab_frame, build = self._tabs[key]
+        start = time.perf_counter()
+        build(tab_frame)
+        self._built.add(key)
+        logger.debug("Built tab %s in %.1f ms", self.notebook.tab(tab_frame, 'text'), (time.perf_counter() - start) * 1000)
+
+    def unload(self, frame):
+        key = str(frame)
+        if key not in self._built:
+            return
+        tab_frame, _ = self._tabs[key]
+        for child in tab_frame.winfo_children():
+            child.destroy()
+        self._built.discard(key)
+        logger.debug("Unloaded tab %s", self.notebook.tab(tab_frame, 'text'))
+
+    def unload_others(self, frame):
+        for key in list(self._built):
+            if key != str(frame):
+                self.unload(key)
+
+    def show(self, frame):
+        if not frame:
+            return
+        self.ensure(frame)
+        if self.unload_hidden:
+            self.unload_others(frame)
+
+    def build_all(self):
+        for key in self._tabs:
+            self.ensure(key)
+
+    def widget(self, gui, name):
+        """gui.<name>, building the tab that creates it first if needed; None if no tab does."""
+        widget = getattr(gui, name, None)
+        if (widget is None or not widget.winfo_exists()) and name in self._providers:
+            self.ensure(self._providers[name])
+            widget = getattr(gui, name, None)
+        return widget
+
+def create_modifier_gui(frame, pos_vars, target_vars, title_prefix, gui):
+    scrollable_frame = create_scrollable_frame(frame)
 
     tk.Label(scrollable_frame, text=f"{title_prefix} Modifier", font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#333333').grid(row=0, column=0, columnspan=5, pady=5, sticky="w")
     tk.Label(scrollable_frame, text="Position Move", font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333333').grid(row=1, column=0, columnspan=5, pady=2, sticky="w")
@@ -54,24 +141,7 @@ def create_modifier_gui(frame, pos_vars, target_vars, title_prefix, gui):
     tk.Label(scrollable_frame, text=f"Press set keybind to take coordinates from command and automatically update clipboard with result. Works with: setblock, summon, tp.", font=("Arial", 8), bg='#f0f0f0').grid(row=13, column=0, columnspan=5, pady=2, sticky="w")
 
 def create_change_block_gui(frame, gui):
-    canvas = tk.Canvas(frame)
-    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = ttk.Frame(canvas)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
-
-    canvas.grid(row=0, column=0, sticky="nsew")
-    scrollbar.grid(row=0, column=1, sticky="ns")
-
-    frame.columnconfigure(0, weight=1)
-    frame.rowconfigure(0, weight=1)
+    scrollable_frame = create_scrollable_frame(frame)
 
     tk.Label(scrollable_frame, text="Change Block Modifier", font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#333333').grid(row=0, column=0, columnspan=3, pady=5, sticky="w")
     tk.Label(scrollable_frame, text="New Block Text:", font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333333').grid(row=1, column=0, pady=0, sticky="w")
@@ -85,24 +155,7 @@ def create_change_block_gui(frame, gui):
     tk.Label(scrollable_frame, text=f"Press set keybind to take coordinates from command and automatically update clipboard with result. Works with: setblock, summon, tp.", font=("Arial", 8), bg='#f0f0f0').grid(row=5, column=0, columnspan=3, pady=2, sticky="w")
 
 def create_generate_laser_gui(frame, gui):
-    canvas = tk.Canvas(frame)
-    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = ttk.Frame(canvas)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
-
-    canvas.grid(row=0, column=0, sticky="nsew")
-    scrollbar.grid(row=0, column=1, sticky="ns")
-
-    frame.columnconfigure(0, weight=1)
-    frame.rowconfigure(0, weight=1)
+    scrollable_frame = create_scrollable_frame(frame)
 
     tk.Label(scrollable_frame, text="Generate Laser", font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#333333').grid(row=0, column=0, columnspan=3, pady=5, sticky="w")
     for i, (label, var) in enumerate([("X Coordinate:", gui.laser_x), ("Y Coordinate:", gui.laser_y), ("Z Coordinate:", gui.laser_z), ("Tag/Group Name:", gui.laser_tag), ("Block Type:", gui.laser_block), ("Length:", gui.laser_length)]):
@@ -129,24 +182,7 @@ def create_generate_laser_gui(frame, gui):
     tk.Label(scrollable_frame, text=f"Press set keybind to take coordinates from command and automatically update clipboard with result. Works with: setblock, summon, tp.", font=("Arial", 8), bg='#f0f0f0').grid(row=16, column=0, columnspan=3, pady=2, sticky="w")
 
 def create_generate_end_beam_gui(frame, gui):
-    canvas = tk.Canvas(frame)
-    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = ttk.Frame(canvas)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
-
-    canvas.grid(row=0, column=0, sticky="nsew")
-    scrollbar.grid(row=0, column=1, sticky="ns")
-
-    frame.columnconfigure(0, weight=1)
-    frame.rowconfigure(0, weight=1)
+    scrollable_frame = create_scrollable_frame(frame)
 
     tk.Label(scrollable_frame, text="Generate End Beam", font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#333333').grid(row=0, column=0, columnspan=2, pady=5, sticky="w")
     tk.Label(scrollable_frame, text="Origin:", font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333333').grid(row=1, column=0, columnspan=2, pady=2, sticky="w")
@@ -176,29 +212,29 @@ def create_generate_end_beam_gui(frame, gui):
     tk.Label(scrollable_frame, text=f"Press set keybind to take coordinates from command and automatically update clipboard with result. Works with: setblock, summon, tp.", font=("Arial", 8), bg='#f0f0f0').grid(row=16, column=0, columnspan=3, pady=2, sticky="w")
 
 def create_settings_gui(frame, gui):
-    canvas = tk.Canvas(frame)
-    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = ttk.Frame(canvas)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
-
-    canvas.grid(row=0, column=0, sticky="nsew")
-    scrollbar.grid(row=0, column=1, sticky="ns")
-
-    frame.columnconfigure(0, weight=1)
-    frame.rowconfigure(0, weight=1)
+    scrollable_frame = create_scrollable_frame(frame)
 
     tk.Checkbutton(scrollable_frame, text="Always Remains on Top", variable=gui.always_on_top, command=gui.toggle_always_on_top, bg='#f0f0f0', font=("Arial", 10)).grid(row=0, column=0, pady=5, sticky="w")
     tk.Button(scrollable_frame, text="Press key to record keybind", command=gui.start_record_keybind, bg='#4CAF50', fg='#ffffff', font=("Arial", 10)).grid(row=1, column=0, pady=5, sticky="w")
     tk.Button(scrollable_frame, text="Generate 3D Model, Work in Progress", command=gui.on_closing, state="disabled", bg='#cccccc', fg='#666666', font=("Arial", 10)).grid(row=2, column=0, pady=5, sticky="w")
     tk.Button(scrollable_frame, text="Generate 2D Model, Work in Progress", command=gui.on_closing, state="disabled", bg='#cccccc', fg='#666666', font=("Arial", 10)).grid(row=3, column=0, pady=5, sticky="w")
+    tk.Checkbutton(scrollable_frame, text="Rewrite commands automatically when copied", variable=gui.watch_clipboard, command=gui.toggle_clipboard_watch, bg='#f0f0f0', font=("Arial", 10)).grid(row=4, column=0, pady=5, sticky="w")
+    cache_frame = tk.Frame(scrollable_frame, bg='#f0f0f0')
+    cache_frame.grid(row=5, column=0, pady=5, sticky="w")
+    tk.Label(cache_frame, text="Rewrite cache size:", font=("Arial", 10), bg='#f0f0f0').pack(side="left")
+    tk.Entry(cache_frame, textvariable=gui.cache_size, width=6, bg='#ffffff', font=("Arial", 10)).pack(side="left", padx=2)
+    tk.Button(cache_frame, text="Apply", command=gui.apply_cache_size, font=("Arial", 8)).pack(side="left", padx=2)
+    tk.Button(cache_frame, text="Clear", command=gui.clear_rewrite_cache, font=("Arial", 8)).pack(side="left", padx=2)
+    tk.Label(scrollable_frame, textvariable=gui.cache_stats, font=("Arial", 8), bg='#f0f0f0', fg='#555555').grid(row=6, column=0, pady=2, sticky="w")
+    tk.Checkbutton(scrollable_frame, text="Free hidden tabs to save memory", variable=gui.unload_hidden_tabs, command=gui.toggle_unload_hidden_tabs, bg='#f0f0f0', font=("Arial", 10)).grid(row=7, column=0, pady=5, sticky="w")
+
+    # Diagnostics: rolling per-stage latencies of the rewrite pipeline
+    tk.Label(scrollable_frame, text="Diagnostics", font=("Arial", 12, "bold"), bg='#f0f0f0', fg='#333333').grid(row=8, column=0, pady=2, sticky="w")
+    tk.Label(scrollable_frame, textvariable=gui.timing_stats, font=("Courier", 8), bg='#f0f0f0', fg='#555555', justify="left").grid(row=9, column=0, pady=2, sticky="w")
+    diagnostics_frame = tk.Frame(scrollable_frame, bg='#f0f0f0')
+    diagnostics_frame.grid(row=10, column=0, pady=5, sticky="w")
+    tk.Button(diagnostics_frame, text="Export JSON", command=gui.export_stage_timings, font=("Arial", 8)).pack(side="left", padx=2)
+    tk.Button(diagnostics_frame, text="Reset", command=gui.reset_stage_timings, font=("Arial", 8)).pack(side="left", padx=2)
 
 def create_terminal_gui(frame, gui):
     if not hasattr(gui, 'terminal_text') or not gui.terminal_text.winfo_exists():
@@ -217,6 +253,7 @@ def create_terminal_gui(frame, gui):
         gui.terminal_text.tag_configure("normal", foreground="#ffffff")
         gui.terminal_text.tag_configure("block_changed", foreground="#00ff00")
         gui.terminal_text.tag_configure("block_unchanged", foreground="#ffffff")
+        gui.terminal = TerminalBuffer(gui.terminal_text, gui.settings.get("terminal_max_lines", DEFAULT_MAX_LINES))
         gui.terminal_instruction = tk.Label(frame, text=f"Copy a command, press set keybind to process.", font=("Normal", 10), bg='#f0f0f0', fg='#555555')
         gui.terminal_instruction.pack_forget()
 
@@ -225,43 +262,7 @@ def create_terminal_gui(frame, gui):
         gui.terminal_button.pack(pady=5)
 
 def create_rename_tag_gui(frame, gui):
-    canvas = tk.Canvas(frame)
-    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
-    scrollable_frame = ttk.Frame(canvas)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
-
-    canvas.grid(row=0, column=0, sticky="nsew")
-    scrollbar.grid(row=0, column=1, sticky="ns")
-
-    frame.columnconfigure(0, weight=1)
-    frame.rowconfigure(0, weight=1)
-
-    # Initialize variables
-    gui.modify_coords = tk.BooleanVar(value=True)
-    gui.modify_translation = tk.BooleanVar(value=True)
-    gui.modify_scale = tk.BooleanVar(value=True)
-    gui.modify_centering = tk.BooleanVar(value=True)
-    gui.laser_mode = tk.StringVar(value="")
-    gui.pos_x_set = tk.StringVar(value="0.0")
-    gui.pos_y_set = tk.StringVar(value="0.5")
-    gui.pos_z_set = tk.StringVar(value="0.999999")
-    gui.trans_x = tk.StringVar(value="0.5")
-    gui.trans_y = tk.StringVar(value="0.0")
-    gui.trans_z = tk.StringVar(value="0.0")
-    gui.beam_scale = tk.StringVar(value="-150.0")
-    gui.centering_x = tk.StringVar(value="0.0")
-    gui.centering_y = tk.StringVar(value="0.5")
-    gui.centering_z = tk.StringVar(value="0.999999")
-    gui.tag_text = tk.StringVar(value="beam1")
-    gui.block_text = tk.StringVar(value="minecraft:lime_concrete")
+    scrollable_frame = create_scrollable_frame(frame)
 
     tk.Label(scrollable_frame, text="Rename Tag/Group Modifier", font=("Arial", 16, "bold"), bg='#f0f0f0', fg='#333333').grid(row=0, column=0, columnspan=3, pady=5, sticky="w")
 
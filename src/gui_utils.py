@@ -1,9 +1,12 @@
 # Updated on 09:40 PM CDT, Monday, July 07, 2025
 import logging
-import pyperclip
 import tkinter as tk
 from tkinter import ttk
-from src.command_modifier import process_command, set_laser_preset, set_lightbeam_preset
+from src.clipboard_parser import read_clipboard
+from src.command_modifier import process_command, set_laser_preset, set_lightbeam_preset, copy_result
+from src.stage_timings import timed
+
+logger = logging.getLogger(__name__)
 
 def adjust_offset(offset_var, change):
     try:
@@ -11,17 +14,62 @@ def adjust_offset(offset_var, change):
         offset_var.set(str(current + change))
     except ValueError:
         offset_var.set(str(change))
-    logging.debug(f"Adjusted offset: {offset_var.get()}")
+    logger.debug("Adjusted offset: %s", offset_var.get())
 
 def toggle_always_on_top(gui):
     gui.root.attributes('-topmost', gui.always_on_top.get())
-    logging.debug(f"Always on top set to: {gui.always_on_top.get()}")
+    gui.settings["always_on_top"] = gui.always_on_top.get()
+    logger.debug("Always on top set to: %s", gui.always_on_top.get())
+
+# Tab fields whose last values are kept in the settings; the offset lists are stored per index
+PERSISTED_TAB_VARIABLES = (
+    "pos_vars", "target_vars",
+    "laser_x", "laser_y", "laser_z", "laser_tag", "laser_block", "laser_length", "laser_rot_x", "laser_rot_y",
+    "origin_x", "origin_y", "origin_z", "target_x", "target_y", "target_z",
+    "modify_coords", "modify_translation", "modify_scale", "modify_centering", "laser_mode",
+    "pos_x_set", "pos_y_set", "pos_z_set", "trans_x", "trans_y", "trans_z", "beam_scale",
+    "centering_x", "centering_y", "centering_z", "tag_text", "block_text",
+)
+
+def _tab_variables(gui):
+    for name in PERSISTED_TAB_VARIABLES:
+        var = getattr(gui, name)
+        if isinstance(var, list):
+            for index, item in enumerate(var):
+                yield f"{name}.{index}", item
+        else:
+            yield name, var
+
+def restore_tab_values(gui):
+    """Put the saved tab values back into the GUI's variables.
+
+    Runs once at startup on the variables the GUI owns, whichever tabs exist
+    yet; tabs built later on first selection show the restored values.
+    """
+    saved = gui.settings.get("tab_values", {})
+    for name, var in _tab_variables(gui):
+        if name in saved:
+            try:
+                var.set(saved[name])
+            except tk.TclError:
+                logger.warning("Ignoring saved value %r for %s", saved[name], name)
+
+def track_tab_values(gui):
+    """Record every change to a tab field in the settings; the store batches the writes."""
+    def on_write(name, var):
+        try:
+            gui.settings.set_tab_value(name, var.get())
+        except tk.TclError:
+            # e.g. a BooleanVar briefly holding an empty string
+            pass
+    for name, var in _tab_variables(gui):
+        var.trace_add("write", lambda *_, name=name, var=var: on_write(name, var))
 
 def start_record_keybind(gui):
     gui.is_recording_key = True
     gui.key_bind.set("Press a key...")
     gui.root.bind("<Key>", lambda event: gui.record_keybind(event))
-    logging.debug("Started recording keybind")
+    logger.debug("Started recording keybind")
 
 def record_keybind(gui, event):
     if gui.is_recording_key:
@@ -31,20 +79,90 @@ def record_keybind(gui, event):
             gui.root.unbind("<Key>")
             gui.is_recording_key = False
             gui.root.bind(key, lambda e: gui.process_clipboard())
-            from src.settings import save_settings
             gui.settings["key_bind"] = key
-            save_settings(gui.settings)
             gui.update_keybind_notes()
-            logging.debug(f"Recorded keybind: {key}")
+            logger.debug("Recorded keybind: %s", key)
+
+def toggle_clipboard_watch(gui):
+    if gui.watch_clipboard.get():
+        gui.clipboard_watcher.start()
+    else:
+        gui.clipboard_watcher.stop()
+    gui.settings["watch_clipboard"] = gui.watch_clipboard.get()
+    logger.debug("Clipboard watch mode set to: %s", gui.watch_clipboard.get())
+
+def toggle_unload_hidden_tabs(gui):
+    gui.tabs.unload_hidden = gui.unload_hidden_tabs.get()
+    if gui.tabs.unload_hidden:
+        gui.tabs.unload_others(gui.notebook.select())
+    gui.settings["unload_hidden_tabs"] = gui.tabs.unload_hidden
+    logger.debug("Unload hidden tabs set to: %s", gui.tabs.unload_hidden)
+
+def apply_cache_size(gui):
+    try:
+        size = int(gui.cache_size.get())
+        if size < 0:
+            raise ValueError(size)
+    except ValueError:
+        gui.cache_size.set(str(gui.rewrite_cache.maxsize))
+        gui.print_to_text("Error: Cache size must be a whole number of 0 or more.", "normal")
+        return
+    gui.rewrite_cache.resize(size)
+    gui.settings["rewrite_cache_size"] = size
+    gui.cache_stats.set(gui.rewrite_cache.stats())
+    logger.debug("Rewrite cache size set to: %s", size)
+
+def clear_rewrite_cache(gui):
+    gui.rewrite_cache.clear()
+    gui.cache_stats.set(gui.rewrite_cache.stats())
+    logger.debug("Rewrite cache cleared")
+
+def reset_stage_timings(gui):
+    gui.stage_timings.clear()
+    gui.timing_stats.set(gui.stage_timings.report())
+    logger.debug("Stage timings reset")
+
+def export_stage_timings(gui):
+    from tkinter import filedialog
+    path = filedialog.asksaveasfilename(parent=gui.root, title="Export stage timings", defaultextension=".json",
+                                        initialfile="stage_timings.json", filetypes=[("JSON", "*.json")])
+    if not path:
+        return
+    try:
+        gui.stage_timings.dump(path)
+    except OSError as e:
+        gui.print_to_text(f"Error: Could not export timings: {e}", "normal")
+        return
+    gui.print_to_text(f"Exported stage timings to {path}", "normal")
+    logger.debug("Stage timings exported to %s", path)
+
+def refresh_cache_stats(gui):
+    """Keep the Settings tab's cache counters and timing table current; set only when they changed."""
+    if gui.is_destroyed:
+        return
+    stats = gui.rewrite_cache.stats()
+    if stats != gui.cache_stats.get():
+        gui.cache_stats.set(stats)
+    # Percentiles sort every stage's window, so only while the Settings tab is on screen
+    if gui.notebook.select() == str(gui.settings_frame):
+        report = gui.stage_timings.report()
+        if report != gui.timing_stats.get():
+            gui.timing_stats.set(report)
+    gui.root.after(1000, lambda: refresh_cache_stats(gui))
 
 def update_keybind_notes(gui):
     pass
 
 def process_clipboard(gui):
+    with timed(getattr(gui, "stage_timings", None), "process_clipboard"):
+        _process_clipboard(gui)
+
+def _process_clipboard(gui):
     try:
         active_tab = gui.notebook.tab(gui.notebook.select(), "text").lower()
-        logging.debug(f"Processing clipboard for tab: {active_tab}")
-        clipboard_content = pyperclip.paste().strip()
+        logger.debug("Processing clipboard for tab: %s", active_tab)
+        with timed(getattr(gui, "stage_timings", None), "clipboard read"):
+            clipboard_content = read_clipboard().strip()
 
         if active_tab == "generate laser":
             # Generate laser command with fixed decimal parts
@@ -54,11 +172,11 @@ def process_clipboard(gui):
                     gui.laser_x.set(str(int(float(coords[0]))))
                     gui.laser_y.set(str(int(float(coords[1]))))
                     gui.laser_z.set(str(int(float(coords[2]))))
-                    logging.debug(f"Autofilled integer coordinates: {coords}")
+                    logger.debug("Autofilled integer coordinates: %s", coords)
                     gui.print_to_text(f"Autofilled integer coordinates from clipboard: {[str(int(float(coord))) for coord in coords]}", "coord")
                 gui.generate_laser_initial_commands()
             except ValueError as e:
-                logging.error(f"Error processing clipboard: {e}")
+                logger.error("Error processing clipboard: %s", e)
                 gui.print_to_text(f"Error: Invalid clipboard format. Use '/summon minecraft:block_display 0.0 0.0 0.0' or 'X Y Z' format.", "normal")
         elif active_tab == "generate end beam":
             try:
@@ -70,17 +188,17 @@ def process_clipboard(gui):
                     gui.target_x.set(coords[0])
                     gui.target_y.set(coords[1])
                     gui.target_z.set(coords[2])
-                    logging.debug(f"Autofilled coordinates: {coords}")
+                    logger.debug("Autofilled coordinates: %s", coords)
                     gui.print_to_text(f"Autofilled coordinates from clipboard: {coords}", "coord")
                 gui.generate_end_beam_commands()
             except ValueError as e:
-                logging.error(f"Error processing clipboard: {e}")
+                logger.error("Error processing clipboard: %s", e)
                 gui.print_to_text(f"Error: Invalid clipboard format. Use '/summon minecraft:block_display 0.0 0.0 0.0' or 'X Y Z' format.", "normal")
         else:
             modified_command = process_command(gui, clipboard_content)
             gui.copy_to_clipboard(modified_command)
     except Exception as e:
-        logging.error(f"Error processing clipboard: {e}")
+        logger.error("Error processing clipboard: %s", e)
         gui.print_to_text(f"Error processing clipboard: {e}", "normal")
 
 def generate_laser_initial_commands(gui):
@@ -109,10 +227,10 @@ def generate_laser_initial_commands(gui):
             gui.laser_cmd_text.delete("1.0", tk.END)
             gui.laser_cmd_text.insert("1.0", command)
         gui.copy_to_clipboard(command)
-        logging.debug(f"Generated laser command: {command}")
+        logger.debug("Generated laser command: %s", command)
         gui.print_to_text(f"Generated Command: {command}", "command")
     except ValueError as e:
-        logging.error(f"Error generating laser command: {e}")
+        logger.error("Error generating laser command: %s", e)
         gui.print_to_text("Error: Please enter valid numbers for coordinates and length.", "normal")
 
 def generate_laser_rotation_commands(gui):
@@ -125,10 +243,10 @@ def generate_laser_rotation_commands(gui):
             gui.laser_rot_cmd_text.delete("1.0", tk.END)
             gui.laser_rot_cmd_text.insert("1.0", command)
         gui.copy_to_clipboard(command)
-        logging.debug(f"Generated rotation command: {command}")
+        logger.debug("Generated rotation command: %s", command)
         gui.print_to_text(f"Generated Rotation Command: {command}", "command")
     except ValueError as e:
-        logging.error(f"Error generating rotation command: {e}")
+        logger.error("Error generating rotation command: %s", e)
         gui.print_to_text("Error: Please enter valid numbers for rotation.", "normal")
 
 def generate_end_beam_commands(gui):
@@ -148,10 +266,10 @@ def generate_end_beam_commands(gui):
             gui.end_beam_cmd_text.delete("1.0", tk.END)
             gui.end_beam_cmd_text.insert("1.0", command)
         gui.copy_to_clipboard(command)
-        logging.debug(f"Generated end beam commands: {command}")
+        logger.debug("Generated end beam commands: %s", command)
         gui.print_to_text(f"Generated Commands:\n{command}", "command")
     except ValueError as e:
-        logging.error(f"Error generating end beam commands: {e}")
+        logger.error("Error generating end beam commands: %s", e)
         gui.print_to_text("Error: Please enter valid numbers for coordinates.", "normal")
 
 def toggle_terminal(gui):
@@ -160,30 +278,30 @@ def toggle_terminal(gui):
         gui.terminal_frame.pack(fill="both", expand=True)
     else:
         gui.terminal_frame.pack_forget()
-    logging.debug(f"Terminal visibility set to: {gui.terminal_visible}")
+    logger.debug("Terminal visibility set to: %s", gui.terminal_visible)
 
 def print_to_text(gui, message, tags="normal"):
-    if hasattr(gui, 'terminal_text') and gui.terminal_text.winfo_exists():
-        gui.terminal_text.insert(tk.END, message + "\n", tags)
-        gui.terminal_text.see(tk.END)
-    logging.debug(f"Printed to terminal: {message}")
+    # Queued and flushed to the widget once per Tk idle cycle; see TerminalBuffer
+    if hasattr(gui, 'terminal'):
+        gui.terminal.write(message, tags)
+    logger.debug("Printed to terminal: %s", message)
 
 def on_closing(gui):
     if not gui.is_destroyed:
         gui.is_destroyed = True
-        from src.settings import save_settings
-        save_settings(gui.settings)
+        # Writes whatever the debounced writer has not saved yet
+        gui.settings.close()
         gui.root.destroy()
-        logging.debug("Application closed")
+        logger.debug("Application closed")
 
 def show_window(gui):
     gui.root.deiconify()
-    logging.debug("Window shown")
+    logger.debug("Window shown")
 
 def show_settings(gui):
     gui.notebook.select(gui.settings_frame)
-    logging.debug("Settings tab selected")
+    logger.debug("Settings tab selected")
 
 def copy_to_clipboard(gui, command):
-    pyperclip.copy(command.encode('utf-8').decode('utf-8'))
+    copy_result(gui, command)
     gui.print_to_text("Command copied to clipboard.", "normal")
\ No newline at end of file
@@ -2,34 +2,37 @@
 import logging
 import tkinter as tk
 from src.command_processor import CommandProcessor
-from src.gui_main import CommandModifierGUI
+from src.settings import load_settings
 from src.utils import setup_logging, cleanup
 
+logger = logging.getLogger(__name__)
+
 def main():
     try:
-        setup_logging()  # Configure logging
-        logging.info("Application started (F12 clipboard mode with GUI)")
+        setup_logging(**load_settings()["logging"])  # Configure logging
+        logger.info("Application started (F12 clipboard mode with GUI)")
 
         # Initialize Tkinter root
         root = tk.Tk()
 
-        # Initialize CommandProcessor
+        # Arm the hotkey first; presses made while the GUI loads are handled once it is attached
         command_processor = CommandProcessor()
         if not hasattr(command_processor, 'set_gui'):
-            logging.error("CommandProcessor does not have set_gui method")
+            logger.error("CommandProcessor does not have set_gui method")
             raise AttributeError("CommandProcessor missing set_gui method")
 
-        # Initialize GUI
+        # Initialize GUI (imported here so the hook above is live while the tab modules load)
+        from src.gui_main import CommandModifierGUI
         gui = CommandModifierGUI(root)
         command_processor.set_gui(gui)
 
         # Run the application
         root.mainloop()
     except Exception as e:
-        logging.error(f"Application crashed: {str(e)}", exc_info=True)
+        logger.error("Application crashed: %s", e, exc_info=True)
         raise
     finally:
-        logging.info("Application shutdown completed")
+        logger.info("Application shutdown completed")
         cleanup()  # Clean up logging handlers
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+import collections
+import contextlib
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.batch_rewrite import DEFAULT_CHUNK_SIZE, BatchRewriter, open_output
+
+logger = logging.getLogger(__name__)
+
+# Chunks submitted ahead of the one being written, per worker; bounds memory on huge datapacks
+_CHUNKS_IN_FLIGHT_PER_WORKER = 4
+
+_worker_rewriter = None
+
+
+def _init_worker(active_tab: str, values: Dict, offsets, setblock_block: Optional[str]):
+    global _worker_rewriter
+    _worker_rewriter = BatchRewriter(active_tab, values, offsets, setblock_block)
+
+
+def _rewrite_chunk(path: str, first_number: int, lines: List[str]) -> Tuple[List[str], int, int, int]:
+    """Worker side: rewrite one chunk and return it with its line, changed and error counts."""
+    return _rewrite_with(_worker_rewriter, path, first_number, lines)
+
+
+def _rewrite_with(rewriter: BatchRewriter, path: str, first_number: int, lines: List[str]) -> Tuple[List[str], int, int, int]:
+    rewriter.lines = rewriter.changed = rewriter.errors = 0
+    rewritten = list(rewriter.rewrite_lines(lines, path, first_number))
+    return rewritten, rewriter.lines, rewriter.changed, rewriter.errors
+
+
+def iter_chunks(paths: List[str], chunk_size: int) -> Iterator[Tuple[int, int, List[str]]]:
+    """Split files into (file index, first line number, lines) ranges of at most chunk_size lines; every file yields at least one chunk."""
+    for index, path in enumerate(paths):
+        chunk = []
+        first_number = 1
+        emitted = False
+        with open(path, "r", encoding="utf-8") as src:
+            for line in src:
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield index, first_number, chunk
+                    emitted = True
+                    first_number += len(chunk)
+                    chunk = []
+        if chunk or not emitted:
+            yield index, first_number, chunk
+
+
+class RewriteStats:
+    def __init__(self, workers: int, files: int, lines: int, changed: int, elapsed: float, errors: int = 0):
+        self.workers = workers
+        self.files = files
+        self.lines = lines
+        self.changed = changed
+        self.elapsed = elapsed
+        self.errors = errors
+
+    @property
+    def lines_per_sec(self) -> float:
+        return self.lines / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def __str__(self):
+        errors = f", {self.errors} left unchanged after errors" if self.errors else ""
+        return (f"{self.workers} worker(s): {self.files} file(s), {self.lines} lines, {self.changed} changed{errors} "
+                f"in {self.elapsed:.3f}s ({self.lines_per_sec:,.0f} lines/sec)")
+
+
+class ParallelRewriter:
+    """Shards files into line-range chunks, rewrites them on a process pool and writes results back in input order."""
+
+    def __init__(self, active_tab: str, values: Dict, offsets=None, setblock_block: Optional[str] = None,
+                 workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.rewriter_args = (active_tab, values, offsets, setblock_block)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def rewrite_files(self, files: List[Tuple[str, Optional[str]]], discard: bool = False) -> RewriteStats:
+        """Rewrite (input path, output path) pairs; an output path of None writes to stdout.
+
+        With discard the rewritten lines are dropped, which is what the throughput comparison uses.
+        """
+        start = time.perf_counter()
+        paths = [path for path, _ in files]
+        if self.workers == 1:
+            results = self._rewrite_sequential(paths)
+        else:
+            results = self._rewrite_parallel(paths)
+        lines, changed, errors = self._write_results(files, results, discard)
+        stats = RewriteStats(self.workers, len(files), lines, changed, time.perf_counter() - start, errors)
+        logger.debug("Parallel rewrite finished: %s", stats)
+        return stats
+
+    def _rewrite_sequential(self, paths: List[str]) -> Iterator[Tuple[int, Tuple[List[str], int, int, int]]]:
+        rewriter = BatchRewriter(*self.rewriter_args)
+        for index, first_number, chunk in iter_chunks(paths, self.chunk_size):
+            yield index, _rewrite_with(rewriter, paths[index], first_number, chunk)
+
+    def _rewrite_parallel(self, paths: List[str]) -> Iterator[Tuple[int, Tuple[List[str], int, int, int]]]:
+        max_in_flight = self.workers * _CHUNKS_IN_FLIGHT_PER_WORKER
+        pending = collections.deque()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=self.rewriter_args) as executor:
+            for index, first_number, chunk in iter_chunks(paths, self.chunk_size):
+                pending.append((index, executor.submit(_rewrite_chunk, paths[index], first_number, chunk)))
+                # Results are consumed oldest first, so output order matches input order
+                if len(pending) >= max_in_flight:
+                    index, future = pending.popleft()
+                    yield index, future.result()
+            while pending:
+                index, future = pending.popleft()
+                yield index, future.result()
+
+    def _write_results(self, files, results, discard: bool) -> Tuple[int, int, int]:
+        total_lines = total_changed = total_errors = 0
+        # Chunks arrive in input order, so each file's chunks are contiguous
+        for index, file_results in itertools.groupby(results, key=lambda result: result[0]):
+            with contextlib.nullcontext() if discard else open_output(files[index][1]) as dst:
+                for _, (rewritten, lines, changed, errors) in file_results:
+                    if dst is not None:
+                        dst.writelines(rewritten)
+                    total_lines += lines
+                    total_changed += changed
+                    total_errors += errors
+        return total_lines, total_changed, total_errors
+
+
+def compare_throughput(files: List[Tuple[str, Optional[str]]], active_tab: str, values: Dict, offsets=None,
+                       setblock_block: Optional[str] = None, workers: Optional[int] = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[RewriteStats]:
+    """Rewrite the same files on one core and on `workers` cores without writing output; returns both stats."""
+    single = ParallelRewriter(active_tab, values, offsets, setblock_block, 1, chunk_size).rewrite_files(files, discard=True)
+    multi = ParallelRewriter(active_tab, values, offsets, setblock_block, workers, chunk_size).rewrite_files(files, discard=True)
+    return [single, multi]
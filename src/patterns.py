@@ -0,0 +1,72 @@
+import re
+
+# Regular expressions shared by the rewrite engine, clipboard handling and the 3D viewer,
+# compiled once at import. PATTERNS collects them by name for benchmarks.bench_patterns.
+
+_DECIMAL = r'(-?\d+\.?\d*)'
+_FLOAT_F = r'(-?\d+\.?\d*f)'
+_NUMBER = r'(-?\d+(?:\.\d+)?)'
+# A coordinate: absolute, relative (~) or local (^); block coordinates are whole when absolute
+_COORDINATE = r'([~^](?:-?(?:\d+(?:\.\d*)?|\.\d+))?|-?\d+(?:\.\d+)?)'
+_BLOCK_COORDINATE = r'([~^](?:-?(?:\d+(?:\.\d*)?|\.\d+))?|-?\d+)'
+_ANGLE = r'(~(?:-?(?:\d+(?:\.\d*)?|\.\d+))?|-?\d+(?:\.\d+)?)'
+# Whitespace that stays on one line
+_INDENT = r'[^\S\n]*'
+_GAP = r'[^\S\n]+'
+# transformation vectors as the GUI writes them
+_VECTOR3 = r'\[-?\d+\.?\d*f,-?\d+\.?\d*f,-?\d+\.?\d*f\]'
+_VECTOR4 = r'\[-?\d+\.?\d*f,-?\d+\.?\d*f,-?\d+\.?\d*f,-?\d+\.?\d*f\]'
+
+# /summon minecraft:block_display X Y Z -> the three coordinates
+BLOCK_DISPLAY_COORDS = re.compile(rf'/summon minecraft:block_display\s+{_DECIMAL}\s+{_DECIMAL}\s+{_DECIMAL}', re.DOTALL)
+# Tags:["name"] in NBT, and tag=name in a selector
+TAGS_LIST = re.compile(r'Tags:\s*\["([^"]*)"\]', re.DOTALL)
+TAG_SELECTOR = re.compile(r'tag=([^,\s\]]+)', re.DOTALL)
+# translation:[x,y,z] / scale:[x,y,z]; the *_SLOT forms also match empty components, for replacing
+TRANSLATION = re.compile(rf'translation:\s*\[{_FLOAT_F}\s*,\s*{_FLOAT_F}\s*,\s*{_FLOAT_F}\s*\]', re.DOTALL)
+TRANSLATION_SLOT = re.compile(rf'translation:\s*\[{_FLOAT_F}?\s*,\s*{_FLOAT_F}?\s*,\s*{_FLOAT_F}?\s*\]', re.DOTALL)
+SCALE = re.compile(rf'scale:\s*\[{_FLOAT_F}\s*,\s*{_FLOAT_F}\s*,\s*{_FLOAT_F}\s*\]', re.DOTALL)
+SCALE_SLOT = re.compile(rf'scale:\s*\[{_FLOAT_F}?\s*,\s*{_FLOAT_F}?\s*,\s*{_FLOAT_F}?\s*\]', re.DOTALL)
+BLOCK_STATE_NAME = re.compile(r'block_state:{Name:"([^"]+)"}')
+# A block_display summon exactly as the Generate button writes it: one flat payload with a
+# single Tags, translation and scale, which the pattern rewrites handle as the parser does
+GENERATED_LASER = re.compile(r'/summon minecraft:block_display -?\d+\.?\d* -?\d+\.?\d* -?\d+\.?\d* '
+                             rf'\{{block_state:\{{Name:"[^"]*"\}},transformation:\{{translation:{_VECTOR3},scale:{_VECTOR3},'
+                             rf'left_rotation:{_VECTOR4},right_rotation:{_VECTOR4}\}},'
+                             r'brightness:\d+,shadow:\w+,billboard:"\w+",Tags:\["[^"]*"\]\}')
+
+# Integer coordinate commands handled by modify_coordinates (end_crystal summons are scanned by
+# command_parser.find_end_crystal_summon, which cannot backtrack)
+INTEGER = re.compile(r'-?\d+\b')
+SIGNED_DIGITS = re.compile(r'-?\d+')
+INTEGER_TRIPLE = re.compile(r'-?\d+(?:\s*-?\d+){2}')
+SETBLOCK_COMMAND = re.compile(rf'(setblock\s+){_BLOCK_COORDINATE}(\s+){_BLOCK_COORDINATE}(\s+){_BLOCK_COORDINATE}(\s+(minecraft:\w+|\w+))')
+# tp/teleport [target] X Y Z [yaw pitch], also after "execute ... run"
+TELEPORT_COMMAND = re.compile(rf'(\b(?:tp|teleport)\s+(?:@[a-z](?:\[[^\]]*\])?\s+|(?![\d~^-])\w+\s+)?)'
+                              rf'{_COORDINATE}(\s+){_COORDINATE}(\s+){_COORDINATE}(?:(\s+){_ANGLE}(\s+){_ANGLE})?(?!\S)')
+KILL_SELECTOR = re.compile(r'(kill @e\[[^]]*x=)(-?\d+)([^,]*,\s*y=)(-?\d+)([^,]*,\s*z=)(-?\d+)([^]]*\])')
+
+# Absolute positions moved by bulk_transform. Each captures (head)(x)(separator)(y)(separator)(z)
+# so re.split lays a whole command file out with a fixed stride; commands must start their line,
+# which bulk_transform ensures by prefixing the text with a newline.
+SETBLOCK_POSITION = re.compile(rf'(\n{_INDENT}/?setblock{_GAP}){_NUMBER}({_GAP}){_NUMBER}({_GAP}){_NUMBER}(?![\w.~^])')
+SUMMON_POSITION = re.compile(rf'(\n{_INDENT}/?summon{_GAP}\S+{_GAP}){_NUMBER}({_GAP}){_NUMBER}({_GAP}){_NUMBER}(?![\w.~^])')
+TELEPORT_POSITION = re.compile(rf'(\n{_INDENT}/?(?:tp|teleport)(?:{_GAP}(?:@[a-z](?:\[[^\]\n]*\])?|\w+))?{_GAP})'
+                               rf'{_NUMBER}({_GAP}){_NUMBER}({_GAP}){_NUMBER}(?![\w.~^])')
+BEAM_TARGET_POSITION = re.compile(rf'(BeamTarget:\{{{_INDENT}X:{_INDENT}){_NUMBER}({_INDENT},{_INDENT}Y:{_INDENT}){_NUMBER}'
+                                  rf'({_INDENT},{_INDENT}Z:{_INDENT}){_NUMBER}(?![\w.])')
+# x=, y= and z= written together in a selector; the lookbehind comes after the literal to keep the scan fast
+SELECTOR_POSITION = re.compile(rf'(x=(?<=[\[,]x=)){_NUMBER}(,y=){_NUMBER}(,z=){_NUMBER}(?![\w.])')
+# dx=, dy= and dz= written together in a selector: the size of its volume
+SELECTOR_VOLUME = re.compile(rf'(dx=(?<=[\[,]dx=)){_NUMBER}(,dy=){_NUMBER}(,dz=){_NUMBER}(?![\w.])')
+# An execute line with the newline before it; bulk_transform sets these aside whole
+EXECUTE_LINE = re.compile(rf'(\n{_INDENT}/?execute\b[^\n]*)')
+
+# Plain "X Y Z" on the clipboard
+RAW_COORDS = re.compile(r'(-?\d+)\s+(-?\d+)\s+(-?\d+)', re.DOTALL)
+# setblock X Y Z <block, states, NBT and mode> in a command dump for the viewer
+SETBLOCK_LINE = re.compile(r'setblock\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(.+)')
+# Clipboard text that watch mode treats as a command
+WATCHABLE_COMMAND = re.compile(r'^\s*/?(summon|setblock|fill|execute|tp|teleport|data|clone)\b')
+
+PATTERNS = {name: value for name, value in globals().items() if isinstance(value, re.Pattern) and not name.startswith('_')}
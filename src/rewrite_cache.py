@@ -0,0 +1,135 @@
+import collections
+import logging
+import threading
+import time
+from typing import Callable, Hashable, Optional, Tuple
+from src.rewrite_engine import modify_coordinates, rewrite_command
+from src.utils import REWRITE_EVENT_LOGGER
+
+# One structured record per rewrite (see utils.setup_logging's jsonl option); disabled unless that is on
+events = logging.getLogger(REWRITE_EVENT_LOGGER)
+
+DEFAULT_CACHE_SIZE = 512
+
+
+def normalize_command(command: str) -> str:
+    """The form the rewrite rules see: surrounding whitespace stripped, leading slash added."""
+    command = command.strip()
+    return command if command.startswith('/') else '/' + command
+
+
+class RewriteCache:
+    """Thread-safe LRU cache of rewrite results with hit/miss counters.
+
+    Keys include everything a result depends on (the normalized command, the
+    tab and the frozen RewriteProfile or coordinate offsets), so a changed GUI
+    variable simply produces new keys; results for the old settings age out
+    of the LRU order. Values must be immutable, since hits hand out the
+    stored object.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        # Computed outside the lock; two threads racing on one key both compute, which is harmless
+        value = compute()
+        if self.maxsize:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = max(0, int(maxsize))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> str:
+        return (f"Rewrite cache: {len(self._entries)}/{self.maxsize} entries, "
+                f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate)")
+
+
+_MISSING = object()
+
+
+def _log_event(event: str, start: float, cache: Optional[RewriteCache], computed: bool, command: str,
+               modified_command: Optional[str], **fields):
+    events.info(event, extra={
+        "event": event,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        "cache": "off" if cache is None else ("miss" if computed else "hit"),
+        "command_length": len(command),
+        "changed": modified_command is not None and modified_command != command,
+        **fields,
+    })
+
+
+def cached_rewrite(cache: Optional[RewriteCache], command: str, active_tab: str, profile) -> Tuple:
+    """rewrite_command through the cache; messages come back as a fresh list."""
+    start = time.perf_counter()
+    command = normalize_command(command)
+    computed = False
+
+    def compute():
+        nonlocal computed
+        computed = True
+        modified_command, messages = rewrite_command(command, active_tab, profile)
+        return modified_command, tuple(messages)
+
+    if cache is None:
+        modified_command, messages = compute()
+    else:
+        modified_command, messages = cache.get_or_compute(("rewrite", command, active_tab, profile), compute)
+    if events.isEnabledFor(logging.INFO):
+        _log_event("rewrite", start, cache, computed, command, modified_command, tab=active_tab, messages=len(messages))
+    return modified_command, list(messages)
+
+
+def cached_modify_coordinates(cache: Optional[RewriteCache], command: str, use_set: bool, pos_values, target_values,
+                              new_block: Optional[str] = None, anchor=None) -> Tuple:
+    """modify_coordinates through the cache; the coordinate list comes back as a fresh list."""
+    start = time.perf_counter()
+    computed = False
+
+    def compute():
+        nonlocal computed
+        computed = True
+        modified_command, coords, block = modify_coordinates(command, use_set, pos_values, target_values, new_block, anchor)
+        return modified_command, tuple(coords), block
+
+    if cache is None:
+        modified_command, coords, block = compute()
+    else:
+        key = ("coordinates", command, use_set, tuple(pos_values), tuple(target_values), new_block, anchor)
+        modified_command, coords, block = cache.get_or_compute(key, compute)
+    if events.isEnabledFor(logging.INFO):
+        _log_event("modify_coordinates", start, cache, computed, command, modified_command, use_set=use_set)
+    return modified_command, list(coords), block
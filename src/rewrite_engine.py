@@ -0,0 +1,538 @@
+import dataclasses
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from src import patterns
+from src.command_parser import (ABSOLUTE, LOCAL, Anchor, Coordinate, find_beam_target, find_end_crystal_summon,
+                                parse_block_display, parse_coordinate, parse_position, resolve_position,
+                                resolve_rotation)
+
+logger = logging.getLogger(__name__)
+
+# Tabs whose rewrite rules live in this module (lower-cased notebook tab text)
+REWRITE_TABS = ("modify laser", "rename tag/group", "change block", "set coordinates")
+
+@dataclass(frozen=True)
+class RewriteProfile:
+    """Immutable snapshot of the rewrite settings (the rewrite StringVars/BooleanVars on CommandModifierGUI).
+
+    Built once per command, or kept current by variable traces, so the rules
+    below never touch Tk and can run on any thread. Numeric fields keep the
+    text the user typed; the rules parse them and report invalid input.
+    """
+    modify_coords: bool = True
+    modify_translation: bool = True
+    modify_scale: bool = True
+    modify_centering: bool = True
+    pos_x_set: str = "0.0"
+    pos_y_set: str = "0.5"
+    pos_z_set: str = "0.999999"
+    trans_x: str = "0.5"
+    trans_y: str = "0.0"
+    trans_z: str = "0.0"
+    beam_scale: str = "-150.0"
+    centering_x: str = "0.0"
+    centering_y: str = "0.5"
+    centering_z: str = "0.999999"
+    # None leaves tags untouched (batch mode without --tag)
+    tag_text: Optional[str] = "beam1"
+    block_text: str = "minecraft:lime_concrete"
+
+    @classmethod
+    def from_values(cls, values: Dict) -> "RewriteProfile":
+        """Profile from a dict keyed like DEFAULT_REWRITE_VALUES; missing keys keep their defaults."""
+        return cls(**{name: values[name] for name in DEFAULT_REWRITE_VALUES if name in values})
+
+    def replace(self, **changes) -> "RewriteProfile":
+        return dataclasses.replace(self, **changes)
+
+
+# Plain-data form of the default profile, for callers that build settings as a dict
+DEFAULT_REWRITE_VALUES = dataclasses.asdict(RewriteProfile())
+
+Messages = List[Tuple[str, str]]
+
+
+def rewrite_command(command: str, active_tab: str, values) -> Tuple[Optional[str], Messages]:
+    """Apply the rewrite rules of a notebook tab to a single command.
+
+    `values` is a RewriteProfile (a dict keyed like DEFAULT_REWRITE_VALUES is
+    converted first). Returns the modified command (None if it could not be
+    generated) and the (message, tag) lines the GUI prints to its terminal.
+    """
+    if not isinstance(values, RewriteProfile):
+        values = RewriteProfile.from_values(values)
+    messages = []
+    # Normalize command
+    if not command.startswith('/'):
+        command = '/' + command
+
+    if active_tab in ("modify laser", "rename tag/group"):
+        modified_command = _rewrite_laser(command, values, messages)
+    elif active_tab == "change block":
+        modified_command = _rewrite_block(command, values, messages)
+    elif active_tab == "set coordinates":
+        modified_command = _rewrite_coordinates(command, values, messages)
+    else:
+        modified_command = command
+    return modified_command, messages
+
+
+def _rewrite_laser(command, values, messages):
+    modified_command = command
+    original_coords = None
+    original_tag = None
+    original_translation = None
+    original_scale = None
+    new_coords = None
+    new_tag = values.tag_text if values.tag_text else "beam1"
+
+    # Get centering offsets
+    try:
+        center_x = float(values.centering_x) if values.centering_x and values.modify_centering else 0.0
+        center_y = float(values.centering_y) if values.centering_y and values.modify_centering else 0.0
+        center_z = float(values.centering_z) if values.centering_z and values.modify_centering else 0.0
+    except ValueError:
+        center_x, center_y, center_z = 0.0, 0.0, 0.0
+        logger.warning("Invalid centering modifier values, using defaults (0.0, 0.0, 0.0)")
+        messages.append(("Warning: Invalid centering values, using defaults (0.0, 0.0, 0.0)", "normal"))
+    center = (center_x, center_y, center_z)
+
+    # If Generate button is clicked with no command or a placeholder, create new command
+    if command == '/' or not command.strip('/'):
+        try:
+            x = float(values.pos_x_set) + center_x if values.modify_coords and values.pos_x_set else 0.0
+            y = float(values.pos_y_set) + center_y if values.modify_coords and values.pos_y_set else 0.5
+            z = float(values.pos_z_set) + center_z if values.modify_coords and values.pos_z_set else 0.999999
+            trans_x = float(values.trans_x) if values.modify_translation and values.trans_x else 0.5
+            trans_y = float(values.trans_y) if values.modify_translation and values.trans_y else 0.0
+            trans_z = float(values.trans_z) if values.modify_translation and values.trans_z else 0.0
+            beam_scale = float(values.beam_scale) if values.modify_scale and values.beam_scale else -150.0
+            tag = values.tag_text if values.tag_text else "beam1"
+            block_type = values.block_text.replace("__", ":") if values.block_text else "minecraft:lime_concrete"
+
+            modified_command = (
+                f'/summon minecraft:block_display {x:.6f} {y:.6f} {z:.6f} '
+                f'{{block_state:{{Name:"{block_type}"}},'
+                f'transformation:{{translation:[{trans_x:.6f}f,{trans_y:.6f}f,{trans_z:.6f}f],'
+                f'scale:[0.1f,0.1f,{beam_scale:.6f}f],'
+                f'left_rotation:[0.0f,0.0f,0.0f,1.0f],'
+                f'right_rotation:[0.0f,0.0f,0.0f,1.0f]}},'
+                f'brightness:15728880,shadow:false,billboard:"fixed",Tags:["{tag}"]}}'
+            )
+            new_coords = [float(f"{x:.6f}"), float(f"{y:.6f}"), float(f"{z:.6f}")]
+            logger.debug("Generated new command: %s", modified_command)
+            messages.append((f"Generated Command: {modified_command}", "command"))
+        except ValueError as e:
+            logger.error("Error generating command: %s", e)
+            messages.append(("Error: Please enter valid numbers for coordinates, translation, and scale.", "normal"))
+            return None
+    elif patterns.GENERATED_LASER.fullmatch(command):
+        # The GUI's own output has one of each field, so the pattern rewrites edit the right
+        # ones and cost less than building the parsed command
+        modified_command, original_coords, original_tag, original_translation, original_scale = _edit_laser_patterns(command, values, center, new_tag, messages)
+    else:
+        try:
+            display = parse_block_display(command)
+        except ValueError as e:
+            logger.debug("Single-pass parse not applicable (%s), using pattern rewrite", e)
+            display = None
+        if display is not None:
+            original_coords, original_tag, original_translation, original_scale = _edit_laser_display(display, values, center, new_tag, messages)
+            modified_command = display.serialize()
+            new_coords = display.coordinates() if display.is_absolute else list(display.position)
+        else:
+            modified_command, original_coords, original_tag, original_translation, original_scale = _edit_laser_patterns(command, values, center, new_tag, messages)
+
+    # Log and report
+    logger.debug("Input Command: %s", command)
+    if original_coords:
+        logger.debug("Original Coordinates: %s", original_coords)
+        messages.append((f"Original Coordinates: {original_coords}", "coord"))
+    if original_tag:
+        logger.debug("Original Tag: %s", original_tag)
+        messages.append((f"Original Tag: {original_tag}", "block_unchanged"))
+    if original_translation:
+        logger.debug("Original Translation: %s", original_translation)
+        messages.append((f"Original Translation: {original_translation}", "block_unchanged"))
+    if original_scale:
+        logger.debug("Original Scale: %s", original_scale)
+        messages.append((f"Original Scale: {original_scale}", "block_unchanged"))
+    logger.debug("Modified Command: %s", modified_command)
+    messages.append((f"Modified Command: {modified_command}", "command"))
+
+    # Safely extract new coordinates
+    if new_coords is None and '/summon' in modified_command:
+        coord_match = patterns.BLOCK_DISPLAY_COORDS.search(modified_command)
+        if coord_match:
+            new_coords = [float(coord_match.group(1)), float(coord_match.group(2)), float(coord_match.group(3))]
+        else:
+            logger.debug("Failed to extract new coordinates due to invalid format")
+            messages.append(("Warning: Failed to extract new coordinates.", "normal"))
+    if new_coords is not None:
+        logger.debug("New Coordinates: %s", new_coords)
+        messages.append((f"New Coordinates: {new_coords}", "modified_coord"))
+
+    if original_tag and new_tag != original_tag:
+        messages.append((f"New Tag: {new_tag}", "block_changed"))
+    if values.modify_translation:
+        try:
+            messages.append((f"New Translation: [{float(values.trans_x):.6f}f,{float(values.trans_y):.6f}f,{float(values.trans_z):.6f}f]", "block_changed"))
+        except ValueError:
+            pass
+    if values.modify_scale:
+        try:
+            messages.append((f"New Scale: [0.1f,0.1f,{float(values.beam_scale):.6f}f]", "block_changed"))
+        except ValueError:
+            pass
+
+    return modified_command
+
+
+def _edit_laser_display(display, values, center, new_tag, messages):
+    """Apply the laser edits to a parsed block_display; the caller serializes it once."""
+    original_tag = None
+    original_translation = None
+    original_scale = None
+    # ~ and ^ positions stay symbolic: there is no executing entity to resolve them against
+    original_coords = display.coordinates() if display.is_absolute else list(display.position)
+    logger.debug("Extracted coordinates: %s", original_coords)
+
+    # Rename the tag; a tag_text of None leaves tags untouched (headless batch runs)
+    tags = display.tags
+    if values.tag_text is not None and len(tags) == 1:
+        original_tag = tags[0]
+        if original_tag != new_tag:
+            display.set_tags([new_tag])
+
+    # Apply coordinate modifications if requested
+    if values.modify_coords and not display.is_absolute:
+        try:
+            sets = (values.pos_x_set, values.pos_y_set, values.pos_z_set)
+            display.set_position([Coordinate(ABSOLUTE, float(value) + offset) if value else coordinate.shifted(offset)
+                                  for value, coordinate, offset in zip(sets, display.position_coordinates, center)])
+        except ValueError as e:
+            logger.warning("Relative coordinates not modified: %s", e)
+            messages.append((f"Warning: Relative coordinates not modified ({e})", "normal"))
+    elif values.modify_coords:
+        try:
+            x = float(values.pos_x_set) + center[0] if values.pos_x_set else original_coords[0] + center[0]
+            y = float(values.pos_y_set) + center[1] if values.pos_y_set else original_coords[1] + center[1]
+            z = float(values.pos_z_set) + center[2] if values.pos_z_set else original_coords[2] + center[2]
+            display.set_coordinates(x, y, z)
+        except ValueError:
+            logger.warning("Invalid coordinate values, skipping coordinate modification")
+            messages.append(("Warning: Invalid coordinate values, skipping coordinate modification", "normal"))
+
+    # Apply translation modifications if requested
+    if values.modify_translation:
+        try:
+            translation = [f"{float(getattr(values, name)):.6f}f" for name in ("trans_x", "trans_y", "trans_z")]
+            vector = display.get_vector("translation")
+            if vector is not None and len(vector) == 3:
+                original_translation = vector
+                display.set_vector("translation", translation)
+        except ValueError:
+            logger.warning("Invalid translation values, skipping translation modification")
+            messages.append(("Warning: Invalid translation values, skipping translation modification", "normal"))
+
+    # Apply scale modifications if requested
+    if values.modify_scale:
+        try:
+            beam_scale = float(values.beam_scale)
+            vector = display.get_vector("scale")
+            if vector is not None and len(vector) == 3:
+                original_scale = vector
+                display.set_vector("scale", ["0.1f", "0.1f", f"{beam_scale:.6f}f"])
+        except ValueError:
+            logger.warning("Invalid scale value, skipping scale modification")
+            messages.append(("Warning: Invalid scale value, skipping scale modification", "normal"))
+
+    return original_coords, original_tag, original_translation, original_scale
+
+
+def _edit_laser_patterns(command, values, center, new_tag, messages):
+    """Pattern-based laser edits for commands the block_display parser does not accept (/execute, /tp, malformed input)."""
+    modified_command = command
+    original_coords = None
+    original_tag = None
+    original_translation = None
+    original_scale = None
+
+    # Extract original coordinates for /summon minecraft:block_display
+    coord_match = patterns.BLOCK_DISPLAY_COORDS.match(command)
+    if coord_match:
+        x, y, z = map(float, coord_match.groups())
+        original_coords = [x, y, z]
+        logger.debug("Extracted coordinates: %s", original_coords)
+
+    # Extract original tag; a tag_text of None leaves tags untouched (headless batch runs)
+    if values.tag_text is None:
+        pass
+    elif 'Tags:' in command:
+        match = patterns.TAGS_LIST.search(command)
+        if match:
+            original_tag = match.group(1)
+            modified_command = patterns.TAGS_LIST.sub(f'Tags:["{new_tag}"]', modified_command)
+    elif command.startswith('/execute') or command.startswith('/tp'):
+        match = patterns.TAG_SELECTOR.search(command)
+        if match:
+            original_tag = match.group(1)
+            modified_command = patterns.TAG_SELECTOR.sub(f'tag={new_tag}', modified_command)
+
+    # Apply coordinate modifications if requested
+    if values.modify_coords and original_coords:
+        try:
+            x = float(values.pos_x_set) + center[0] if values.pos_x_set else original_coords[0] + center[0]
+            y = float(values.pos_y_set) + center[1] if values.pos_y_set else original_coords[1] + center[1]
+            z = float(values.pos_z_set) + center[2] if values.pos_z_set else original_coords[2] + center[2]
+            modified_command = patterns.BLOCK_DISPLAY_COORDS.sub(f'/summon minecraft:block_display {x:.6f} {y:.6f} {z:.6f}', modified_command)
+        except ValueError:
+            logger.warning("Invalid coordinate values, skipping coordinate modification")
+            messages.append(("Warning: Invalid coordinate values, skipping coordinate modification", "normal"))
+
+    # Apply translation modifications if requested
+    if values.modify_translation:
+        try:
+            trans_x = float(values.trans_x)
+            trans_y = float(values.trans_y)
+            trans_z = float(values.trans_z)
+            original_translation = patterns.TRANSLATION.search(command)
+            if original_translation:
+                original_translation = [original_translation.group(1), original_translation.group(2), original_translation.group(3)]
+            modified_command = patterns.TRANSLATION_SLOT.sub(f'translation:[{trans_x:.6f}f,{trans_y:.6f}f,{trans_z:.6f}f]', modified_command)
+        except ValueError:
+            logger.warning("Invalid translation values, skipping translation modification")
+            messages.append(("Warning: Invalid translation values, skipping translation modification", "normal"))
+
+    # Apply scale modifications if requested
+    if values.modify_scale:
+        try:
+            beam_scale = float(values.beam_scale)
+            original_scale = patterns.SCALE.search(command)
+            if original_scale:
+                original_scale = [original_scale.group(1), original_scale.group(2), original_scale.group(3)]
+            modified_command = patterns.SCALE_SLOT.sub(f'scale:[0.1f,0.1f,{beam_scale:.6f}f]', modified_command)
+        except ValueError:
+            logger.warning("Invalid scale value, skipping scale modification")
+            messages.append(("Warning: Invalid scale value, skipping scale modification", "normal"))
+
+    return modified_command, original_coords, original_tag, original_translation, original_scale
+
+
+def _rewrite_block(command, values, messages):
+    modified_command = command
+    original_coords = None
+    original_block = None
+
+    # Extract original coordinates
+    coord_match = patterns.BLOCK_DISPLAY_COORDS.match(command)
+    if coord_match:
+        original_coords = [float(coord_match.group(1)), float(coord_match.group(2)), float(coord_match.group(3))]
+        logger.debug("Extracted coordinates: %s", original_coords)
+
+    # Extract original block state
+    block_match = patterns.BLOCK_STATE_NAME.search(command)
+    if block_match:
+        original_block = block_match.group(1)
+        logger.debug("Extracted original block: %s", original_block)
+
+    # Modify coordinates if requested
+    if values.modify_coords and original_coords:
+        try:
+            x = float(values.pos_x_set) if values.pos_x_set else original_coords[0]
+            y = float(values.pos_y_set) if values.pos_y_set else original_coords[1]
+            z = float(values.pos_z_set) if values.pos_z_set else original_coords[2]
+            modified_command = patterns.BLOCK_DISPLAY_COORDS.sub(f'/summon minecraft:block_display {x:.6f} {y:.6f} {z:.6f}', modified_command)
+        except ValueError:
+            logger.warning("Invalid coordinate values, skipping coordinate modification")
+            messages.append(("Warning: Invalid coordinate values, skipping coordinate modification", "normal"))
+
+    # Modify block state if requested
+    new_block = values.block_text.strip() if values.block_text else (original_block or "minecraft:lime_concrete")
+    if new_block and (not original_block or original_block != new_block):
+        modified_command = patterns.BLOCK_STATE_NAME.sub(f'block_state:{{Name:"{new_block}"}}', modified_command)
+
+    # Log and report
+    messages.append((f"Input Command: {command}", "command"))
+    if original_coords:
+        messages.append((f"Original Coordinates: {original_coords}", "coord"))
+    if original_block:
+        messages.append((f"Original Block: {original_block}", "block_unchanged"))
+    messages.append((f"Modified Command: {modified_command}", "command"))
+    if original_coords:
+        new_coord_match = patterns.BLOCK_DISPLAY_COORDS.search(modified_command)
+        if new_coord_match:
+            new_coords = [float(new_coord_match.group(1)), float(new_coord_match.group(2)), float(new_coord_match.group(3))]
+            logger.debug("New Coordinates: %s", new_coords)
+            messages.append((f"New Coordinates: {new_coords}", "modified_coord"))
+        else:
+            logger.debug("Failed to extract new coordinates due to invalid format")
+            messages.append(("Warning: Failed to extract new coordinates.", "normal"))
+    if original_block and new_block != original_block:
+        messages.append((f"New Block: {new_block}", "block_changed"))
+
+    return modified_command
+
+
+def _rewrite_coordinates(command, values, messages):
+    modified_command = command
+    original_coords = None
+
+    # Extract original coordinates
+    coord_match = patterns.BLOCK_DISPLAY_COORDS.match(command)
+    if coord_match:
+        original_coords = [float(coord_match.group(1)), float(coord_match.group(2)), float(coord_match.group(3))]
+        logger.debug("Extracted coordinates: %s", original_coords)
+
+    # Modify coordinates if requested
+    if values.modify_coords and original_coords:
+        try:
+            x = float(values.pos_x_set) if values.pos_x_set else original_coords[0]
+            y = float(values.pos_y_set) if values.pos_y_set else original_coords[1]
+            z = float(values.pos_z_set) if values.pos_z_set else original_coords[2]
+            modified_command = patterns.BLOCK_DISPLAY_COORDS.sub(f'/summon minecraft:block_display {x:.6f} {y:.6f} {z:.6f}', modified_command)
+            messages.append((f"Original Coordinates: {original_coords}", "coord"))
+            messages.append((f"New Coordinates: [{x:.6f}, {y:.6f}, {z:.6f}]", "modified_coord"))
+        except ValueError:
+            logger.warning("Invalid coordinate values, skipping coordinate modification")
+            messages.append(("Warning: Invalid coordinate values, skipping coordinate modification", "normal"))
+
+    return modified_command
+
+
+def _move_position(tokens: List[str], use_set: bool, values: Tuple[int, int, int], offsets: Tuple[int, int, int],
+                   anchor: Optional[Anchor]) -> List[str]:
+    """New text for a position's three coordinate tokens.
+
+    Set values are absolute. Offsets move absolute axes only: ~ and ^ axes
+    are tied to the executing entity, not to the build, so moving them would
+    turn e.g. an in-place `tp @s ~ ~ ~` into a teleport on every run. With an
+    anchor, ~ and ^ are resolved first and the resulting position is moved.
+    """
+    if use_set:
+        return [Coordinate(ABSOLUTE, value).format() for value in values]
+    coordinates = parse_position(tokens)
+    if anchor is not None:
+        coordinates = [Coordinate(ABSOLUTE, value) for value in resolve_position(coordinates, anchor)]
+    elif coordinates[0].notation == LOCAL:
+        logger.debug("Local coordinates %s left unchanged", tokens)
+        return list(tokens)
+    return [coordinate.shifted(offset).format() if coordinate.is_absolute else token
+            for coordinate, token, offset in zip(coordinates, tokens, offsets)]
+
+
+def modify_coordinates(command: str, use_set: bool, pos_values: Tuple[int, int, int], target_values: Tuple[int, int, int],
+                       new_block: Optional[str] = None, anchor: Optional[Anchor] = None) -> Tuple[str, List[int], Optional[str]]:
+    """Offset (or set) the coordinates of a setblock, end_crystal summon, kill or tp command.
+
+    With use_set the position/target tuples are absolute values, otherwise they are
+    offsets. `new_block` replaces the block of a setblock command when given.
+    Offsets move absolute axes only; relative (~) and local (^) axes are kept
+    as written, or resolved against `anchor` (the executing position and
+    rotation) when one is given. A
+    position the game would reject, such as ^ mixed with ~ or absolute axes,
+    leaves the command unchanged with a warning.
+    """
+    try:
+        return _modify_coordinates(command, use_set, pos_values, target_values, new_block, anchor)
+    except ValueError as e:
+        logger.warning("Leaving command unchanged, invalid position: %s (%s)", e, command)
+        return command, _integers(command), None
+
+
+def _integers(command: str) -> List[int]:
+    return [int(x) for x in patterns.INTEGER.findall(command) if x.lstrip('-').isdigit()]
+
+
+def _modify_coordinates(command: str, use_set: bool, pos_values: Tuple[int, int, int], target_values: Tuple[int, int, int],
+                        new_block: Optional[str], anchor: Optional[Anchor]) -> Tuple[str, List[int], Optional[str]]:
+    logger.debug("Modifying coordinates for command: %s", command)
+    if use_set:
+        pos_offsets, target_offsets = (0, 0, 0), (0, 0, 0)
+    else:
+        pos_offsets, target_offsets = pos_values, target_values
+
+    original_coords = _integers(command)
+
+    summon_match = find_end_crystal_summon(command)
+    if summon_match:
+        start, end, spans = summon_match
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Summon coordinates: %s", [command[a:b] for a, b in spans])
+        position = _move_position([command[a:b] for a, b in spans[:3]], use_set, pos_values, pos_offsets, anchor)
+        if use_set:
+            new_values = position + list(target_values)
+        else:
+            new_values = position + [int(command[a:b]) + offset for (a, b), offset in zip(spans[3:], target_offsets)]
+        parts = []
+        last = start
+        for (a, b), value in zip(spans, new_values):
+            parts.append(command[last:a])
+            parts.append(str(value))
+            last = b
+        parts.append(command[last:end])
+        result = ''.join(parts)
+        logger.debug("Summon command modified: %s", result)
+        return result, original_coords, None
+
+    coords_match = patterns.INTEGER_TRIPLE.search(command)
+    if coords_match and "summon" in command and not summon_match:
+        logger.debug("Malformed summon input detected, extracting coordinates: %s", coords_match.group())
+        coords = patterns.SIGNED_DIGITS.findall(coords_match.group())
+        if len(coords) >= 3:
+            x1, y1, z1 = map(int, coords[:3])
+            x2, y2, z2 = target_values if use_set else (x1 + target_offsets[0], y1 + target_offsets[1], z1 + target_offsets[2])
+            beam_target = find_beam_target(command)
+            beam_target_values = [int(command[a:b]) for a, b in beam_target] if beam_target else None
+            if beam_target_values:
+                x2 = target_values[0] if use_set else beam_target_values[0] + target_offsets[0]
+                y2 = target_values[1] if use_set else beam_target_values[1] + target_offsets[1]
+                z2 = target_values[2] if use_set else beam_target_values[2] + target_offsets[2]
+            result = f"summon end_crystal {x1} {y1} {z1} {{ShowBottom:0b,Invulnerable:1b,Tags:[\"laser\"],BeamTarget:{{X:{x2},Y:{y2},Z:{z2}}}}}"
+            original_coords = [x1, y1, z1] + (beam_target_values or [])
+            logger.debug("Reconstructed summon command: %s", result)
+            return result, original_coords, None
+
+    setblock_match = patterns.SETBLOCK_COMMAND.search(command)
+    if setblock_match:
+        logger.debug("Setblock match groups: %s", setblock_match.groups())
+        x, y, z = _move_position(setblock_match.group(2, 4, 6), use_set, pos_values, pos_offsets, anchor)
+        original_block_text = setblock_match.group(8).strip()  # Extract block, remove extra spaces
+        new_block_text = new_block if new_block is not None else original_block_text
+        # Reconstruct with single space after coordinates
+        result = f"/setblock {x} {y} {z} {new_block_text}"
+        logger.debug("Setblock command modified: %s", result)
+        return result, original_coords, original_block_text
+
+    kill_match = patterns.KILL_SELECTOR.search(command)
+    if kill_match:
+        logger.debug("Kill match groups: %s", kill_match.groups())
+        x = pos_values[0] if use_set else int(kill_match.group(2)) + pos_offsets[0]
+        y = pos_values[1] if use_set else int(kill_match.group(4)) + pos_offsets[1]
+        z = pos_values[2] if use_set else int(kill_match.group(6)) + pos_offsets[2]
+        result = f"{kill_match.group(1)}{x}{kill_match.group(3)}{y}{kill_match.group(5)}{z}{kill_match.group(7)}"
+        logger.debug("Kill command modified: %s", result)
+        return result, original_coords, None
+
+    teleport_match = patterns.TELEPORT_COMMAND.search(command)
+    if teleport_match:
+        logger.debug("Teleport match groups: %s", teleport_match.groups())
+        x, y, z = _move_position(teleport_match.group(2, 4, 6), use_set, pos_values, pos_offsets, anchor)
+        replacements = [(2, x), (4, y), (6, z)]
+        if anchor is not None and teleport_match.group(8) is not None:
+            yaw, pitch = resolve_rotation([parse_coordinate(token) for token in teleport_match.group(8, 10)], anchor)
+            replacements += [(8, Coordinate(ABSOLUTE, yaw).format()), (10, Coordinate(ABSOLUTE, pitch).format())]
+        parts = []
+        last = 0
+        for group, text in replacements:
+            parts.append(command[last:teleport_match.start(group)])
+            parts.append(text)
+            last = teleport_match.end(group)
+        parts.append(command[last:])
+        result = ''.join(parts)
+        logger.debug("Teleport command modified: %s", result)
+        return result, original_coords, None
+
+    logger.debug("No modification applied")
+    return command, original_coords, None
@@ -1,22 +1,246 @@
+import copy
 import json
+import logging
 import os
+import platform
+import threading
+import time
+from typing import Optional
 
-SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "settings.json")
+logger = logging.getLogger(__name__)
+
+APP_NAME = "MinecraftCommandModifier"
+SCHEMA_VERSION = 1
+
+# Settings used to live next to the source, which fails on read-only installs; still read once to migrate
+LEGACY_SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "settings.json")
+
+# Changes within this window are written together
+SAVE_DELAY_SECONDS = 1.0
 
 DEFAULT_SETTINGS = {
+    "schema_version": SCHEMA_VERSION,
     "always_on_top": True,
-    "show_in_tray": True
+    "show_in_tray": True,
+    "terminal_max_lines": 2000,
+    "watch_clipboard": False,
+    "rewrite_cache_size": 512,
+    # Destroy a tab's widgets when another tab is selected; it is rebuilt when shown again
+    "unload_hidden_tabs": False,
+    # Arguments to utils.setup_logging; module_levels maps logger names like "src.rewrite_engine" to levels
+    "logging": {"level": "INFO", "module_levels": {}, "debug_sample_rate": 1, "jsonl": False},
+    # Last values of the tab fields, keyed by GUI variable name
+    "tab_values": {},
+    # Preset name -> tab field values it applies
+    "presets": {
+        "laser": {
+            "modify_coords": True, "modify_translation": True, "modify_scale": True, "modify_centering": True,
+            "pos_x_set": "0.0", "pos_y_set": "0.5", "pos_z_set": "0.999999",
+            "trans_x": "0.5", "trans_y": "0.0", "trans_z": "0.0",
+            "beam_scale": "-150.0",
+            "centering_x": "0.0", "centering_y": "0.0", "centering_z": "0.0",
+            "tag_text": "beam1", "block_text": "minecraft:lime_concrete", "laser_mode": "laser"
+        },
+        "lightbeam": {
+            "modify_coords": True, "modify_translation": True, "modify_scale": True, "modify_centering": True,
+            "pos_x_set": "0.0", "pos_y_set": "0.5", "pos_z_set": "0.999999",
+            "trans_x": "0.0", "trans_y": "0.0", "trans_z": "0.0",
+            "beam_scale": "-75.0",
+            "centering_x": "0.0", "centering_y": "0.0", "centering_z": "0.0",
+            "tag_text": "lightbeam1", "block_text": "minecraft:light_blue_concrete", "laser_mode": "lightbeam"
+        }
+    }
 }
 
-def load_settings():
-    if os.path.exists(SETTINGS_FILE):
+
+def config_dir() -> str:
+    """Per-user settings directory: %APPDATA% on Windows, Application Support on macOS, XDG elsewhere."""
+    system = platform.system()
+    if system == "Windows":
+        base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Roaming")
+    elif system == "Darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Application Support")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, APP_NAME)
+
+
+SETTINGS_FILE = os.path.join(config_dir(), "settings.json")
+
+
+def migrate_settings(data: dict) -> dict:
+    """Bring settings of any schema version up to SCHEMA_VERSION, filling in missing defaults."""
+    version = data.get("schema_version", 0)
+    if version > SCHEMA_VERSION:
+        logger.warning("Settings were written by a newer version (schema %s); unknown keys are kept as they are", version)
+    settings = copy.deepcopy(DEFAULT_SETTINGS)
+    settings.update(data)
+    # Version 0 was a flat dict without tab values or presets; both are merged per key
+    presets = copy.deepcopy(DEFAULT_SETTINGS["presets"])
+    for name, values in dict(data.get("presets") or {}).items():
+        presets[name] = {**presets.get(name, {}), **values}
+    settings["presets"] = presets
+    settings["tab_values"] = dict(data.get("tab_values") or {})
+    settings["schema_version"] = max(version, SCHEMA_VERSION)
+    return settings
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read settings from %s: %s", path, e)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def load_settings(path: str = SETTINGS_FILE) -> dict:
+    """Settings from the per-user file, else the legacy file next to the source, else the defaults."""
+    data = _read_json(path)
+    if data is None and path == SETTINGS_FILE:
+        data = _read_json(LEGACY_SETTINGS_FILE)
+        if data is not None:
+            logger.info("Migrating settings from %s to %s", LEGACY_SETTINGS_FILE, path)
+    return migrate_settings(data or {})
+
+
+def write_settings_file(settings: dict, path: str = SETTINGS_FILE):
+    """Write atomically: a temp file in the same directory is renamed over the old file, so a crash never leaves half a file."""
+    import tempfile
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".settings-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
         try:
-            with open(SETTINGS_FILE, "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return DEFAULT_SETTINGS.copy()
-    return DEFAULT_SETTINGS.copy()
-
-def save_settings(settings):
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=4)
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_settings(settings, path: str = SETTINGS_FILE):
+    """Schedule a write for a SettingsStore; write a plain dict right away."""
+    if isinstance(settings, SettingsStore):
+        settings.save()
+    else:
+        write_settings_file(settings, path)
+
+
+class SettingsStore:
+    """In-memory settings with debounced, atomic writes on a background thread.
+
+    Reads and changes only touch the dict, so they never wait on the disk.
+    Every change schedules a save SAVE_DELAY_SECONDS later; further changes
+    in that window push it back, so typing into a field costs one write.
+    Call close() on exit to write what is still pending.
+    """
+
+    def __init__(self, path: str = SETTINGS_FILE, delay: float = SAVE_DELAY_SECONDS):
+        self.path = path
+        self.delay = delay
+        self.writes = 0
+        self._data = load_settings(path)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        # Serializes the writer thread with flush() on the caller's thread
+        self._write_lock = threading.Lock()
+        self._due = None
+        self._closed = False
+        self._thread = None
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def update(self, values: dict):
+        with self._lock:
+            if all(key in self._data and self._data[key] == value for key, value in values.items()):
+                return
+            self._data.update(values)
+        self.save()
+
+    def set_tab_value(self, name: str, value):
+        with self._lock:
+            if self._data["tab_values"].get(name) == value:
+                return
+            self._data["tab_values"][name] = value
+        self.save()
+
+    def preset(self, name: str) -> dict:
+        return dict(self._data["presets"].get(name, {}))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def save(self):
+        """Schedule a write; returns immediately."""
+        with self._changed:
+            if self._closed:
+                return
+            self._due = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+                self._thread.start()
+            self._changed.notify()
+
+    def flush(self):
+        """Write pending changes now, on the calling thread."""
+        with self._changed:
+            pending = self._due is not None
+            self._due = None
+        if pending:
+            self._write()
+
+    def close(self):
+        """Write pending changes and stop the writer thread."""
+        with self._changed:
+            self._closed = True
+            self._changed.notify()
+        self.flush()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        with self._changed:
+            while not self._closed:
+                if self._due is None:
+                    self._changed.wait()
+                    continue
+                remaining = self._due - time.monotonic()
+                if remaining > 0:
+                    self._changed.wait(remaining)
+                    continue
+                self._due = None
+                self._changed.release()
+                try:
+                    self._write()
+                finally:
+                    self._changed.acquire()
+
+    def _write(self):
+        with self._write_lock:
+            settings = self.snapshot()
+            try:
+                write_settings_file(settings, self.path)
+                self.writes += 1
+                logger.debug("Settings saved to %s", self.path)
+            except OSError as e:
+                logger.warning("Could not save settings to %s: %s", self.path, e)
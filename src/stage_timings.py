@@ -0,0 +1,91 @@
+import collections
+import contextlib
+import json
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+# Samples kept per stage; older ones roll off
+DEFAULT_WINDOW = 1000
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(ordered, p: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class StageTimings:
+    """Rolling latency samples for each stage of the rewrite pipeline.
+
+    Each stage keeps its last `window` durations in a deque; percentiles are
+    computed on demand by sorting that window, so recording stays a lock and
+    an append and is cheap enough for every press. Safe to record from the
+    F12 worker and the Tk thread at the same time.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._counts = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = collections.deque(maxlen=self.window)
+            samples.append(seconds)
+            self._counts[stage] += 1
+
+    @contextlib.contextmanager
+    def time(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Stage -> count, last, p50/p95/p99 and max over the window, in milliseconds."""
+        with self._lock:
+            snapshot = {stage: (list(samples), self._counts[stage]) for stage, samples in self._samples.items()}
+        stats = {}
+        for stage, (samples, count) in snapshot.items():
+            ordered = sorted(samples)
+            entry = {"count": count, "last_ms": samples[-1] * 1000}
+            for p in PERCENTILES:
+                entry[f"p{p}_ms"] = percentile(ordered, p) * 1000
+            entry["max_ms"] = ordered[-1] * 1000
+            stats[stage] = entry
+        return stats
+
+    def report(self) -> str:
+        """Fixed-width table for the diagnostics panel."""
+        stats = self.stats()
+        if not stats:
+            return "No timings yet; process a command first."
+        lines = [f"{'stage':18s} {'count':>6s}" + ''.join(f" {f'p{p}':>7s}" for p in PERCENTILES) + f" {'max':>7s}  (ms)"]
+        for stage in sorted(stats):
+            entry = stats[stage]
+            lines.append(f"{stage:18s} {entry['count']:6d}" + ''.join(f" {entry[f'p{p}_ms']:7.2f}" for p in PERCENTILES)
+                         + f" {entry['max_ms']:7.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path: str):
+        """Write the stats and the raw windows (in milliseconds) as JSON."""
+        with self._lock:
+            samples = {stage: [s * 1000 for s in window] for stage, window in self._samples.items()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"generated": time.time(), "window": self.window, "stats": self.stats(), "samples_ms": samples}, f, indent=4)
+
+
+def timed(timings: Optional[StageTimings], stage: str):
+    """timings.time(stage), or a no-op when there is no StageTimings (e.g. outside the GUI)."""
+    return timings.time(stage) if timings is not None else contextlib.nullcontext()
@@ -0,0 +1,87 @@
+import collections
+import logging
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LINES = 2000
+
+
+class TerminalBuffer:
+    """Batched, bounded output for the terminal Text widget.
+
+    write() only queues a message; everything written during one processing
+    pass reaches the widget as a single insert on the next Tk idle cycle.
+    The widget is then trimmed to its newest max_lines lines and scrolled
+    once, so inserts stay cheap however long the session runs. Pending
+    messages sit in a ring buffer of the same size, so a burst larger than
+    the cap never piles up either.
+    """
+
+    def __init__(self, widget: tk.Text, max_lines: int = DEFAULT_MAX_LINES):
+        self.widget = widget
+        self.max_lines = max(1, int(max_lines))
+        self.pending = collections.deque(maxlen=self.max_lines)
+        self.dropped = 0
+        self._flush_scheduled = False
+
+    def write(self, message: str, tags="normal"):
+        if len(self.pending) == self.max_lines:
+            self.dropped += 1
+        self.pending.append((message + "\n", tags))
+        if not self._flush_scheduled:
+            try:
+                self.widget.after_idle(self.flush)
+                self._flush_scheduled = True
+            except tk.TclError:
+                # Widget already destroyed; nothing left to show the message in
+                self.pending.clear()
+
+    def flush(self):
+        """Insert every pending message with one call, then trim and scroll once."""
+        self._flush_scheduled = False
+        if not self.pending:
+            return
+        chunks = []
+        for message, tags in self.pending:
+            chunks.extend((message, tags))
+        self.pending.clear()
+        try:
+            if not self.widget.winfo_exists():
+                return
+            state = self.widget.cget("state")
+            if state == tk.DISABLED:
+                # Tk silently ignores inserts into a disabled Text; keep it read-only for the user only
+                self.widget.configure(state=tk.NORMAL)
+            self.widget.insert(tk.END, *chunks)
+            self._trim()
+            self.widget.see(tk.END)
+            if state == tk.DISABLED:
+                self.widget.configure(state=tk.DISABLED)
+        except tk.TclError as e:
+            logger.debug("Terminal flush skipped: %s", e)
+        if self.dropped:
+            logger.debug("Terminal dropped %s messages past the %s line cap", self.dropped, self.max_lines)
+            self.dropped = 0
+
+    def _trim(self):
+        # The Text always ends with a newline of its own, so "end-1c" is on the last real line
+        lines = int(self.widget.index("end-1c").split(".")[0]) - 1
+        excess = lines - self.max_lines
+        if excess > 0:
+            self.widget.delete("1.0", f"{excess + 1}.0")
+
+    def set_max_lines(self, max_lines: int):
+        """Change the cap; the widget is trimmed to it on the next flush."""
+        self.max_lines = max(1, int(max_lines))
+        self.pending = collections.deque(self.pending, maxlen=self.max_lines)
+
+    def clear(self):
+        self.pending.clear()
+        try:
+            state = self.widget.cget("state")
+            self.widget.configure(state=tk.NORMAL)
+            self.widget.delete("1.0", tk.END)
+            self.widget.configure(state=state)
+        except tk.TclError:
+            pass
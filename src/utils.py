@@ -1,22 +1,107 @@
+import collections
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
-
-def setup_logging():
-    log_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, 'survey.log')
-    log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    log_handler = RotatingFileHandler(log_file, maxBytes=1000000, backupCount=5)
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "logs")
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Logger for the timed, structured rewrite records written by the jsonl option
+REWRITE_EVENT_LOGGER = "src.rewrite_events"
+
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Set while logging is configured, so cleanup() can drain the queue
+_listener: Optional[QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and every `extra` field."""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        return json.dumps(entry, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Lets through every `rate`-th DEBUG record per call site, starting with the first; other levels all pass."""
+
+    def __init__(self, rate: int):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self._counts = collections.Counter()
+
+    def filter(self, record) -> bool:
+        if record.levelno > logging.DEBUG or self.rate == 1:
+            return True
+        site = (record.pathname, record.lineno)
+        count = self._counts[site]
+        self._counts[site] = count + 1
+        return count % self.rate == 0
+
+
+def setup_logging(level="INFO", module_levels: Optional[Dict[str, str]] = None, debug_sample_rate: int = 1,
+                  jsonl: bool = False):
+    """Log to logs/survey.log and the console through a queue, so file writes happen on a listener thread.
+
+    `module_levels` maps logger names (e.g. "src.rewrite_engine") to their
+    own levels. With debug_sample_rate N > 1 only every Nth DEBUG record of
+    each call site is kept. `jsonl` writes one JSON line with timing fields
+    per rewrite to logs/rewrite.jsonl.
+    """
+    global _listener
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_formatter = logging.Formatter(LOG_FORMAT)
+    # Rewrite events go to the JSONL file only
+    not_an_event = lambda record: not hasattr(record, "event")
+    log_handler = RotatingFileHandler(os.path.join(LOG_DIR, 'survey.log'), maxBytes=1000000, backupCount=5)
     log_handler.setFormatter(log_formatter)
-    logging.getLogger().addHandler(log_handler)
+    log_handler.addFilter(not_an_event)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(log_formatter)
-    logging.getLogger().addHandler(console_handler)
-    logging.getLogger().setLevel(logging.DEBUG)
+    console_handler.addFilter(not_an_event)
+    handlers = [log_handler, console_handler]
+    if jsonl:
+        jsonl_handler = RotatingFileHandler(os.path.join(LOG_DIR, 'rewrite.jsonl'), maxBytes=5000000, backupCount=3)
+        jsonl_handler.setFormatter(JsonLinesFormatter())
+        jsonl_handler.addFilter(lambda record: hasattr(record, "event"))
+        handlers.append(jsonl_handler)
+
+    queue_handler = QueueHandler(queue.SimpleQueue())
+    if debug_sample_rate > 1:
+        queue_handler.addFilter(DebugSampler(debug_sample_rate))
+    _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+    # Off unless requested, so the rewrite path skips building the records
+    logging.getLogger(REWRITE_EVENT_LOGGER).setLevel(logging.INFO if jsonl else logging.WARNING)
 
 def cleanup():
-    logging.info("Cleaning up logging handlers")
+    global _listener
+    logger.info("Cleaning up logging handlers")
+    if _listener is not None:
+        # Writes out everything still queued, then stops the listener thread
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
     for handler in logging.getLogger().handlers[:]:
         handler.close()
-        logging.getLogger().removeHandler(handler)
\ No newline at end of file
+        logging.getLogger().removeHandler(handler)
@@ -5,11 +5,27 @@ from OpenGL.GLU import *
 import asyncio
 import platform
 import math
+import time
+import logging
 import numpy as np
-import re  # Added missing import for regular expressions
+from src import patterns
+from src.block_loader import StreamingBlockLoader
+from src.block_picker import BlockPicker, screen_ray
+from src.block_store import BlockStore
+from src.block_renderer import BlockBatchRenderer, StaticGeometry, build_ground_vertices, vbo_supported
+
+logger = logging.getLogger(__name__)
 
 class Block3DViewer:
-    def __init__(self, commands):
+    MIN_GROUND_GRID_SIZE = 20
+    GROUND_MARGIN = 4
+    SETBLOCK_PATTERN = patterns.SETBLOCK_LINE
+    # Command text larger than this is parsed on a background thread while the window is already up
+    STREAMING_THRESHOLD = 1000000
+    # Seconds per frame spent moving streamed blocks into the scene
+    LOAD_BUDGET = 0.008
+
+    def __init__(self, commands="", ground_grid_size=None, ground_tile_size=1.0, commands_path=None):
         pygame.init()
         self.WIDTH, self.HEIGHT = 800, 600
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT), DOUBLEBUF | OPENGL)
@@ -46,8 +62,27 @@ class Block3DViewer:
         self.light_dir = np.array([0.0, 0.0, -1.0], dtype=np.float32)
         self.ambient = 0.3
 
-        # Block data
-        self.blocks = self.parse_commands(commands)
+        # Ground settings; a grid size of None sizes the floor to fit the build
+        self.auto_ground = ground_grid_size is None
+        self.ground_grid_size = ground_grid_size if ground_grid_size is not None else self.MIN_GROUND_GRID_SIZE
+        self.ground_tile_size = ground_tile_size
+
+        # Block data; large dumps (or a commands file) are streamed in after the window opens
+        self.blocks = BlockStore()
+        self.picker = BlockPicker()
+        self.loader = None
+        # Shown next to the progress line when streaming stops on an error (the loader logs it)
+        self.load_error = None
+        if commands_path is not None or len(commands) > self.STREAMING_THRESHOLD:
+            if commands_path is not None:
+                self.loader = StreamingBlockLoader(self.parse_command_line, path=commands_path)
+            else:
+                self.loader = StreamingBlockLoader(self.parse_command_line, text=commands)
+            self.loader.start()
+        else:
+            self.blocks.extend_blocks(self.parse_commands(commands))
+            self.picker.add_grid_positions(self.blocks.coords)
+        self.fit_ground()
         self.current_color = self.GRAY
         self.color_options = {"g": self.GRAY, "r": self.RED, "b": self.BLUE, "n": self.GREEN}
         self.color_names = {"g": "Gray", "r": "Red", "b": "Blue", "n": "Green"}
@@ -63,6 +98,11 @@ class Block3DViewer:
         self.dragging_middle = False
         self.last_mouse_pos = (0, 0)
 
+        # Batched renderer and static scene geometry (created once the GL context exists) and frame timing
+        self.renderer = None
+        self.static_geometry = None
+        self.frame_time_ms = 0.0
+
         self.init_opengl()
 
     def init_opengl(self):
@@ -81,24 +121,101 @@ class Block3DViewer:
         gluPerspective(self.fov, self.RENDER_WIDTH / self.RENDER_HEIGHT, self.near, self.far)
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
+        if self.renderer is None:
+            if vbo_supported():
+                self.renderer = BlockBatchRenderer(self.light_dir, self.ambient, chunks_per_frame=16)
+                self.renderer.set_block_arrays(self.blocks.coords, self.blocks.types, self.blocks.palette_colors)
+                self.static_geometry = StaticGeometry()
+            else:
+                logger.warning("Vertex buffer objects not supported; falling back to immediate mode rendering")
+
+    def add_block(self, x, y, z, color):
+        if not all(float(v).is_integer() for v in (x, y, z)):
+            raise ValueError("Block coordinates must be whole numbers")
+        index = self.blocks.append(int(x), int(y), int(z), self.color_block_type(color))
+        block = self.blocks[index]
+        self.picker.add(block)
+        if self.renderer:
+            self.renderer.append_block(block)
+        if self.auto_ground:
+            self.fit_ground()
+
+    def add_blocks(self, blocks):
+        """Add a batch of (x, y, z, block_type) blocks, e.g. from the streaming loader."""
+        start = len(self.blocks)
+        self.blocks.extend_blocks(blocks)
+        coords = self.blocks.coords[start:]
+        self.picker.add_grid_positions(coords)
+        if self.renderer:
+            self.renderer.append_block_arrays(coords, self.blocks.types[start:], self.blocks.palette_colors)
+        self.fit_ground()
+
+    def pump_loader(self):
+        """Move streamed blocks into the scene for at most LOAD_BUDGET seconds."""
+        if self.loader is None:
+            return
+        deadline = time.perf_counter() + self.LOAD_BUDGET
+        while time.perf_counter() < deadline:
+            batch = self.loader.take_batch()
+            if batch is None:
+                break
+            self.add_blocks(batch)
+        if self.loader.finished:
+            self.load_error = self.loader.error
+            logger.info("Loaded %s blocks from %s lines", len(self.blocks), self.loader.lines)
+            self.loader = None
+
+    def fit_ground(self):
+        """Grow the ground grid (never below the default size) so it extends past every block on x and z."""
+        if not self.auto_ground or self.picker.low_cell is None:
+            return
+        low, high = self.picker.low_cell, self.picker.high_cell
+        extent = max(abs(low[0]), abs(high[0]), abs(low[2]), abs(high[2]))
+        needed = math.ceil(extent / self.ground_tile_size) + self.GROUND_MARGIN
+        self.ground_grid_size = max(self.ground_grid_size, needed)
+
+    def set_ground(self, grid_size=None, tile_size=None):
+        """Change the ground grid; the cached geometry is rebuilt on the next frame."""
+        if tile_size is not None:
+            self.ground_tile_size = tile_size
+            if self.auto_ground:
+                self.ground_grid_size = self.MIN_GROUND_GRID_SIZE
+                self.fit_ground()
+        if grid_size is not None:
+            self.ground_grid_size = grid_size
+            self.auto_ground = False
 
     def parse_commands(self, commands):
         blocks = []
         for cmd in commands.split('\n'):
-            match = re.match(r'setblock\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(.+)', cmd.strip())
-            if match:
-                x, y, z, block = match.groups()
-                # Convert block type to color (simplified mapping for demo)
-                color = self.GRAY  # Default to gray; extend this logic if needed
-                if "red" in block.lower():
-                    color = self.RED
-                elif "blue" in block.lower():
-                    color = self.BLUE
-                elif "green" in block.lower():
-                    color = self.GREEN
-                blocks.append((int(x), int(y), int(z), color))
+            block = self.parse_command_line(cmd)
+            if block is not None:
+                blocks.append(block)
         return blocks
 
+    def parse_command_line(self, cmd):
+        """(x, y, z, block) for a setblock command, or None for anything else; block keeps states, NBT and mode verbatim."""
+        match = self.SETBLOCK_PATTERN.match(cmd.strip())
+        if not match:
+            return None
+        x, y, z, block = match.groups()
+        return (int(x), int(y), int(z), block)
+
+    def block_color(self, block):
+        """Representative color of a block string (block states and NBT are ignored) from the bundled color table."""
+        return self.blocks.palette.color_for(block)
+
+    def color_block_type(self, color):
+        # Simplify color to block type for command (extend as needed)
+        block_type = "minecraft:stone"  # Default
+        if color == self.RED:
+            block_type = "minecraft:redstone_block"
+        elif color == self.BLUE:
+            block_type = "minecraft:blue_ice"
+        elif color == self.GREEN:
+            block_type = "minecraft:lime_concrete"
+        return block_type
+
     def update_camera(self):
         """Update camera position and orientation."""
         cos_pitch = math.cos(math.radians(self.camera_pitch))
@@ -141,7 +258,7 @@ class Block3DViewer:
         return right, up, forward
 
     def draw_block(self, x, y, z, color, is_selected=False):
-        """Draw a block using OpenGL."""
+        """Draw a block in immediate mode; only used when vertex buffers are unavailable."""
         vertices = np.array([
             [x-0.5, y-0.5, z-0.5], [x+0.5, y-0.5, z-0.5],
             [x+0.5, y+0.5, z-0.5], [x-0.5, y+0.5, z-0.5],
@@ -159,19 +276,18 @@ class Block3DViewer:
         face_normals = [
             [0, 0, -1], [0, 0, 1], [1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0]
         ]
-        for face in faces:
+        for face, normal in zip(faces, face_normals):
+            dot = max(0, -np.dot(normal, self.light_dir))
+            intensity = self.ambient + (1 - self.ambient) * dot
+            face_color = [
+                min(1.0, color[0] * intensity),
+                min(1.0, color[1] * intensity),
+                min(1.0, color[2] * intensity),
+                color[3]
+            ]
             glBegin(GL_QUADS)
+            glColor4f(*face_color)
             for vertex_idx in face:
-                normal = face_normals[faces.index(face)]
-                dot = max(0, -np.dot(normal, self.light_dir))
-                intensity = self.ambient + (1 - self.ambient) * dot
-                face_color = [
-                    min(1.0, color[0] * intensity),
-                    min(1.0, color[1] * intensity),
-                    min(1.0, color[2] * intensity),
-                    color[3]
-                ]
-                glColor4f(*face_color)
                 glVertex3fv(vertices[vertex_idx])
             glEnd()
         if is_selected:
@@ -185,8 +301,14 @@ class Block3DViewer:
 
     def draw_ground(self):
         """Draw a checkerboard ground plane at y=-0.5 using OpenGL."""
-        grid_size = 20
-        tile_size = 1.0
+        grid_size = self.ground_grid_size
+        tile_size = self.ground_tile_size
+        if self.static_geometry:
+            # Compiled once into a VBO and rebuilt only when the grid settings change
+            key = (grid_size, tile_size)
+            self.static_geometry.update("ground", key, lambda: build_ground_vertices(grid_size, tile_size, self.LIGHT_GRAY, self.DARK_GRAY))
+            self.static_geometry.draw("ground")
+            return
         glBegin(GL_QUADS)
         for i in range(-grid_size, grid_size + 1):
             for j in range(-grid_size, grid_size + 1):
@@ -201,21 +323,15 @@ class Block3DViewer:
         glEnd()
 
     def select_block(self, mx, my, camera_pos):
-        """Select the closest block to the mouse click."""
-        closest = None
-        min_dist = float('inf')
+        """Select the first block under the mouse by casting a ray through the clicked pixel."""
         mx -= self.RENDER_X
         my = self.RENDER_HEIGHT - (my - self.RENDER_Y)
         if 0 <= mx < self.RENDER_WIDTH and 0 <= my < self.RENDER_HEIGHT:
-            for i, (x, y, z, _) in enumerate(self.blocks):
-                dx = x - camera_pos[0]
-                dy = y - camera_pos[1]
-                dz = z - camera_pos[2]
-                dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-                if dist < min_dist and dist < 50:
-                    min_dist = dist
-                    closest = i
-        self.selected_block = closest
+            origin, direction = screen_ray(mx, my, self.RENDER_WIDTH, self.RENDER_HEIGHT, camera_pos,
+                                           (self.camera_x, self.camera_y, self.camera_z), self.fov)
+            self.selected_block = self.picker.pick(origin, direction, self.far)
+        else:
+            self.selected_block = None
 
     def setup(self):
         """Initialize the game."""
@@ -240,7 +356,7 @@ class Block3DViewer:
                         if event.key == pygame.K_RETURN:
                             try:
                                 x, y, z = map(float, self.input_text.split())
-                                self.blocks.append((x, y, z, self.current_color))
+                                self.add_block(x, y, z, self.current_color)
                                 self.input_text = ""
                             except ValueError:
                                 self.input_text = "Invalid"
@@ -272,7 +388,7 @@ class Block3DViewer:
                         if self.input_text:
                             try:
                                 x, y, z = map(float, self.input_text.split())
-                                self.blocks.append((x, y, z, self.current_color))
+                                self.add_block(x, y, z, self.current_color)
                                 self.input_text = ""
                             except ValueError:
                                 self.input_text = "Invalid"
@@ -312,11 +428,20 @@ class Block3DViewer:
                 if keys[pygame.K_d]:
                     self.camera_x += move_speed
 
+            self.pump_loader()
+
             # Draw
+            frame_start = time.perf_counter()
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
             self.draw_ground()
-            for i, (x, y, z, color) in enumerate(self.blocks):
-                self.draw_block(x, y, z, color, is_selected=(i == self.selected_block))
+            if self.renderer:
+                self.renderer.draw(self.selected_block, self.ORANGE)
+            else:
+                for i, (x, y, z, color) in enumerate(self.blocks):
+                    self.draw_block(x, y, z, color, is_selected=(i == self.selected_block))
+            # Exponential moving average keeps the counter readable
+            self.frame_time_ms = 0.9 * self.frame_time_ms + 0.1 * (time.perf_counter() - frame_start) * 1000
+            self.clock.tick()
 
             # Draw UI outside render region
             self.screen.fill((0.1, 0.1, 0.1))
@@ -325,8 +450,15 @@ class Block3DViewer:
                 f"Current color: {self.color_names[[k for k, v in self.color_options.items() if v == self.current_color][0]]}",
                 "Press 'g' (gray), 'r' (red), 'b' (blue), 'n' (green) to change color",
                 "Left click to pan camera, middle click to orbit, scroll to zoom",
-                "Hold Shift + WASD to move camera, left click to select (orange outline), 'p' to print and exit"
+                "Hold Shift + WASD to move camera, left click to select (orange outline), 'p' to print and exit",
+                f"FPS: {self.clock.get_fps():.0f}  Frame: {self.frame_time_ms:.2f} ms  Blocks: {len(self.blocks)}"
             ]
+            if self.loader:
+                instructions.append(f"Loading: {self.loader.progress * 100:.0f}% ({len(self.blocks):,} blocks)")
+            elif self.load_error:
+                instructions.append(f"Loading stopped: {self.load_error} ({len(self.blocks):,} blocks loaded)")
+            if self.renderer:
+                instructions.append(f"Triangles: {self.renderer.triangle_count} (unmeshed {self.renderer.naive_triangle_count})")
             for i, text in enumerate(instructions):
                 surface = self.font.render(text, True, self.WHITE)
                 self.screen.blit(surface, (10, 10 + i * 30))
@@ -346,7 +478,7 @@ class Block3DViewer:
                 if self.input_text:
                     try:
                         x, y, z = map(float, self.input_text.split())
-                        self.blocks.append((x, y, z, self.current_color))
+                        self.add_block(x, y, z, self.current_color)
                         self.input_text = ""
                     except ValueError:
                         self.input_text = "Invalid"
@@ -357,20 +489,12 @@ class Block3DViewer:
     async def main(self):
         self.setup()
         await self.update_loop()
+        if self.loader:
+            self.loader.stop()
 
     def get_commands(self):
-        commands = []
-        for x, y, z, color in self.blocks:
-            # Simplify color to block type for command (extend as needed)
-            block_type = "minecraft:stone"  # Default
-            if color == self.RED:
-                block_type = "minecraft:redstone_block"
-            elif color == self.BLUE:
-                block_type = "minecraft:blue_ice"
-            elif color == self.GREEN:
-                block_type = "minecraft:lime_concrete"
-            commands.append(f"setblock {x} {y} {z} {block_type}")
-        return "\n".join(commands)
+        coords = self.blocks.coords.tolist()
+        return "\n".join(f"setblock {x} {y} {z} {block_type}" for (x, y, z), block_type in zip(coords, self.blocks.block_types()))
 
     def run(self):
         if platform.system() == "Emscripten":